@@ -0,0 +1,112 @@
+"""
+Sentra Memory Service - Response serialization benchmark
+
+Per-row cost of the list_memories response, the old way (MemoryResponse per
+row, response_model validation, JSONResponse) against the fast path
+(memory_dict + FastJSONResponse). Needs no database.
+
+Usage:
+    python -m memory_service.bench_serialization
+    python -m memory_service.bench_serialization --rows 1000 --repeat 20
+"""
+
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import List
+from uuid import uuid4
+import argparse
+import json
+import time
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from .schemas.responses import MemoryResponse
+from .services.serialization import ORJSON_AVAILABLE, FastJSONResponse, memory_dict
+
+MemoryRow = namedtuple("MemoryRow", [
+    "id", "user_id", "agent_id", "access_mode", "content", "memory_type", "importance",
+    "extra_data", "created_at", "accessed_at", "access_count"
+])
+
+
+def make_rows(count: int) -> List[MemoryRow]:
+    """Synthetic rows shaped like select(*MEMORY_COLUMNS) results."""
+    now = datetime.now(timezone.utc)
+    return [
+        MemoryRow(
+            id=uuid4(),
+            user_id="bench",
+            agent_id=f"agent-{i % 4}",
+            access_mode="shared" if i % 2 else "private",
+            content=f"User prefers option {i} for the deployment pipeline " * 3,
+            memory_type="preference",
+            importance=0.5 + (i % 5) / 10,
+            extra_data={"source": "bench", "tags": ["a", "b"], "n": i},
+            created_at=now - timedelta(minutes=i),
+            accessed_at=now,
+            access_count=i % 50
+        )
+        for i in range(count)
+    ]
+
+
+_adapter = TypeAdapter(List[MemoryResponse])
+
+
+def render_pydantic(rows: List[MemoryRow]) -> bytes:
+    """Previous path: build models, validate against response_model, encode."""
+    models = [
+        MemoryResponse(
+            id=str(row.id),
+            user_id=row.user_id,
+            agent_id=row.agent_id,
+            access_mode=row.access_mode,
+            content=row.content,
+            memory_type=row.memory_type,
+            importance=row.importance,
+            metadata=row.extra_data or {},
+            created_at=row.created_at,
+            accessed_at=row.accessed_at,
+            access_count=row.access_count
+        )
+        for row in rows
+    ]
+    validated = _adapter.validate_python(models, from_attributes=True)
+    return JSONResponse(_adapter.dump_python(validated, mode="json")).body
+
+
+def render_fast(rows: List[MemoryRow]) -> bytes:
+    """Fast path: rows straight to JSON bytes."""
+    return FastJSONResponse([memory_dict(row) for row in rows]).body
+
+
+def _per_row_us(render, rows: List[MemoryRow], repeat: int) -> float:
+    """Best-of-repeat microseconds per row."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render(rows)
+        best = min(best, time.perf_counter() - start)
+    return best / len(rows) * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response serialization per row")
+    parser.add_argument("--rows", type=int, default=500, help="Rows per response")
+    parser.add_argument("--repeat", type=int, default=30, help="Timed runs (best is reported)")
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    if json.loads(render_pydantic(rows)) != json.loads(render_fast(rows)):
+        raise SystemExit("Fast path output differs from the response_model output")
+
+    before = _per_row_us(render_pydantic, rows, args.repeat)
+    after = _per_row_us(render_fast, rows, args.repeat)
+    print(f"rows={args.rows} repeat={args.repeat} encoder={'orjson' if ORJSON_AVAILABLE else 'json'}")
+    print(f"response_model path: {before:8.2f} us/row")
+    print(f"fast path:           {after:8.2f} us/row  ({before / after:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,14 @@ Sentra Memory Service - Database Connection
 
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
-from sqlalchemy import text
+from sqlalchemy import exc, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool
+from fastapi import Request
 from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Optional
+from uuid import uuid4
+import time
 import logging
 
 from .config import get_settings
@@ -19,14 +25,89 @@ class Base(DeclarativeBase):
     pass
 
 
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that counts checkout waiters and wait time."""
+
+    def __init__(self, *args, **kwargs):
+        """Initialize instrumented pool."""
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self):
+        """Check out a connection, timing the wait (queueing, connect and pre-ping)."""
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+
+        waited = time.perf_counter() - start
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return connection
+
+    def stats(self) -> dict:
+        """Live pool counters."""
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "max_overflow": self._max_overflow,
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": round(self.wait_seconds_total / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+            "max_wait_ms": round(self.wait_seconds_max * 1000, 3)
+        }
+
+
+def _create_engine(url: str):
+    """Async engine with the configured pool settings (primary and replicas)."""
+    statement_cache_size = settings.db_statement_cache_size
+    connect_args = {}
+    if settings.db_pgbouncer_mode:
+        # Transaction pooling hands each transaction to any server connection:
+        # prepared statements must not be cached nor reuse names
+        statement_cache_size = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    connect_args["statement_cache_size"] = statement_cache_size  # asyncpg
+    connect_args["prepared_statement_cache_size"] = statement_cache_size  # SQLAlchemy adapter
+
+    options = dict(echo=settings.db_echo, pool_pre_ping=settings.db_pool_pre_ping, connect_args=connect_args)
+    if settings.db_null_pool:
+        options["poolclass"] = NullPool
+    else:
+        options.update(
+            poolclass=InstrumentedPool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds
+        )
+    return create_async_engine(url, **options)
+
+
+def pool_stats(async_engine) -> dict:
+    """Pool counters for an engine (just the pool class without a client-side pool)."""
+    pool = async_engine.pool
+    stats = {"pool": type(pool).__name__}
+    if isinstance(pool, InstrumentedPool):
+        stats.update(pool.stats())
+    return stats
+
+
 # Create async engine
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10
-)
+engine = _create_engine(settings.database_url)
 
 # Session factory
 async_session_maker = async_sessionmaker(
@@ -55,6 +136,213 @@ async def get_db_context():
             await session.close()
 
 
+# Session.info key marking sessions bound to a read replica
+READ_ONLY = "read_only"
+
+# Replay lag in seconds (0 on a primary or a replica that replayed all it received)
+REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp())
+    END
+""")
+
+
+class ReplicaRouter:
+    """
+    Picks the session for a read: a healthy replica, or the primary.
+
+    Replicas whose lag exceeds replica_max_lag_seconds (or that fail the
+    check) leave the rotation until a later check passes. Users who wrote
+    within read_your_writes_seconds are pinned to the primary.
+    """
+
+    def __init__(self, urls: List[str]):
+        """Initialize replica router."""
+        self.urls = urls
+        self.engines = [_create_engine(url) for url in urls]
+        self.session_makers = [
+            async_sessionmaker(replica, class_=AsyncSession, expire_on_commit=False, info={READ_ONLY: True})
+            for replica in self.engines
+        ]
+        self.healthy = [True] * len(urls)
+        self.lag: List[Optional[float]] = [None] * len(urls)
+        self.errors: List[Optional[str]] = [None] * len(urls)
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.pinned_reads = 0
+        self._next = 0
+        self._recent_writes: Dict[str, float] = {}
+
+    def mark_write(self, user_id: Optional[str]):
+        """Pin the user's reads to the primary for the read-your-writes window."""
+        if not self.engines or not user_id:
+            return
+        now = time.monotonic()
+        if len(self._recent_writes) >= 10000:
+            self._recent_writes = {uid: until for uid, until in self._recent_writes.items() if until > now}
+        self._recent_writes[user_id] = now + settings.read_your_writes_seconds
+
+    def is_pinned(self, user_ids: Iterable[str]) -> bool:
+        """Whether any of the users wrote recently."""
+        now = time.monotonic()
+        return any(self._recent_writes.get(user_id, 0) > now for user_id in user_ids)
+
+    def session_maker_for(self, user_ids: Iterable[str] = ()) -> async_sessionmaker:
+        """Session factory for a read about user_ids."""
+        if not self.engines:
+            return async_session_maker
+        if self.is_pinned(user_ids):
+            self.pinned_reads += 1
+            return async_session_maker
+
+        healthy = [i for i, ok in enumerate(self.healthy) if ok]
+        if not healthy:
+            self.primary_reads += 1
+            return async_session_maker
+        self.replica_reads += 1
+        self._next += 1
+        return self.session_makers[healthy[self._next % len(healthy)]]
+
+    async def check(self):
+        """Measure replica lag and update the rotation."""
+        for i, replica in enumerate(self.engines):
+            try:
+                async with replica.connect() as conn:
+                    lag = await conn.scalar(REPLICA_LAG_SQL)
+                self.lag[i] = float(lag) if lag is not None else None
+                self.errors[i] = None
+                healthy = lag is not None and float(lag) <= settings.replica_max_lag_seconds
+            except Exception as e:
+                self.lag[i] = None
+                self.errors[i] = f"{type(e).__name__}: {e}"
+                healthy = False
+
+            if healthy != self.healthy[i]:
+                if healthy:
+                    logger.info(f"Replica {i} back in rotation (lag {self.lag[i]:.1f}s)")
+                else:
+                    logger.warning(f"Replica {i} out of rotation: lag={self.lag[i]} error={self.errors[i]}")
+            self.healthy[i] = healthy
+
+    def on_change(self, event: dict):
+        """Change bus handler: a write on any worker pins its user here too."""
+        if event.get("op") != "resync":
+            self.mark_write(event.get("user_id"))
+
+    def stats(self) -> dict:
+        """Replica status for monitoring."""
+        return {
+            "replicas": [
+                {
+                    "url": make_url(url).render_as_string(hide_password=True),
+                    "healthy": self.healthy[i],
+                    "lag_seconds": self.lag[i],
+                    "error": self.errors[i],
+                    "pool": pool_stats(self.engines[i])
+                }
+                for i, url in enumerate(self.urls)
+            ],
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "pinned_reads": self.pinned_reads,
+            "pinned_users": sum(1 for until in self._recent_writes.values() if until > time.monotonic())
+        }
+
+
+# Singleton instance
+_replica_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> ReplicaRouter:
+    """Get or create replica router singleton."""
+    global _replica_router
+    if _replica_router is None:
+        urls = [url.strip() for url in settings.database_replica_urls.split(",") if url.strip()]
+        _replica_router = ReplicaRouter(urls)
+    return _replica_router
+
+
+async def _request_user_ids(request: Request) -> List[str]:
+    """Users a read is about: path / query `user_id`, or the JSON body (also batch `requests`)."""
+    user_id = request.path_params.get("user_id") or request.query_params.get("user_id")
+    if user_id:
+        return [user_id]
+    if "json" not in request.headers.get("content-type", ""):
+        return []
+    try:
+        # Already read and cached by FastAPI for the endpoint's body parameter
+        body = await request.json()
+    except ValueError:
+        return []
+    if not isinstance(body, dict):
+        return []
+    if isinstance(body.get("user_id"), str):
+        return [body["user_id"]]
+    return [
+        item["user_id"] for item in body.get("requests") or []
+        if isinstance(item, dict) and isinstance(item.get("user_id"), str)
+    ]
+
+
+async def get_read_db(request: Request) -> AsyncSession:
+    """Dependency for read-only routes: a replica session unless the user wrote recently."""
+    router = get_replica_router()
+    user_ids = await _request_user_ids(request) if router.engines else []
+    async with router.session_maker_for(user_ids)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def get_read_db_context(user_ids: Iterable[str] = ()):
+    """Context manager for a read session (see get_read_db)."""
+    async with get_replica_router().session_maker_for(user_ids)() as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+
+@asynccontextmanager
+async def primary_session(db: AsyncSession):
+    """
+    Session for a write made while serving a read.
+
+    Yields db itself when it is bound to the primary, otherwise a new
+    primary session (replicas reject writes). The caller commits.
+    """
+    if not db.info.get(READ_ONLY):
+        yield db
+        return
+    async with get_db_context() as session:
+        yield session
+
+
+def mark_user_write(user_id: Optional[str]):
+    """Record a committed write so the user's next reads see it (read-your-writes)."""
+    get_replica_router().mark_write(user_id)
+
+
+async def run_replica_check_job():
+    """Background job: measure replica lag."""
+    await get_replica_router().check()
+
+
+def get_asyncpg_dsn() -> str:
+    """
+    Plain asyncpg DSN for raw connections (LISTEN, snapshot COPY).
+
+    Uses database_direct_url when set: LISTEN needs a session-mode
+    connection, which pgbouncer transaction pooling does not provide.
+    """
+    url = make_url(settings.database_direct_url or settings.database_url).set(drivername="postgresql")
+    return url.render_as_string(hide_password=False)
+
+
 async def check_database_connection() -> bool:
     """Check if database is reachable."""
     try:
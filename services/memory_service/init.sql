@@ -28,12 +28,64 @@ CREATE TABLE notams (
     title VARCHAR(255) NOT NULL,
     content TEXT NOT NULL,
     priority VARCHAR(50) DEFAULT 'normal',
+    priority_rank SMALLINT GENERATED ALWAYS AS (
+        CASE priority
+            WHEN 'critical' THEN 4
+            WHEN 'high' THEN 3
+            WHEN 'normal' THEN 2
+            WHEN 'low' THEN 1
+            WHEN 'info' THEN 0
+            ELSE 2
+        END
+    ) STORED,
     category VARCHAR(100),
     active BOOLEAN DEFAULT true,
     expires_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Broadcast NOTAMs: Global / group notices stored once, merged per user at read time
+CREATE TABLE broadcast_notams (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    scope VARCHAR(20) NOT NULL DEFAULT 'global',
+    group_id VARCHAR(255),
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    priority VARCHAR(50) DEFAULT 'normal',
+    priority_rank SMALLINT GENERATED ALWAYS AS (
+        CASE priority
+            WHEN 'critical' THEN 4
+            WHEN 'high' THEN 3
+            WHEN 'normal' THEN 2
+            WHEN 'low' THEN 1
+            WHEN 'info' THEN 0
+            ELSE 2
+        END
+    ) STORED,
+    category VARCHAR(100),
+    active BOOLEAN DEFAULT true,
+    expires_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CHECK ((scope = 'global' AND group_id IS NULL) OR (scope = 'group' AND group_id IS NOT NULL))
+);
+
+-- NOTAM groups: Audience of group-scoped broadcast NOTAMs
+CREATE TABLE notam_group_members (
+    group_id VARCHAR(255) NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (group_id, user_id)
+);
+
+-- NOTAM acks: Per-user acknowledgement / dismissal of broadcast NOTAMs
+CREATE TABLE notam_acks (
+    user_id VARCHAR(255) NOT NULL,
+    notam_id UUID NOT NULL REFERENCES broadcast_notams(id) ON DELETE CASCADE,
+    dismissed BOOLEAN NOT NULL DEFAULT false,
+    acked_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, notam_id)
+);
+
 -- Sessions: Last activity tracking
 CREATE TABLE sessions (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -68,6 +120,33 @@ CREATE TABLE memories (
     access_count INTEGER DEFAULT 0
 );
 
+-- Memories Archive: Cold tier for rarely accessed memories (no vector index)
+CREATE TABLE memories_archive (
+    id UUID PRIMARY KEY,
+    user_id VARCHAR(255) NOT NULL,
+    agent_id VARCHAR(255) NOT NULL DEFAULT 'shared',
+    access_mode VARCHAR(20) NOT NULL DEFAULT 'private',
+    content TEXT NOT NULL,
+    memory_type VARCHAR(50) NOT NULL,
+    embedding VECTOR(384),
+    importance FLOAT DEFAULT 0.5,
+    metadata JSONB DEFAULT '{}',
+    source_conversation_id VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE,
+    accessed_at TIMESTAMP WITH TIME ZONE,
+    access_count INTEGER DEFAULT 0,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- Memory Quotas: Per-user ('*') / per-agent overrides of the configured defaults
+CREATE TABLE memory_quotas (
+    user_id VARCHAR(255) NOT NULL,
+    agent_id VARCHAR(255) NOT NULL DEFAULT '*',
+    max_memories INTEGER NOT NULL CHECK (max_memories >= 0), -- 0 = unlimited
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, agent_id)
+);
+
 -- Relationships: Graph-style connections between memories
 CREATE TABLE relationships (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -84,17 +163,33 @@ CREATE TABLE relationships (
 
 -- Layer 1 indexes
 CREATE INDEX idx_personas_user ON personas(user_id);
-CREATE INDEX idx_notams_user_active ON notams(user_id, active) WHERE active = true;
+CREATE INDEX idx_notams_active_rank ON notams(user_id, priority_rank DESC, created_at DESC, id DESC)
+    INCLUDE (expires_at) WHERE active = true;
+CREATE INDEX idx_notams_active_category_rank ON notams(user_id, category, priority_rank DESC, created_at DESC, id DESC)
+    INCLUDE (expires_at) WHERE active = true;
+CREATE INDEX idx_notams_user_rank ON notams(user_id, priority_rank DESC, created_at DESC, id DESC);
+CREATE INDEX idx_broadcast_notams_active ON broadcast_notams(group_id, priority_rank DESC, created_at DESC)
+    INCLUDE (expires_at) WHERE active = true;
+CREATE INDEX idx_notam_group_members_user ON notam_group_members(user_id);
 CREATE INDEX idx_sessions_user ON sessions(user_id);
 CREATE INDEX idx_sessions_updated ON sessions(updated_at DESC);
+CREATE UNIQUE INDEX uq_sessions_user_agent ON sessions (user_id, (COALESCE(agent_type, '')));
 
 -- Layer 2 indexes
-CREATE INDEX idx_memories_user ON memories(user_id);
 CREATE INDEX idx_memories_agent ON memories(user_id, agent_id);
 CREATE INDEX idx_memories_type ON memories(user_id, memory_type);
+-- Keyset pagination (one index per filter combination, ending in the sort key)
+CREATE INDEX idx_memories_user_created ON memories(user_id, created_at DESC, id DESC);
+CREATE INDEX idx_memories_agent_created ON memories(user_id, agent_id, created_at DESC, id DESC);
+CREATE INDEX idx_memories_type_created ON memories(user_id, memory_type, created_at DESC, id DESC);
+CREATE INDEX idx_memories_agent_type_created ON memories(user_id, agent_id, memory_type, created_at DESC, id DESC);
 CREATE INDEX idx_memories_access ON memories(user_id, access_mode);
 CREATE INDEX idx_memories_created ON memories(created_at DESC);
 CREATE INDEX idx_memories_embedding ON memories USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100);
+CREATE INDEX idx_memories_last_access ON memories ((COALESCE(accessed_at, created_at)));
+
+-- Archive indexes (cold tier: no vector index)
+CREATE INDEX idx_memories_archive_user ON memories_archive(user_id, agent_id);
 
 -- Relationship indexes
 CREATE INDEX idx_relationships_source ON relationships(source_memory_id);
@@ -122,6 +217,32 @@ CREATE TRIGGER sessions_updated_at
     BEFORE UPDATE ON sessions
     FOR EACH ROW EXECUTE FUNCTION update_updated_at();
 
+-- Recursive JSONB merge for persona updates: objects merge key by key,
+-- any other value in patch replaces target
+CREATE OR REPLACE FUNCTION jsonb_deep_merge(target JSONB, patch JSONB)
+RETURNS JSONB AS $$
+BEGIN
+    IF target IS NULL OR patch IS NULL THEN
+        RETURN COALESCE(patch, target);
+    END IF;
+    IF jsonb_typeof(target) <> 'object' OR jsonb_typeof(patch) <> 'object' THEN
+        RETURN patch;
+    END IF;
+    RETURN (
+        SELECT COALESCE(jsonb_object_agg(
+            COALESCE(t.key, p.key),
+            CASE
+                WHEN t.key IS NULL THEN p.value
+                WHEN p.key IS NULL THEN t.value
+                ELSE jsonb_deep_merge(t.value, p.value)
+            END
+        ), '{}'::jsonb)
+        FROM jsonb_each(target) t
+        FULL OUTER JOIN jsonb_each(patch) p ON t.key = p.key
+    );
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
 -- =====================================================
 -- INITIAL DATA
 -- =====================================================
@@ -8,15 +8,25 @@ Run with: uvicorn memory_service.main:app --host 127.0.0.1 --port 9420 --reload
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 import logging
 import sys
 
 from .config import get_settings
-from .database import init_database, check_database_connection
-from .routers import context_router, persona_router, notam_router, memory_router
+from .database import init_database, get_replica_router, run_replica_check_job
+from .routers import context_router, persona_router, notam_router, memory_router, admin_router, events_router
+from .services.scheduler import PeriodicTask, get_scheduler
+from .services.tiering import run_tiering_job
+from .services.quota import run_quota_eviction_job, track_writes_on_change
+from .services.index_maintenance import run_index_maintenance_job
+from .services.session_tracker import get_session_tracker, run_session_flush_job
+from .services.notam_sweeper import run_notam_sweep_job
+from .services.change_bus import ALL_TABLES, get_change_bus
+from .services.cache import evict_on_change
+from .services.single_flight import forget_on_change
+from .services.health import get_health_prober, run_health_probe_job
 
 # Configure logging
 logging.basicConfig(
@@ -43,10 +53,49 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         logger.warning("Service will start but database operations will fail")
 
+    # Background maintenance jobs
+    scheduler = get_scheduler()
+    scheduler.add(PeriodicTask(
+        "health-probe", settings.health_probe_interval_seconds, run_health_probe_job, initial_delay=0
+    ))
+    if settings.tiering_enabled:
+        scheduler.add(PeriodicTask("memory-tiering", settings.tiering_interval_seconds, run_tiering_job))
+    if settings.quota_enabled:
+        scheduler.add(PeriodicTask("quota-eviction", settings.quota_eviction_interval_seconds, run_quota_eviction_job))
+    if settings.maintenance_enabled:
+        scheduler.add(PeriodicTask("index-maintenance", settings.maintenance_interval_seconds, run_index_maintenance_job))
+    if settings.notam_sweep_enabled:
+        scheduler.add(PeriodicTask("notam-sweep", settings.notam_sweep_interval_seconds, run_notam_sweep_job))
+    if get_replica_router().engines:
+        scheduler.add(PeriodicTask(
+            "replica-check", settings.replica_check_interval_seconds, run_replica_check_job, initial_delay=0
+        ))
+    if settings.session_write_behind:
+        scheduler.add(PeriodicTask("session-flush", settings.session_write_behind_window_seconds, run_session_flush_job))
+    scheduler.start_all()
+
+    if settings.change_events_enabled:
+        change_bus = get_change_bus()
+        # Writes on any worker evict this worker's Layer 1 cache
+        change_bus.add_handler(ALL_TABLES, evict_on_change)
+        # ...and pin their user's reads to the primary (read-your-writes)
+        change_bus.add_handler(ALL_TABLES, get_replica_router().on_change)
+        # ...and stop later reads joining flights that started before the write
+        change_bus.add_handler(ALL_TABLES, forget_on_change)
+        # ...and queue users who added memories for the next quota check
+        change_bus.add_handler(ALL_TABLES, track_writes_on_change)
+        change_bus.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down service...")
+    await scheduler.stop_all()
+    await get_change_bus().stop()
+    try:
+        await get_session_tracker().flush()
+    except Exception as e:
+        logger.error(f"Failed to flush pending session touches: {e}")
 
 
 # Create FastAPI app
@@ -100,6 +149,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "Retry-After"],
 )
 
 
@@ -108,6 +158,8 @@ app.include_router(context_router)
 app.include_router(persona_router)
 app.include_router(notam_router)
 app.include_router(memory_router)
+app.include_router(admin_router)
+app.include_router(events_router)
 
 
 # Root endpoint
@@ -123,21 +175,36 @@ async def root():
     }
 
 
-# Health check
+# Health check (cached; probes never touch the pool)
 @app.get("/health")
 async def health():
-    """Health check endpoint."""
-    db_healthy = await check_database_connection()
-
+    """Service health from the last background probe."""
+    status = get_health_prober().status()
     return {
-        "status": "healthy" if db_healthy else "degraded",
+        "status": status["status"],
         "service": settings.service_name,
         "version": settings.service_version,
-        "database": db_healthy,
+        "database": status["components"].get("database", {}).get("healthy", False),
+        "checked_at": status["checked_at"],
         "timestamp": datetime.now(timezone.utc).isoformat()
     }
 
 
+@app.get("/health/live")
+async def liveness():
+    """Liveness: the process is serving requests (constant time, no I/O)."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness(response: Response):
+    """Readiness: cached component status with latencies; 503 until database and embedder are healthy."""
+    status = get_health_prober().status()
+    if not status["ready"]:
+        response.status_code = 503
+    return status
+
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
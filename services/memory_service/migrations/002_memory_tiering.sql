@@ -0,0 +1,31 @@
+-- Migration 002: Hot/cold memory tiering
+-- Date: 2026-10-19
+-- Rationale: Rarely accessed memories stay in the hot ivfflat index and slow every search.
+--            The tiering worker moves them into memories_archive (no vector index);
+--            search falls back to the archive only when the hot tier returns too few results.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS memories_archive (
+    id UUID PRIMARY KEY,
+    user_id VARCHAR(255) NOT NULL,
+    agent_id VARCHAR(255) NOT NULL DEFAULT 'shared',
+    access_mode VARCHAR(20) NOT NULL DEFAULT 'private',
+    content TEXT NOT NULL,
+    memory_type VARCHAR(50) NOT NULL,
+    embedding VECTOR(384), -- kept for cold search / promotion, intentionally not indexed
+    importance FLOAT DEFAULT 0.5,
+    metadata JSONB DEFAULT '{}',
+    source_conversation_id VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE,
+    accessed_at TIMESTAMP WITH TIME ZONE,
+    access_count INTEGER DEFAULT 0,
+    archived_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_memories_archive_user ON memories_archive(user_id, agent_id);
+
+-- Supports the worker's cold-row scan
+CREATE INDEX IF NOT EXISTS idx_memories_last_access ON memories ((COALESCE(accessed_at, created_at)));
+
+COMMIT;
@@ -0,0 +1,17 @@
+-- Migration 003: Per-user / per-agent memory quotas
+-- Date: 2026-10-19
+-- Rationale: Runaway agents write thousands of memories per user and slow the shared index.
+--            Defaults come from MEMORY_QUOTA_* settings; rows here override them.
+--            agent_id = '*' is a user-wide quota. max_memories = 0 means unlimited.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS memory_quotas (
+    user_id VARCHAR(255) NOT NULL,
+    agent_id VARCHAR(255) NOT NULL DEFAULT '*',
+    max_memories INTEGER NOT NULL CHECK (max_memories >= 0),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, agent_id)
+);
+
+COMMIT;
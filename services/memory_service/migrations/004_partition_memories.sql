@@ -0,0 +1,110 @@
+-- Migration 004: Hash-partition memories by user_id
+-- Date: 2026-10-19
+-- Rationale: Every query filters on user_id but memories is one heap with one global
+--            ivfflat index, so each tenant's vector search probes every tenant's data.
+--            A HASH (user_id) partitioned table gives partition pruning on every query,
+--            per-partition vector indexes (smaller probes) and per-partition maintenance.
+--
+-- Rollout (online):
+--   1. psql -d memory -f migrations/004_partition_memories.sql
+--        creates memories_p + partitions + indexes and a trigger that mirrors every
+--        write on memories into memories_p from now on
+--   2. python -m memory_service.partition_copy
+--        backfills existing rows in small keyset batches (safe to re-run)
+--   3. python -m memory_service.partition_copy --swap
+--        verifies counts, renames memories_p -> memories under a short lock
+--   4. Set MEMORY_MEMORY_PARTITIONED=true
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS memories_p (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    user_id VARCHAR(255) NOT NULL,
+    agent_id VARCHAR(255) NOT NULL DEFAULT 'shared',
+    access_mode VARCHAR(20) NOT NULL DEFAULT 'private',
+    content TEXT NOT NULL,
+    memory_type VARCHAR(50) NOT NULL,
+    embedding VECTOR(384),
+    importance FLOAT DEFAULT 0.5,
+    metadata JSONB DEFAULT '{}',
+    source_agent VARCHAR(255), -- deprecated, kept for ORM compatibility
+    source_conversation_id VARCHAR(255),
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    accessed_at TIMESTAMP WITH TIME ZONE,
+    access_count INTEGER DEFAULT 0,
+    -- Partition key must be part of the primary key
+    PRIMARY KEY (id, user_id)
+) PARTITION BY HASH (user_id);
+
+-- 16 partitions (change modulus before first run if needed)
+DO $$
+DECLARE
+    n_partitions CONSTANT INTEGER := 16;
+    i INTEGER;
+BEGIN
+    FOR i IN 0..n_partitions - 1 LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS memories_p_%s PARTITION OF memories_p
+             FOR VALUES WITH (MODULUS %s, REMAINDER %s)',
+            lpad(i::text, 2, '0'), n_partitions, i
+        );
+    END LOOP;
+END $$;
+
+-- Partitioned indexes: created once on the parent, materialized per partition
+CREATE INDEX IF NOT EXISTS idx_memories_p_agent ON memories_p(user_id, agent_id);
+CREATE INDEX IF NOT EXISTS idx_memories_p_type ON memories_p(user_id, memory_type);
+CREATE INDEX IF NOT EXISTS idx_memories_p_access ON memories_p(user_id, access_mode);
+CREATE INDEX IF NOT EXISTS idx_memories_p_created ON memories_p(user_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_memories_p_last_access ON memories_p ((COALESCE(accessed_at, created_at)));
+-- Keyset pagination (see 009_keyset_pagination.sql)
+CREATE INDEX IF NOT EXISTS idx_memories_p_user_created ON memories_p(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_memories_p_agent_created ON memories_p(user_id, agent_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_memories_p_type_created ON memories_p(user_id, memory_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_memories_p_agent_type_created ON memories_p(user_id, agent_id, memory_type, created_at DESC, id DESC);
+-- Per-partition ivfflat: each partition holds ~1/16 of the rows, so fewer lists
+CREATE INDEX IF NOT EXISTS idx_memories_p_embedding ON memories_p
+    USING ivfflat (embedding vector_cosine_ops) WITH (lists = 25);
+
+-- Mirror writes on memories into memories_p while the backfill runs
+CREATE OR REPLACE FUNCTION mirror_memories_to_partitioned()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM memories_p WHERE id = OLD.id AND user_id = OLD.user_id;
+        RETURN OLD;
+    END IF;
+
+    IF TG_OP = 'UPDATE' AND NEW.user_id IS DISTINCT FROM OLD.user_id THEN
+        DELETE FROM memories_p WHERE id = OLD.id AND user_id = OLD.user_id;
+    END IF;
+
+    INSERT INTO memories_p (
+        id, user_id, agent_id, access_mode, content, memory_type, embedding,
+        importance, metadata, source_conversation_id, created_at, accessed_at, access_count
+    ) VALUES (
+        NEW.id, NEW.user_id, NEW.agent_id, NEW.access_mode, NEW.content, NEW.memory_type, NEW.embedding,
+        NEW.importance, NEW.metadata, NEW.source_conversation_id, NEW.created_at, NEW.accessed_at, NEW.access_count
+    )
+    ON CONFLICT (id, user_id) DO UPDATE SET
+        agent_id = EXCLUDED.agent_id,
+        access_mode = EXCLUDED.access_mode,
+        content = EXCLUDED.content,
+        memory_type = EXCLUDED.memory_type,
+        embedding = EXCLUDED.embedding,
+        importance = EXCLUDED.importance,
+        metadata = EXCLUDED.metadata,
+        source_conversation_id = EXCLUDED.source_conversation_id,
+        created_at = EXCLUDED.created_at,
+        accessed_at = EXCLUDED.accessed_at,
+        access_count = EXCLUDED.access_count;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS memories_mirror_partitioned ON memories;
+CREATE TRIGGER memories_mirror_partitioned
+    AFTER INSERT OR UPDATE OR DELETE ON memories
+    FOR EACH ROW EXECUTE FUNCTION mirror_memories_to_partitioned();
+
+COMMIT;
@@ -0,0 +1,24 @@
+-- Migration 005: One session row per (user_id, agent_type)
+-- Date: 2026-10-19
+-- Rationale: /context did SELECT-then-INSERT, so concurrent agents for one user raced into
+--            duplicate rows (which then broke scalar_one_or_none()). Session writes are now
+--            INSERT ... ON CONFLICT (user_id, (COALESCE(agent_type, ''))) DO UPDATE.
+
+BEGIN;
+
+-- Keep only the most recently updated row per (user_id, agent_type)
+DELETE FROM sessions s
+USING (
+    SELECT id, ROW_NUMBER() OVER (
+        PARTITION BY user_id, COALESCE(agent_type, '')
+        ORDER BY updated_at DESC NULLS LAST, created_at DESC NULLS LAST
+    ) AS rn
+    FROM sessions
+) ranked
+WHERE s.id = ranked.id AND ranked.rn > 1;
+
+-- NULL agent_type is treated as a single value (works on PostgreSQL 14+)
+CREATE UNIQUE INDEX IF NOT EXISTS uq_sessions_user_agent
+    ON sessions (user_id, (COALESCE(agent_type, '')));
+
+COMMIT;
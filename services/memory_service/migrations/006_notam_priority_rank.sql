@@ -0,0 +1,34 @@
+-- Migration 006: Numeric NOTAM priority rank + active-set index
+-- Date: 2026-10-19
+-- Rationale: NOTAMs were ordered by the priority string ("normal" > "critical"
+--            alphabetically) and expired rows were filtered in Python. priority_rank is
+--            derived from priority; the partial index serves the active set in context
+--            order. NOW() cannot appear in an index predicate, so expiry stays a filter on
+--            the (included) expires_at column and the NOTAM sweeper deactivates expired rows.
+
+BEGIN;
+
+ALTER TABLE notams
+    ADD COLUMN IF NOT EXISTS priority_rank SMALLINT GENERATED ALWAYS AS (
+        CASE priority
+            WHEN 'critical' THEN 4
+            WHEN 'high' THEN 3
+            WHEN 'normal' THEN 2
+            WHEN 'low' THEN 1
+            WHEN 'info' THEN 0
+            ELSE 2
+        END
+    ) STORED;
+
+-- Deactivate what has already expired so the active set starts small
+UPDATE notams SET active = false
+WHERE active = true AND expires_at IS NOT NULL AND expires_at <= NOW();
+
+CREATE INDEX IF NOT EXISTS idx_notams_active_rank
+    ON notams (user_id, priority_rank DESC, created_at DESC)
+    INCLUDE (expires_at)
+    WHERE active = true;
+
+DROP INDEX IF EXISTS idx_notams_user_active;
+
+COMMIT;
@@ -0,0 +1,35 @@
+-- Migration 007: Recursive JSONB merge for persona updates
+-- Date: 2026-10-19
+-- Rationale: update_persona merged traits/preferences/style in Python after a SELECT, so
+--            concurrent updates overwrote each other. Updates are now a single
+--            UPDATE ... SET traits = traits || :patch (or jsonb_deep_merge) RETURNING.
+
+BEGIN;
+
+-- Recursive JSONB merge for persona updates: objects merge key by key,
+-- any other value in patch replaces target
+CREATE OR REPLACE FUNCTION jsonb_deep_merge(target JSONB, patch JSONB)
+RETURNS JSONB AS $$
+BEGIN
+    IF target IS NULL OR patch IS NULL THEN
+        RETURN COALESCE(patch, target);
+    END IF;
+    IF jsonb_typeof(target) <> 'object' OR jsonb_typeof(patch) <> 'object' THEN
+        RETURN patch;
+    END IF;
+    RETURN (
+        SELECT COALESCE(jsonb_object_agg(
+            COALESCE(t.key, p.key),
+            CASE
+                WHEN t.key IS NULL THEN p.value
+                WHEN p.key IS NULL THEN t.value
+                ELSE jsonb_deep_merge(t.value, p.value)
+            END
+        ), '{}'::jsonb)
+        FROM jsonb_each(target) t
+        FULL OUTER JOIN jsonb_each(patch) p ON t.key = p.key
+    );
+END;
+$$ LANGUAGE plpgsql IMMUTABLE;
+
+COMMIT;
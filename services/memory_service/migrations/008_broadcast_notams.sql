@@ -0,0 +1,55 @@
+-- Migration 008: Broadcast NOTAMs stored once
+-- Date: 2026-10-19
+-- Rationale: system-wide notices had to be inserted as one notams row per user (N rows,
+--            N index entries). Global / group NOTAMs now live once in broadcast_notams and
+--            are merged into each user's NOTAMs at read time; per-user acknowledgement and
+--            dismissal is a compact (user_id, notam_id) row.
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS broadcast_notams (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    scope VARCHAR(20) NOT NULL DEFAULT 'global',
+    group_id VARCHAR(255),
+    title VARCHAR(255) NOT NULL,
+    content TEXT NOT NULL,
+    priority VARCHAR(50) DEFAULT 'normal',
+    priority_rank SMALLINT GENERATED ALWAYS AS (
+        CASE priority
+            WHEN 'critical' THEN 4
+            WHEN 'high' THEN 3
+            WHEN 'normal' THEN 2
+            WHEN 'low' THEN 1
+            WHEN 'info' THEN 0
+            ELSE 2
+        END
+    ) STORED,
+    category VARCHAR(100),
+    active BOOLEAN DEFAULT true,
+    expires_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CHECK ((scope = 'global' AND group_id IS NULL) OR (scope = 'group' AND group_id IS NOT NULL))
+);
+
+CREATE TABLE IF NOT EXISTS notam_group_members (
+    group_id VARCHAR(255) NOT NULL,
+    user_id VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (group_id, user_id)
+);
+
+CREATE TABLE IF NOT EXISTS notam_acks (
+    user_id VARCHAR(255) NOT NULL,
+    notam_id UUID NOT NULL REFERENCES broadcast_notams(id) ON DELETE CASCADE,
+    dismissed BOOLEAN NOT NULL DEFAULT false,
+    acked_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, notam_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_broadcast_notams_active
+    ON broadcast_notams (group_id, priority_rank DESC, created_at DESC)
+    INCLUDE (expires_at)
+    WHERE active = true;
+CREATE INDEX IF NOT EXISTS idx_notam_group_members_user ON notam_group_members (user_id);
+
+COMMIT;
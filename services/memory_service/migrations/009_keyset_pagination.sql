@@ -0,0 +1,57 @@
+-- Migration 009: Composite indexes for keyset pagination
+-- Date: 2026-10-19
+-- Rationale: GET /memory paged with OFFSET, so deep pages scanned and discarded every
+--            earlier row. Listings now continue after the last (created_at, id) of the
+--            previous page (NOTAMs: (priority_rank, created_at, id)), which needs one index
+--            per filter combination ending in the sort key. Rows without created_at would
+--            fall out of row comparisons, so they are backfilled. The older (user_id,
+--            agent_id) / (user_id, memory_type) indexes stay: the partition swap and the
+--            CLUSTER maintenance step refer to them.
+
+BEGIN;
+
+-- Memories: user_id [+ agent_id] [+ memory_type], newest first
+UPDATE memories SET created_at = COALESCE(accessed_at, NOW()) WHERE created_at IS NULL;
+
+CREATE INDEX IF NOT EXISTS idx_memories_user_created
+    ON memories (user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_memories_agent_created
+    ON memories (user_id, agent_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_memories_type_created
+    ON memories (user_id, memory_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_memories_agent_type_created
+    ON memories (user_id, agent_id, memory_type, created_at DESC, id DESC);
+
+DROP INDEX IF EXISTS idx_memories_user;
+
+-- Partitioning in progress (migration 004 applied, not swapped yet): same indexes on memories_p
+DO $$
+BEGIN
+    IF to_regclass('memories_p') IS NOT NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_memories_p_user_created
+            ON memories_p (user_id, created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_memories_p_agent_created
+            ON memories_p (user_id, agent_id, created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_memories_p_type_created
+            ON memories_p (user_id, memory_type, created_at DESC, id DESC);
+        CREATE INDEX IF NOT EXISTS idx_memories_p_agent_type_created
+            ON memories_p (user_id, agent_id, memory_type, created_at DESC, id DESC);
+    END IF;
+END $$;
+
+-- NOTAMs: user_id [+ active] [+ category], by priority then newest first
+UPDATE notams SET created_at = NOW() WHERE created_at IS NULL;
+
+DROP INDEX IF EXISTS idx_notams_active_rank;
+CREATE INDEX idx_notams_active_rank
+    ON notams (user_id, priority_rank DESC, created_at DESC, id DESC)
+    INCLUDE (expires_at)
+    WHERE active = true;
+CREATE INDEX IF NOT EXISTS idx_notams_active_category_rank
+    ON notams (user_id, category, priority_rank DESC, created_at DESC, id DESC)
+    INCLUDE (expires_at)
+    WHERE active = true;
+CREATE INDEX IF NOT EXISTS idx_notams_user_rank
+    ON notams (user_id, priority_rank DESC, created_at DESC, id DESC);
+
+COMMIT;
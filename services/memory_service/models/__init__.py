@@ -6,10 +6,20 @@ from .persona import Persona
 from .notam import Notam
 from .session import Session
 from .memory import Memory
+from .archive import ArchivedMemory
+from .quota import MemoryQuota
+from .broadcast_notam import BroadcastNotam
+from .notam_ack import NotamAck
+from .notam_group import NotamGroupMember
 
 __all__ = [
     "Persona",
     "Notam",
     "Session",
-    "Memory"
+    "Memory",
+    "ArchivedMemory",
+    "MemoryQuota",
+    "BroadcastNotam",
+    "NotamAck",
+    "NotamGroupMember"
 ]
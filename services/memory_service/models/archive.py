@@ -0,0 +1,51 @@
+"""
+Archived Memory Model - Cold tier for rarely accessed memories
+"""
+
+from sqlalchemy import Column, String, Text, Float, Integer, DateTime, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from pgvector.sqlalchemy import Vector
+from datetime import datetime, timezone
+
+from ..database import Base
+from ..config import get_settings
+
+settings = get_settings()
+
+
+class ArchivedMemory(Base):
+    """Cold memory moved out of the hot table (no vector index)."""
+
+    __tablename__ = "memories_archive"
+
+    id = Column(UUID(as_uuid=True), primary_key=True)
+    user_id = Column(String(255), nullable=False, index=True)
+    agent_id = Column(String(255), nullable=False, default="shared")
+    access_mode = Column(String(20), nullable=False, default="private")
+    content = Column(Text, nullable=False)
+    memory_type = Column(String(50), nullable=False)
+    embedding = Column(Vector(settings.embedding_dimension))
+    importance = Column(Float, default=0.5)
+    extra_data = Column("metadata", JSONB, default=dict)
+    source_conversation_id = Column(String(255))
+    created_at = Column(DateTime(timezone=True))
+    accessed_at = Column(DateTime(timezone=True))
+    access_count = Column(Integer, default=0)
+    archived_at = Column(DateTime(timezone=True), server_default=text("NOW()"), default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "id": str(self.id),
+            "user_id": self.user_id,
+            "agent_id": self.agent_id,
+            "access_mode": self.access_mode,
+            "content": self.content,
+            "memory_type": self.memory_type,
+            "importance": self.importance,
+            "metadata": self.extra_data or {},
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "accessed_at": self.accessed_at.isoformat() if self.accessed_at else None,
+            "access_count": self.access_count,
+            "archived_at": self.archived_at.isoformat() if self.archived_at else None
+        }
@@ -0,0 +1,54 @@
+"""
+Broadcast NOTAM Model - Global / group notices stored once
+"""
+
+from sqlalchemy import Column, String, Text, Boolean, DateTime, SmallInteger, Computed, Index, text
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime, timezone
+
+from ..database import Base
+from .notam import PRIORITY_RANK_SQL
+
+SCOPE_GLOBAL = "global"
+SCOPE_GROUP = "group"
+
+
+class BroadcastNotam(Base):
+    """NOTAM shown to every user (global) or to the members of a group."""
+
+    __tablename__ = "broadcast_notams"
+    __table_args__ = (
+        Index(
+            "idx_broadcast_notams_active",
+            "group_id", text("priority_rank DESC"), text("created_at DESC"),
+            postgresql_where=text("active = true"),
+            postgresql_include=["expires_at"]
+        ),
+    )
+
+    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
+    scope = Column(String(20), nullable=False, default=SCOPE_GLOBAL)  # global, group
+    group_id = Column(String(255))  # NULL for global
+    title = Column(String(255), nullable=False)
+    content = Column(Text, nullable=False)
+    priority = Column(String(50), default="normal")
+    priority_rank = Column(SmallInteger, Computed(PRIORITY_RANK_SQL, persisted=True))
+    category = Column(String(100))
+    active = Column(Boolean, default=True)
+    expires_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "id": str(self.id),
+            "scope": self.scope,
+            "group_id": self.group_id,
+            "title": self.title,
+            "content": self.content,
+            "priority": self.priority,
+            "category": self.category,
+            "active": self.active,
+            "expires_at": self.expires_at.isoformat() if self.expires_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
@@ -17,9 +17,14 @@ class Memory(Base):
     """Semantic memory with vector embedding."""
 
     __tablename__ = "memories"
+    # Hash-partitioned on user_id (migrations/004_partition_memories.sql); the
+    # database primary key is then (id, user_id), ids remain globally unique.
+    __table_args__ = (
+        {"postgresql_partition_by": "HASH (user_id)"} if settings.memory_partitioned else {}
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
-    user_id = Column(String(255), nullable=False, index=True)
+    user_id = Column(String(255), nullable=False, index=True, primary_key=settings.memory_partitioned)
     agent_id = Column(String(255), nullable=False, default="shared")  # which agent owns this
     access_mode = Column(String(20), nullable=False, default="private")  # private or shared
     content = Column(Text, nullable=False)
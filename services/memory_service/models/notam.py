@@ -2,23 +2,50 @@
 NOTAM Model - Critical notices that must be shown
 """
 
-from sqlalchemy import Column, String, Text, Boolean, DateTime, text
+from sqlalchemy import Column, String, Text, Boolean, DateTime, SmallInteger, Computed, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 
 from ..database import Base
 
+# Numeric rank for ordering (higher = more important); unknown priorities rank as normal
+PRIORITY_RANKS = {"critical": 4, "high": 3, "normal": 2, "low": 1, "info": 0}
+PRIORITY_RANK_SQL = "CASE priority " + " ".join(
+    f"WHEN '{name}' THEN {rank}" for name, rank in PRIORITY_RANKS.items()
+) + f" ELSE {PRIORITY_RANKS['normal']} END"
+
 
 class Notam(Base):
     """Notice to AI agents - critical info that must be shown."""
 
     __tablename__ = "notams"
+    __table_args__ = (
+        # Active set in context order; expires_at included for the SQL-side expiry filter.
+        # Ending in id DESC, these also serve keyset pages of GET /notam.
+        Index(
+            "idx_notams_active_rank",
+            "user_id", text("priority_rank DESC"), text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("active = true"),
+            postgresql_include=["expires_at"]
+        ),
+        Index(
+            "idx_notams_active_category_rank",
+            "user_id", "category", text("priority_rank DESC"), text("created_at DESC"), text("id DESC"),
+            postgresql_where=text("active = true"),
+            postgresql_include=["expires_at"]
+        ),
+        Index(
+            "idx_notams_user_rank",
+            "user_id", text("priority_rank DESC"), text("created_at DESC"), text("id DESC")
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(String(255), nullable=False, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
     priority = Column(String(50), default="normal")  # critical, high, normal, low, info
+    priority_rank = Column(SmallInteger, Computed(PRIORITY_RANK_SQL, persisted=True))
     category = Column(String(100))
     active = Column(Boolean, default=True)
     expires_at = Column(DateTime(timezone=True))
@@ -0,0 +1,29 @@
+"""
+NOTAM Acknowledgement Model - Per-user state of broadcast NOTAMs
+"""
+
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime, timezone
+
+from ..database import Base
+
+
+class NotamAck(Base):
+    """A user acknowledged (still shown) or dismissed (hidden) a broadcast NOTAM."""
+
+    __tablename__ = "notam_acks"
+
+    user_id = Column(String(255), primary_key=True)
+    notam_id = Column(UUID(as_uuid=True), ForeignKey("broadcast_notams.id", ondelete="CASCADE"), primary_key=True)
+    dismissed = Column(Boolean, nullable=False, default=False)
+    acked_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "user_id": self.user_id,
+            "notam_id": str(self.notam_id),
+            "dismissed": self.dismissed,
+            "acked_at": self.acked_at.isoformat() if self.acked_at else None
+        }
@@ -0,0 +1,29 @@
+"""
+NOTAM Group Membership Model - Audience of group-scoped broadcast NOTAMs
+"""
+
+from sqlalchemy import Column, String, DateTime, Index
+from datetime import datetime, timezone
+
+from ..database import Base
+
+
+class NotamGroupMember(Base):
+    """User membership in a NOTAM audience group."""
+
+    __tablename__ = "notam_group_members"
+    __table_args__ = (
+        Index("idx_notam_group_members_user", "user_id"),
+    )
+
+    group_id = Column(String(255), primary_key=True)
+    user_id = Column(String(255), primary_key=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "group_id": self.group_id,
+            "user_id": self.user_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,31 @@
+"""
+Memory Quota Model - Per-user / per-agent memory limits
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime
+from datetime import datetime, timezone
+
+from ..database import Base
+
+# agent_id value for a quota that applies to the whole user
+ALL_AGENTS = "*"
+
+
+class MemoryQuota(Base):
+    """Quota override for a user (agent_id='*') or a single agent."""
+
+    __tablename__ = "memory_quotas"
+
+    user_id = Column(String(255), primary_key=True)
+    agent_id = Column(String(255), primary_key=True, default=ALL_AGENTS)
+    max_memories = Column(Integer, nullable=False)  # 0 = unlimited
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "user_id": self.user_id,
+            "agent_id": self.agent_id,
+            "max_memories": self.max_memories,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
@@ -2,7 +2,7 @@
 Session Model - Last activity tracking
 """
 
-from sqlalchemy import Column, String, Text, DateTime, text
+from sqlalchemy import Column, String, Text, DateTime, Index, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from datetime import datetime, timezone
 
@@ -13,6 +13,10 @@ class Session(Base):
     """User session with last activity context."""
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # One row per user/agent type; NULL agent_type counts as one value
+        Index("uq_sessions_user_agent", "user_id", text("COALESCE(agent_type, '')"), unique=True),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"))
     user_id = Column(String(255), nullable=False, index=True)
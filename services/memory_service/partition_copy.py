@@ -0,0 +1,203 @@
+"""
+Online backfill of memories into the hash-partitioned table
+
+Run after migrations/004_partition_memories.sql (which installs a trigger that
+mirrors live writes into memories_p). Copies existing rows in keyset batches
+ordered by id, so it can be stopped and re-run at any time.
+
+Usage:
+    python -m memory_service.partition_copy [--batch-size 2000] [--pause 0.05]
+    python -m memory_service.partition_copy --swap
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import uuid
+
+from sqlalchemy import text
+
+from .database import engine
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("memory_service.partition_copy")
+
+COPY_COLUMNS = (
+    "id, user_id, agent_id, access_mode, content, memory_type, embedding, "
+    "importance, metadata, source_conversation_id, created_at, accessed_at, access_count"
+)
+
+# Existing rows win: anything already in memories_p came from the mirror
+# trigger and is at least as new as the source row. FOR KEY SHARE makes a
+# concurrent DELETE wait for this batch to commit, so its mirror trigger
+# removes the copied row instead of finding nothing and leaving it behind.
+COPY_BATCH_SQL = text(f"""
+    WITH batch AS (
+        SELECT {COPY_COLUMNS} FROM memories
+        WHERE id > :last_id
+        ORDER BY id
+        LIMIT :batch_size
+        FOR KEY SHARE
+    ), copied AS (
+        INSERT INTO memories_p ({COPY_COLUMNS})
+        SELECT {COPY_COLUMNS} FROM batch
+        ON CONFLICT (id, user_id) DO NOTHING
+        RETURNING id
+    )
+    SELECT
+        (SELECT MAX(id::text)::uuid FROM batch) AS last_id,
+        (SELECT COUNT(*) FROM batch) AS scanned,
+        (SELECT COUNT(*) FROM copied) AS inserted
+""")
+
+# Rows whose source was deleted without the mirror seeing them (copied by a
+# backfill run from before the FOR KEY SHARE fix)
+DELETE_ORPHANS_SQL = text("""
+    DELETE FROM memories_p p
+    WHERE NOT EXISTS (SELECT 1 FROM memories m WHERE m.id = p.id)
+""")
+
+COUNT_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM memories) AS source,
+        (SELECT COUNT(*) FROM memories_p) AS target
+""")
+
+SWAP_SQL = [
+    "LOCK TABLE memories IN ACCESS EXCLUSIVE MODE",
+    "DROP TRIGGER IF EXISTS memories_mirror_partitioned ON memories",
+    "ALTER TABLE memories RENAME TO memories_unpartitioned",
+    "ALTER INDEX IF EXISTS idx_memories_embedding RENAME TO idx_memories_unpartitioned_embedding",
+    "ALTER INDEX IF EXISTS idx_memories_agent RENAME TO idx_memories_unpartitioned_agent",
+    "ALTER INDEX IF EXISTS idx_memories_type RENAME TO idx_memories_unpartitioned_type",
+    "ALTER INDEX IF EXISTS idx_memories_access RENAME TO idx_memories_unpartitioned_access",
+    "ALTER INDEX IF EXISTS idx_memories_last_access RENAME TO idx_memories_unpartitioned_last_access",
+    "ALTER INDEX IF EXISTS idx_memories_user_created RENAME TO idx_memories_unpartitioned_user_created",
+    "ALTER INDEX IF EXISTS idx_memories_agent_created RENAME TO idx_memories_unpartitioned_agent_created",
+    "ALTER INDEX IF EXISTS idx_memories_type_created RENAME TO idx_memories_unpartitioned_type_created",
+    "ALTER INDEX IF EXISTS idx_memories_agent_type_created RENAME TO idx_memories_unpartitioned_agent_type_created",
+    "ALTER TABLE memories_p RENAME TO memories",
+    "ALTER INDEX idx_memories_p_embedding RENAME TO idx_memories_embedding",
+    "ALTER INDEX idx_memories_p_agent RENAME TO idx_memories_agent",
+    "ALTER INDEX idx_memories_p_type RENAME TO idx_memories_type",
+    "ALTER INDEX idx_memories_p_access RENAME TO idx_memories_access",
+    "ALTER INDEX idx_memories_p_last_access RENAME TO idx_memories_last_access",
+    "ALTER INDEX IF EXISTS idx_memories_p_user_created RENAME TO idx_memories_user_created",
+    "ALTER INDEX IF EXISTS idx_memories_p_agent_created RENAME TO idx_memories_agent_created",
+    "ALTER INDEX IF EXISTS idx_memories_p_type_created RENAME TO idx_memories_type_created",
+    "ALTER INDEX IF EXISTS idx_memories_p_agent_type_created RENAME TO idx_memories_agent_type_created",
+]
+
+
+async def _is_partitioned(conn, table: str) -> bool:
+    """Check whether a table exists and is partitioned."""
+    result = await conn.execute(
+        text("""
+            SELECT c.relkind = 'p' AS partitioned
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = :table AND n.nspname = current_schema()
+        """),
+        {"table": table}
+    )
+    row = result.first()
+    return bool(row and row.partitioned)
+
+
+async def backfill(batch_size: int, pause: float) -> int:
+    """Copy all rows from memories into memories_p in keyset batches."""
+    async with engine.connect() as conn:
+        if not await _is_partitioned(conn, "memories_p"):
+            raise RuntimeError("memories_p not found - run migrations/004_partition_memories.sql first")
+
+    last_id = uuid.UUID(int=0)
+    total_scanned = 0
+    total_inserted = 0
+    start = time.time()
+
+    while True:
+        # One short transaction per batch keeps locks and WAL bursts small
+        async with engine.begin() as conn:
+            result = await conn.execute(COPY_BATCH_SQL, {"last_id": last_id, "batch_size": batch_size})
+            row = result.one()
+
+        if not row.scanned:
+            break
+
+        last_id = row.last_id
+        total_scanned += row.scanned
+        total_inserted += row.inserted
+        logger.info(f"Copied batch: scanned={total_scanned} inserted={total_inserted} last_id={last_id}")
+
+        if pause:
+            await asyncio.sleep(pause)
+
+    logger.info(
+        f"Backfill complete in {time.time() - start:.1f}s: "
+        f"scanned={total_scanned} inserted={total_inserted}"
+    )
+    return total_inserted
+
+
+async def verify() -> bool:
+    """Remove orphaned rows from memories_p, then compare row counts."""
+    async with engine.begin() as conn:
+        orphans = (await conn.execute(DELETE_ORPHANS_SQL)).rowcount
+        row = (await conn.execute(COUNT_SQL)).one()
+
+    if orphans:
+        logger.info(f"Removed {orphans} rows from memories_p whose source row was deleted")
+    logger.info(f"Row counts: memories={row.source} memories_p={row.target}")
+    return row.source == row.target
+
+
+async def swap():
+    """Replace memories with the partitioned table under a short exclusive lock."""
+    async with engine.begin() as conn:
+        if await _is_partitioned(conn, "memories"):
+            logger.info("memories is already partitioned - nothing to do")
+            return
+
+        # The mirror trigger keeps memories_p current; under the lock no new
+        # writes can land. With orphans gone every memories_p id exists in
+        # memories, so matching counts mean the tables are identical
+        await conn.execute(text(SWAP_SQL[0]))
+        orphans = (await conn.execute(DELETE_ORPHANS_SQL)).rowcount
+        if orphans:
+            logger.info(f"Removed {orphans} orphaned rows from memories_p")
+        row = (await conn.execute(COUNT_SQL)).one()
+        if row.source != row.target:
+            raise RuntimeError(
+                f"Row counts differ (memories={row.source}, memories_p={row.target}) - "
+                "re-run the backfill before swapping"
+            )
+
+        for statement in SWAP_SQL[1:]:
+            await conn.execute(text(statement))
+
+    logger.info("Swapped: memories is now hash-partitioned (old table kept as memories_unpartitioned)")
+
+
+async def main(args: argparse.Namespace):
+    """Run backfill and optionally swap."""
+    try:
+        await backfill(args.batch_size, args.pause)
+        await verify()
+        if args.swap:
+            await swap()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill memories into the hash-partitioned table")
+    parser.add_argument("--batch-size", type=int, default=2000, help="Rows per copy transaction")
+    parser.add_argument("--pause", type=float, default=0.05, help="Seconds to sleep between batches")
+    parser.add_argument("--swap", action="store_true", help="Swap memories_p into place after backfill")
+    asyncio.run(main(parser.parse_args()))
@@ -6,10 +6,14 @@ from .context import router as context_router
 from .persona import router as persona_router
 from .notam import router as notam_router
 from .memory import router as memory_router
+from .admin import router as admin_router
+from .events import router as events_router
 
 __all__ = [
     "context_router",
     "persona_router",
     "notam_router",
-    "memory_router"
+    "memory_router",
+    "admin_router",
+    "events_router"
 ]
@@ -0,0 +1,196 @@
+"""
+Admin Router - Operational endpoints (quotas, maintenance, user purge)
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import asyncio
+import logging
+
+from ..config import get_settings
+from ..database import engine, get_db, get_replica_router, pool_stats
+from ..services.quota import QuotaService
+from ..services.cache import get_context_cache
+from ..services.session_tracker import get_session_tracker
+from ..services.change_bus import get_change_bus
+from ..services.purge import BulkDeleteService
+from ..services.single_flight import single_flight_stats
+from ..services.admission import admission_stats
+from ..services.index_maintenance import (
+    IndexMaintenanceService,
+    get_maintenance_state,
+    in_maintenance_window,
+    start_maintenance
+)
+from ..schemas.requests import QuotaSet
+from ..schemas.responses import QuotaUsageResponse, IndexMaintenanceResponse, UserPurgeResponse
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+@router.get("/quotas", response_model=List[QuotaUsageResponse])
+async def list_quota_usage(
+    limit: int = Query(50, ge=1, le=500, description="Number of users (largest first)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """List memory usage and headroom for the largest users."""
+    quota_service = QuotaService(db)
+    return [
+        QuotaUsageResponse(**usage)
+        for usage in await quota_service.usage_overview(limit=limit)
+    ]
+
+
+@router.get("/quotas/{user_id}", response_model=QuotaUsageResponse)
+async def get_quota_usage(
+    user_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get memory usage and headroom for a user and each of their agents."""
+    usage = await QuotaService(db).usage(user_id)
+    return QuotaUsageResponse(**usage)
+
+
+@router.put("/quotas/{user_id}", response_model=QuotaUsageResponse)
+async def set_quota(
+    user_id: str,
+    request: QuotaSet,
+    db: AsyncSession = Depends(get_db)
+):
+    """Set quota override for a user (or one agent). Enforced by the eviction job."""
+    quota_service = QuotaService(db)
+    await quota_service.set_quota(user_id, request.max_memories, agent_id=request.agent_id)
+    return QuotaUsageResponse(**await quota_service.usage(user_id))
+
+
+@router.delete("/quotas/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_quota(
+    user_id: str,
+    agent_id: Optional[str] = Query(None, description="Agent ID - omit for the user-wide quota"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove quota override (reverts to configured default)."""
+    if not await QuotaService(db).delete_quota(user_id, agent_id=agent_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Quota override not found for user: {user_id}"
+        )
+
+    logger.info(f"Deleted quota override for user: {user_id}, agent: {agent_id or '*'}")
+
+
+@router.get("/indexes", response_model=IndexMaintenanceResponse)
+async def get_index_status(
+    measure_recall: bool = Query(False, description="Run a sampled recall estimate now (slower)"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Show vector index health: lists vs data size, recall and last maintenance."""
+    maintenance_service = IndexMaintenanceService(db)
+    indexes = await maintenance_service.index_status()
+    if measure_recall:
+        await maintenance_service.estimate_recall()
+
+    state = get_maintenance_state()
+    return IndexMaintenanceResponse(
+        indexes=indexes,
+        recall=state["last_recall"],
+        maintenance_window=settings.maintenance_window,
+        in_window=in_maintenance_window(),
+        running=state["running"],
+        last_run_at=state["last_run_at"],
+        last_actions=state["last_actions"],
+        last_error=state["last_error"]
+    )
+
+
+@router.post(
+    "/indexes/maintenance",
+    response_model=IndexMaintenanceResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def run_index_maintenance(
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Start index maintenance now, ignoring the configured window.
+
+    Runs in the background (REINDEX/CLUSTER can outlast any HTTP timeout);
+    poll GET /admin/indexes for `running`, `last_actions` and `last_error`.
+    """
+    if not start_maintenance():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Index maintenance is already running"
+        )
+    await asyncio.sleep(0)  # Let the run start so the response shows running=true
+    return await get_index_status(measure_recall=False, db=db)
+
+
+@router.delete("/users/{user_id}", response_model=UserPurgeResponse)
+async def purge_user(
+    user_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete all data stored for a user (right-to-erasure requests).
+
+    Memories (both tiers), NOTAMs, sessions, persona, broadcast acks and
+    group memberships, quota overrides. Large tables go in committed
+    chunks; the call is safe to repeat if interrupted.
+    """
+    bulk = BulkDeleteService(db)
+    deleted = await bulk.purge_user(user_id)
+    return UserPurgeResponse(
+        user_id=user_id,
+        deleted=deleted,
+        total=sum(deleted.values()),
+        batches=bulk.batches
+    )
+
+
+@router.get("/pool", response_model=dict)
+async def get_pool_stats():
+    """Primary connection pool: checked-out connections, waiters and checkout wait time."""
+    return pool_stats(engine)
+
+
+@router.get("/replicas", response_model=dict)
+async def get_replica_status(
+    check: bool = Query(False, description="Measure replica lag now instead of using the last check")
+):
+    """Read replica health, lag and read routing counters."""
+    replicas = get_replica_router()
+    if check:
+        await replicas.check()
+    return replicas.stats()
+
+
+@router.get("/admission", response_model=dict)
+async def get_admission_stats():
+    """Embedding admission control per class: slots in use, queue depth, service time and shed counts."""
+    return admission_stats()
+
+
+@router.get("/cache", response_model=dict)
+async def get_cache_stats():
+    """Layer 1 cache sizes and hit/miss counters, session write-behind, single-flight and invalidation bus state."""
+    stats = get_context_cache().stats()
+    stats["session_tracker"] = get_session_tracker().stats()
+    stats["single_flight"] = single_flight_stats()
+    stats["change_bus"] = get_change_bus().stats()
+    return stats
+
+
+@router.delete("/cache", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_cache(
+    user_id: Optional[str] = Query(None, description="Only drop entries for this user")
+):
+    """Drop Layer 1 cache entries (all, or for one user)."""
+    cache = get_context_cache()
+    if user_id:
+        cache.invalidate_user(user_id)
+    else:
+        cache.clear()
@@ -3,122 +3,117 @@ Context Router - Layer 1 combined endpoint
 Returns persona + NOTAMs + last session activity
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import text
+from typing import AsyncIterator, Dict, List, Optional
 from datetime import datetime, timezone
+import asyncio
+import hashlib
 import logging
 
-from ..database import get_db
-from ..models import Persona, Notam, Session
-from ..schemas.requests import ContextRequest
+from ..config import get_settings
+from ..database import get_read_db, get_read_db_context
+from ..services.cache import get_context_cache
+from ..services.session_tracker import get_session_tracker
+from ..services.embedder import get_embedding_service
+from ..services.search import SearchService
+from ..services.prompt_assembly import assemble_prompt
+from ..services.broadcast import USER_NOTAM_COLUMNS, visible_broadcasts_sql
+from ..services.single_flight import get_single_flight, request_key
+from ..services.admission import SEARCH, get_admission_controller
+from ..schemas.requests import ContextRequest, BatchContextRequest, PromptAssembleRequest
 from ..schemas.responses import (
     ContextResponse,
+    BatchContextResponse,
+    AssembledPromptResponse,
     PersonaResponse,
     NotamResponse,
     SessionResponse
 )
 
 logger = logging.getLogger(__name__)
+settings = get_settings()
 router = APIRouter(prefix="/context", tags=["Context (Layer 1)"])
 
 
 @router.post("", response_model=ContextResponse)
-async def get_context(
-    request: ContextRequest,
-    db: AsyncSession = Depends(get_db)
-):
+async def get_context(request: ContextRequest):
     """
     Get full user context for AI prompt injection.
 
     This is the main Layer 1 endpoint - returns everything an AI agent
     needs to know about the user before starting a conversation.
+    Identical concurrent requests share one computation (single-flight).
 
     Returns:
         - Persona (traits, preferences, style)
         - Active NOTAMs (critical notices)
         - Last session activity
     """
+    return await _shared_context(request)
+
+
+async def _shared_context(request: ContextRequest) -> ContextResponse:
+    """Layer 1 context, joined with an identical in-flight request if there is one."""
+    async def load() -> ContextResponse:
+        async with get_read_db_context([request.user_id]) as db:
+            return await _build_context(request, db)
+
+    return await get_single_flight("context").do(request_key(request.user_id, request), load)
+
+
+async def _build_context(request: ContextRequest, db: AsyncSession) -> ContextResponse:
+    """Layer 1 context: cache first, then one round trip for the misses."""
     user_id = request.user_id
+    cache = get_context_cache()
+    now = datetime.now(timezone.utc)
+    session_key = (user_id, request.agent_type)
 
-    # Get or create persona
-    persona_result = await db.execute(
-        select(Persona).where(Persona.user_id == user_id)
-    )
-    persona = persona_result.scalar_one_or_none()
-
-    persona_response = None
-    if persona:
-        persona_response = PersonaResponse(
-            id=str(persona.id),
-            user_id=persona.user_id,
-            name=persona.name,
-            traits=persona.traits or {},
-            preferences=persona.preferences or {},
-            style=persona.style or {},
-            created_at=persona.created_at,
-            updated_at=persona.updated_at
-        )
+    # Layer 1 cache first (persona cached even when missing)
+    persona_cached, persona_response = cache.persona.get(user_id)
+    notams_cached, active_notams = cache.notams.get(user_id) if request.include_notams else (True, [])
+    session_cached, session_response = cache.session.get(session_key) if request.include_session else (True, None)
 
-    # Get active NOTAMs
-    notams_response = []
-    if request.include_notams:
-        notams_result = await db.execute(
-            select(Notam)
-            .where(Notam.user_id == user_id)
-            .where(Notam.active == True)
-            .order_by(
-                # Priority order: critical > high > normal > low > info
-                Notam.priority.desc(),
-                Notam.created_at.desc()
-            )
-        )
-        notams = notams_result.scalars().all()
-
-        for notam in notams:
-            # Skip expired NOTAMs
-            if notam.expires_at and notam.expires_at < datetime.now(timezone.utc):
-                continue
-
-            notams_response.append(NotamResponse(
-                id=str(notam.id),
-                user_id=notam.user_id,
-                title=notam.title,
-                content=notam.content,
-                priority=notam.priority,
-                category=notam.category,
-                active=notam.active,
-                expires_at=notam.expires_at,
-                created_at=notam.created_at
-            ))
-
-    # Get last session
-    session_response = None
-    if request.include_session:
-        # Get most recent session, optionally filtered by agent type
-        session_query = select(Session).where(Session.user_id == user_id)
+    # One round trip for everything the cache could not serve
+    parts = []
+    if not persona_cached:
+        parts.append("persona")
+    if not notams_cached:
+        parts.append("notams")
+    if not session_cached:
+        parts.append("last_session")
+
+    if parts:
+        params = {"user_id": user_id}
         if request.agent_type:
-            session_query = session_query.where(Session.agent_type == request.agent_type)
-        session_query = session_query.order_by(Session.updated_at.desc()).limit(1)
-
-        session_result = await db.execute(session_query)
-        session = session_result.scalar_one_or_none()
-
-        if session:
-            session_response = SessionResponse(
-                id=str(session.id),
-                user_id=session.user_id,
-                agent_type=session.agent_type,
-                agent_name=session.agent_name,
-                last_query=session.last_query,
-                last_response_summary=session.last_response_summary,
-                context=session.context or {},
-                updated_at=session.updated_at
-            )
+            params["agent_type"] = request.agent_type
+        result = await db.execute(
+            text(_layer1_sql(parts, filter_agent_type=bool(request.agent_type))),
+            params
+        )
+        row = result.one()
+
+        if not persona_cached:
+            persona_response = PersonaResponse.model_validate(row.persona) if row.persona else None
+            cache.persona.set(user_id, persona_response)
+        if not notams_cached:
+            active_notams = [NotamResponse.model_validate(notam) for notam in row.notams]
+            cache.notams.set(user_id, active_notams)
+        if not session_cached:
+            session_response = SessionResponse.model_validate(row.last_session) if row.last_session else None
+            cache.session.set(session_key, session_response)
 
-    # Update session with current request info
+    # SQL already skips expired NOTAMs; cached entries may outlive their expiry
+    notams_response = [
+        notam for notam in active_notams
+        if not (notam.expires_at and notam.expires_at < now)
+    ]
+
+    # Update session with current request info (atomic upsert or write-behind)
     if request.agent_type or request.agent_name:
-        await _update_session(
+        await get_session_tracker().touch(
             db,
             user_id,
             request.agent_type,
@@ -134,52 +129,377 @@ async def get_context(
     )
 
 
-@router.post("/prompt", response_model=dict)
+def _layer1_sql(parts: list, filter_agent_type: bool = False) -> str:
+    """
+    Single statement returning the requested Layer 1 parts as JSON columns.
+
+    Parts: "persona" (object or NULL), "notams" (array of active,
+    unexpired NOTAMs including broadcasts, priority ordered) and
+    "last_session" (object or NULL).
+    """
+    columns = []
+    if "persona" in parts:
+        columns.append("""
+            (
+                SELECT to_jsonb(p) FROM (
+                    SELECT id, user_id, name,
+                           COALESCE(traits, '{}'::jsonb) AS traits,
+                           COALESCE(preferences, '{}'::jsonb) AS preferences,
+                           COALESCE(style, '{}'::jsonb) AS style,
+                           created_at, updated_at
+                    FROM personas
+                    WHERE user_id = :user_id
+                ) p
+            ) AS persona""")
+    if "notams" in parts:
+        # User NOTAMs plus visible global/group broadcasts
+        columns.append(f"""
+            (
+                SELECT COALESCE(
+                    jsonb_agg(to_jsonb(n) - 'priority_rank' ORDER BY n.priority_rank DESC, n.created_at DESC),
+                    '[]'::jsonb
+                )
+                FROM (
+                    SELECT {USER_NOTAM_COLUMNS}
+                    FROM notams
+                    WHERE user_id = :user_id
+                      AND active = true
+                      AND (expires_at IS NULL OR expires_at > NOW())
+                    UNION ALL
+                    {visible_broadcasts_sql("CAST(:user_id AS VARCHAR)")}
+                ) n
+            ) AS notams""")
+    if "last_session" in parts:
+        agent_filter = "AND agent_type = :agent_type" if filter_agent_type else ""
+        columns.append(f"""
+            (
+                SELECT to_jsonb(s) FROM (
+                    SELECT id, user_id, agent_type, agent_name, last_query,
+                           last_response_summary, COALESCE(context, '{{}}'::jsonb) AS context, updated_at
+                    FROM sessions
+                    WHERE user_id = :user_id {agent_filter}
+                    ORDER BY updated_at DESC
+                    LIMIT 1
+                ) s
+            ) AS last_session""")
+    return "SELECT" + ",".join(columns)
+
+
+@router.post("/prompt", response_model=dict, responses={304: {"description": "Prompt unchanged (If-None-Match)"}})
 async def get_context_as_prompt(
     request: ContextRequest,
-    db: AsyncSession = Depends(get_db)
+    http_request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get user context formatted as prompt injection text.
 
     Returns ready-to-use text that can be inserted into AI system prompts.
+
+    The rendered section is cached per (user_id, agent_type) and carries a
+    strong ETag. Send it back as If-None-Match to get a 304 without body;
+    a 304 served from cache does not touch the database.
     """
-    context = await get_context(request, db)
-    return {
-        "user_id": context.user_id,
-        "prompt_section": context.to_prompt_section(),
-        "retrieved_at": context.retrieved_at.isoformat()
-    }
+    cache = get_context_cache()
+    tracker = get_session_tracker()
+    key = (request.user_id, request.agent_type, request.include_notams, request.include_session)
+    if_none_match = http_request.headers.get("if-none-match")
 
+    cached, entry = cache.prompt.get(key)
+    if cached:
+        if request.agent_type or request.agent_name:
+            # Write-behind touches are in-memory; direct upserts are skipped on 304
+            if tracker.write_behind or not _etag_matches(if_none_match, entry["etag"]):
+                await tracker.touch(db, request.user_id, request.agent_type, request.agent_name)
+    else:
+        context = await _shared_context(request)
+        prompt_section = context.to_prompt_section()
+        entry = {
+            "etag": _make_etag(context.user_id, prompt_section),
+            "body": {
+                "user_id": context.user_id,
+                "prompt_section": prompt_section,
+                "retrieved_at": context.retrieved_at.isoformat()
+            }
+        }
+        cache.prompt.set(key, entry, ttl_seconds=_prompt_ttl(context))
 
-async def _update_session(
-    db: AsyncSession,
-    user_id: str,
-    agent_type: str = None,
-    agent_name: str = None
-):
-    """Update or create session record."""
-    try:
-        # Find existing session for this user/agent combo
-        query = select(Session).where(Session.user_id == user_id)
-        if agent_type:
-            query = query.where(Session.agent_type == agent_type)
-
-        result = await db.execute(query)
-        session = result.scalar_one_or_none()
-
-        if session:
-            session.updated_at = datetime.now(timezone.utc)
-            if agent_name:
-                session.agent_name = agent_name
-        else:
-            session = Session(
-                user_id=user_id,
-                agent_type=agent_type,
-                agent_name=agent_name
+    if _etag_matches(if_none_match, entry["etag"]):
+        return Response(status_code=304, headers={"ETag": entry["etag"]})
+
+    response.headers["ETag"] = entry["etag"]
+    return entry["body"]
+
+
+def _make_etag(user_id: str, prompt_section: str) -> str:
+    """Strong ETag over the rendered content (stable across re-renders)."""
+    digest = hashlib.sha256(f"{user_id}\0{prompt_section}".encode("utf-8")).hexdigest()
+    return f'"{digest[:40]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak comparison per RFC 9110)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def _prompt_ttl(context: ContextResponse) -> Optional[float]:
+    """Expire a rendered prompt no later than its first NOTAM expiry."""
+    ttl = get_context_cache().prompt.ttl_seconds
+    expiries = [notam.expires_at for notam in context.notams if notam.expires_at]
+    if expiries:
+        until_expiry = (min(expiries) - datetime.now(timezone.utc)).total_seconds()
+        ttl = max(0.0, min(ttl, until_expiry))
+    return ttl
+
+
+@router.post("/assemble", response_model=AssembledPromptResponse)
+async def get_assembled_prompt(request: PromptAssembleRequest):
+    """
+    Get Layer 1 context and the top memories as one prompt section.
+
+    The Layer 1 fetch and the semantic search run concurrently, each on its
+    own pooled session, and the query is embedded off the event loop in the
+    "search" admission class (429/503 with Retry-After when shed). The
+    result is packed to fit `token_budget` (persona, NOTAMs, last session,
+    then memories by similarity). Identical concurrent requests share one
+    computation (single-flight).
+    """
+    key = request_key(
+        request.user_id,
+        request,
+        query=request.query.strip() if request.query else None,
+        memory_types=sorted(request.memory_types) if request.memory_types else None
+    )
+    return await get_single_flight("assemble").do(key, lambda: _assemble(request))
+
+
+async def _assemble(request: PromptAssembleRequest) -> AssembledPromptResponse:
+    """Layer 1 context and memory search, concurrently, packed to the token budget."""
+    context_request = ContextRequest(
+        user_id=request.user_id,
+        agent_type=request.agent_type,
+        agent_name=request.agent_name,
+        include_notams=request.include_notams,
+        include_session=request.include_session
+    )
+
+    async def load_memories():
+        if not request.query:
+            return [], 0.0
+        async with get_admission_controller(SEARCH).slot(request.user_id):
+            query_embedding = await asyncio.to_thread(get_embedding_service().embed, request.query)
+        async with get_read_db_context([request.user_id]) as db:
+            return await SearchService(db).search(
+                user_id=request.user_id,
+                query=request.query,
+                agent_id=request.agent_id,
+                memory_types=request.memory_types,
+                limit=request.memory_limit,
+                threshold=request.threshold,
+                include_shared=request.include_shared,
+                query_embedding=query_embedding
             )
-            db.add(session)
 
-        await db.commit()
-    except Exception as e:
-        logger.warning(f"Failed to update session: {e}")
+    context, (memories, search_time_ms) = await asyncio.gather(_shared_context(context_request), load_memories())
+    assembled = assemble_prompt(context, memories, request.token_budget)
+
+    return AssembledPromptResponse(
+        user_id=request.user_id,
+        search_time_ms=search_time_ms,
+        retrieved_at=context.retrieved_at,
+        **assembled
+    )
+
+
+# Set queries for /context/batch (same JSON shapes as _layer1_sql)
+BATCH_PERSONAS_SQL = text("""
+    SELECT p.user_id, to_jsonb(p) AS persona
+    FROM (
+        SELECT id, user_id, name,
+               COALESCE(traits, '{}'::jsonb) AS traits,
+               COALESCE(preferences, '{}'::jsonb) AS preferences,
+               COALESCE(style, '{}'::jsonb) AS style,
+               created_at, updated_at
+        FROM personas
+        WHERE user_id = ANY(CAST(:user_ids AS VARCHAR[]))
+    ) p
+""")
+
+BATCH_NOTAMS_SQL = text(f"""
+    SELECT n.user_id,
+           jsonb_agg(to_jsonb(n) - 'priority_rank' ORDER BY n.priority_rank DESC, n.created_at DESC) AS notams
+    FROM (
+        SELECT {USER_NOTAM_COLUMNS}
+        FROM notams
+        WHERE user_id = ANY(CAST(:user_ids AS VARCHAR[]))
+          AND active = true
+          AND (expires_at IS NULL OR expires_at > NOW())
+        UNION ALL
+        SELECT broadcast.*
+        FROM unnest(CAST(:user_ids AS VARCHAR[])) AS u(user_id)
+        CROSS JOIN LATERAL ({visible_broadcasts_sql("u.user_id")}) broadcast
+    ) n
+    GROUP BY n.user_id
+""")
+
+BATCH_SESSIONS_SQL = text("""
+    SELECT r.user_id, r.agent_type, to_jsonb(s) AS last_session
+    FROM unnest(
+        CAST(:user_ids AS VARCHAR[]),
+        CAST(:agent_types AS VARCHAR[])
+    ) AS r(user_id, agent_type)
+    CROSS JOIN LATERAL (
+        SELECT id, user_id, agent_type, agent_name, last_query,
+               last_response_summary, COALESCE(context, '{}'::jsonb) AS context, updated_at
+        FROM sessions
+        WHERE sessions.user_id = r.user_id
+          AND (r.agent_type IS NULL OR sessions.agent_type = r.agent_type)
+        ORDER BY updated_at DESC
+        LIMIT 1
+    ) s
+""")
+
+
+@router.post("/batch", response_model=BatchContextResponse)
+async def get_context_batch(
+    request: BatchContextRequest,
+    stream: bool = Query(False, description="Stream one ContextResponse per line (NDJSON)"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get Layer 1 context for many users in one call.
+
+    Persona, NOTAMs and last session are fetched with one set query each
+    (user_id = ANY(...)) per chunk of users, using the Layer 1 cache where
+    possible. Returns a map keyed by user_id, or NDJSON lines in request
+    order when `stream` is set.
+    """
+    requests = request.requests
+    if len(requests) > settings.context_batch_max_users:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Too many users in batch: {len(requests)} (max {settings.context_batch_max_users})"
+        )
+
+    user_ids = [item.user_id for item in requests]
+    if len(set(user_ids)) != len(user_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicate user_id in batch"
+        )
+
+    if stream:
+        # Own session: the request-scoped one may be closed before the body is sent
+        return StreamingResponse(_stream_contexts(requests), media_type="application/x-ndjson")
+
+    contexts: Dict[str, ContextResponse] = {}
+    for chunk in _chunks(requests, settings.context_batch_chunk_size):
+        contexts.update(await _load_contexts(db, chunk))
+
+    return BatchContextResponse(contexts=contexts, retrieved_at=datetime.now(timezone.utc))
+
+
+async def _stream_contexts(requests: List[ContextRequest]) -> AsyncIterator[str]:
+    """Yield NDJSON lines, flushing after each chunk of users."""
+    async with get_read_db_context([item.user_id for item in requests]) as db:
+        for chunk in _chunks(requests, settings.context_batch_chunk_size):
+            for context in (await _load_contexts(db, chunk)).values():
+                yield context.model_dump_json() + "\n"
+
+
+def _chunks(items: list, size: int):
+    """Split a list into consecutive chunks."""
+    size = max(1, size)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def _load_contexts(db: AsyncSession, requests: List[ContextRequest]) -> Dict[str, ContextResponse]:
+    """Layer 1 context for a chunk of users: cache first, then one set query per part."""
+    cache = get_context_cache()
+    now = datetime.now(timezone.utc)
+
+    personas: Dict[str, Optional[PersonaResponse]] = {}
+    notams: Dict[str, List[NotamResponse]] = {}
+    sessions: Dict[tuple, Optional[SessionResponse]] = {}
+    persona_misses, notam_misses, session_misses = [], [], []
+
+    for item in requests:
+        hit, personas[item.user_id] = cache.persona.get(item.user_id)
+        if not hit:
+            persona_misses.append(item.user_id)
+        if item.include_notams:
+            hit, notams[item.user_id] = cache.notams.get(item.user_id)
+            if not hit:
+                notam_misses.append(item.user_id)
+        if item.include_session:
+            session_key = (item.user_id, item.agent_type)
+            hit, sessions[session_key] = cache.session.get(session_key)
+            if not hit:
+                session_misses.append(session_key)
+
+    if persona_misses:
+        result = await db.execute(BATCH_PERSONAS_SQL, {"user_ids": persona_misses})
+        found = {row.user_id: PersonaResponse.model_validate(row.persona) for row in result}
+        for user_id in persona_misses:
+            personas[user_id] = found.get(user_id)
+            cache.persona.set(user_id, personas[user_id])
+
+    if notam_misses:
+        result = await db.execute(BATCH_NOTAMS_SQL, {"user_ids": notam_misses})
+        found = {
+            row.user_id: [NotamResponse.model_validate(notam) for notam in row.notams]
+            for row in result
+        }
+        for user_id in notam_misses:
+            notams[user_id] = found.get(user_id, [])
+            cache.notams.set(user_id, notams[user_id])
+
+    if session_misses:
+        result = await db.execute(
+            BATCH_SESSIONS_SQL,
+            {
+                "user_ids": [key[0] for key in session_misses],
+                "agent_types": [key[1] or None for key in session_misses]
+            }
+        )
+        found = {
+            (row.user_id, row.agent_type): SessionResponse.model_validate(row.last_session)
+            for row in result
+        }
+        for session_key in session_misses:
+            sessions[session_key] = found.get((session_key[0], session_key[1] or None))
+            cache.session.set(session_key, sessions[session_key])
+
+    touches = [
+        (item.user_id, item.agent_type, item.agent_name)
+        for item in requests
+        if item.agent_type or item.agent_name
+    ]
+    if touches:
+        await get_session_tracker().touch_many(db, touches)
+
+    return {
+        item.user_id: ContextResponse(
+            user_id=item.user_id,
+            persona=personas[item.user_id],
+            notams=[
+                notam for notam in notams.get(item.user_id, [])
+                if not (notam.expires_at and notam.expires_at < now)
+            ],
+            last_session=sessions.get((item.user_id, item.agent_type)),
+            retrieved_at=now
+        )
+        for item in requests
+    }
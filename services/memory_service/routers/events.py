@@ -0,0 +1,74 @@
+"""
+Events Router - Server-sent events for Layer 1 changes
+"""
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator
+import asyncio
+import json
+import logging
+
+from ..config import get_settings
+from ..services.change_bus import get_change_bus
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+router = APIRouter(prefix="/events", tags=["Events"])
+
+# Tables streamed to agents (other bus events are for cache invalidation only)
+STREAM_TABLES = {"personas", "notams"}
+
+
+@router.get("/{user_id}", response_class=StreamingResponse)
+async def stream_changes(
+    user_id: str,
+    request: Request
+):
+    """
+    Subscribe to persona and NOTAM changes for a user (text/event-stream).
+
+    Each event is named after its table ("personas", "notams") and carries
+    {table, user_id, op, data, at} as JSON. `data` holds the new record for
+    created/updated/deactivated, the id for deleted and the ids for expired.
+    A "resync" event means events may have been missed: refetch /context.
+    """
+    if not settings.change_events_enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Change events are disabled"
+        )
+
+    return StreamingResponse(
+        _event_stream(user_id, request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _event_stream(user_id: str, request: Request) -> AsyncIterator[str]:
+    """Format bus events as SSE frames, with keepalive comments."""
+    bus = get_change_bus()
+    queue = bus.subscribe(user_id)
+    logger.info(f"Change stream opened for user: {user_id}")
+    try:
+        yield f"retry: {settings.change_events_reconnect_seconds * 1000}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.change_events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+
+            if event["op"] == "resync":
+                name = "resync"
+            elif event["table"] in STREAM_TABLES:
+                name = event["table"]
+            else:
+                continue
+            yield f"event: {name}\ndata: {json.dumps(event, default=str)}\n\n"
+    finally:
+        bus.unsubscribe(user_id, queue)
+        logger.info(f"Change stream closed for user: {user_id}")
@@ -2,79 +2,92 @@
 Memory Router - Layer 2 semantic memory operations
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import delete, literal, or_, select, tuple_, update
+from typing import AsyncIterator, List, Literal, Optional, Tuple
 from uuid import UUID
 from datetime import datetime, timezone
 import logging
 
-from ..database import get_db
+from ..database import get_db, get_read_db, get_read_db_context, primary_session
 from ..models import Memory
 from ..services.search import SearchService
-from ..schemas.requests import MemorySearch, MemoryAdd
+from ..services.tiering import TieringService
+from ..services.purge import BulkDeleteService
+from ..services.change_bus import publish_change
+from ..services.single_flight import get_single_flight, request_key
+from ..services.admission import INGEST, SEARCH, get_admission_controller
+from ..services.serialization import FastJSONResponse, dumps, memory_dict
+from ..services.export import ARROW_AVAILABLE, MEDIA_TYPES, MemoryExporter
+from ..services.pagination import MEMORY_CURSOR_KEY, decode_cursor, next_cursor_headers
+from ..schemas.requests import MemorySearch, MemoryAdd, MemoryBulkDelete
 from ..schemas.responses import (
     MemoryResponse,
-    MemorySearchResult,
     MemorySearchResponse,
-    MemoryAddResponse
+    MemoryAddResponse,
+    MemoryBulkDeleteResponse
 )
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/memory", tags=["Memory (Layer 2)"])
 
+# Columns of a MemoryResponse
+MEMORY_COLUMNS = (
+    Memory.id, Memory.user_id, Memory.agent_id, Memory.access_mode, Memory.content,
+    Memory.memory_type, Memory.importance, Memory.extra_data,
+    Memory.created_at, Memory.accessed_at, Memory.access_count
+)
+
 
 @router.post("/search", response_model=MemorySearchResponse)
-async def search_memories(
-    request: MemorySearch,
-    db: AsyncSession = Depends(get_db)
-):
+async def search_memories(request: MemorySearch):
     """
     Semantic search across memories with agent isolation.
 
     Agent isolation:
     - If agent_id provided: returns only agent's own memories + shared memories
     - If no agent_id: returns all memories (admin mode)
-    """
-    search_service = SearchService(db)
 
-    results, search_time_ms = await search_service.search(
-        user_id=request.user_id,
-        query=request.query,
-        agent_id=request.agent_id,
-        memory_types=request.memory_types,
-        limit=request.limit,
-        threshold=request.threshold,
-        include_shared=request.include_shared
+    Identical concurrent searches share one embedding and query (single-flight).
+    Searches run in the "search" admission class: 429/503 with Retry-After
+    when the user or the worker is over capacity.
+    """
+    async def load():
+        async with get_admission_controller(SEARCH).slot(request.user_id), \
+                get_read_db_context([request.user_id]) as db:
+            results, search_time_ms = await SearchService(db).search(
+                user_id=request.user_id,
+                query=request.query,
+                agent_id=request.agent_id,
+                memory_types=request.memory_types,
+                limit=request.limit,
+                threshold=request.threshold,
+                include_shared=request.include_shared
+            )
+        # Fast path: rows straight to JSON (schema stays MemorySearchResponse)
+        search_results = [
+            {"memory": memory_dict(memory), "similarity": similarity}
+            for memory, similarity in results
+        ]
+        return search_results, search_time_ms
+
+    key = request_key(
+        request.user_id,
+        request,
+        query=request.query.strip(),
+        memory_types=sorted(request.memory_types) if request.memory_types else None
     )
+    search_results, search_time_ms = await get_single_flight("memory-search").do(key, load)
 
-    search_results = []
-    for memory, similarity in results:
-        search_results.append(MemorySearchResult(
-            memory=MemoryResponse(
-                id=str(memory.id),
-                user_id=memory.user_id,
-                agent_id=memory.agent_id,
-                access_mode=memory.access_mode,
-                content=memory.content,
-                memory_type=memory.memory_type,
-                importance=memory.importance,
-                metadata=memory.extra_data or {},
-                created_at=memory.created_at,
-                accessed_at=memory.accessed_at,
-                access_count=memory.access_count
-            ),
-            similarity=similarity
-        ))
-
-    return MemorySearchResponse(
-        user_id=request.user_id,
-        query=request.query,
-        results=search_results,
-        total_found=len(search_results),
-        search_time_ms=search_time_ms
-    )
+    return FastJSONResponse({
+        "user_id": request.user_id,
+        "query": request.query,
+        "results": search_results,
+        "total_found": len(search_results),
+        "search_time_ms": search_time_ms
+    })
 
 
 @router.post("/add", response_model=MemoryAddResponse, status_code=status.HTTP_201_CREATED)
@@ -88,7 +101,15 @@ async def add_memory(
     access_mode:
     - "private": only this agent can see it
     - "shared": all agents can see it
+
+    Runs in the "ingest" admission class (429/503 with Retry-After when shed).
     """
+    async with get_admission_controller(INGEST).slot(request.user_id):
+        return await _add_memory(request, db)
+
+
+async def _add_memory(request: MemoryAdd, db: AsyncSession) -> MemoryAddResponse:
+    """Embed and store one memory."""
     import traceback
     import sys
 
@@ -125,26 +146,97 @@ async def add_memory(
         raise HTTPException(status_code=500, detail=error_msg)
 
 
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {media_type: {} for media_type in MEDIA_TYPES.values()}}}
+)
+async def export_memories(
+    user_id: str = Query(..., description="User ID"),
+    output_format: Literal["ndjson", "arrow"] = Query("ndjson", alias="format", description="ndjson or arrow (IPC stream, needs pyarrow)"),
+    agent_id: Optional[str] = Query(None, description="Only this agent's memories"),
+    memory_type: Optional[str] = Query(None, description="Only this memory type"),
+    created_after: Optional[datetime] = Query(None, description="created_at >= this"),
+    created_before: Optional[datetime] = Query(None, description="created_at < this"),
+    include_embeddings: bool = Query(False, description="Include raw embedding vectors"),
+    include_archived: bool = Query(False, description="Also export the cold tier (tier=cold)")
+):
+    """
+    Stream every matching memory of a user, oldest first.
+
+    Rows come from a server-side cursor and are flushed batch by batch, so
+    memory use in the service stays constant whatever the export size.
+    """
+    if output_format == "arrow" and not ARROW_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Arrow export needs pyarrow installed"
+        )
+
+    exporter_args = dict(
+        agent_id=agent_id,
+        memory_type=memory_type,
+        created_after=created_after,
+        created_before=created_before,
+        include_embeddings=include_embeddings,
+        include_archived=include_archived
+    )
+    # Own session: the request-scoped one may be closed before the body is sent
+    return StreamingResponse(
+        _export_stream(user_id, output_format, exporter_args),
+        media_type=MEDIA_TYPES[output_format]
+    )
+
+
+async def _export_stream(user_id: str, output_format: str, exporter_args: dict) -> AsyncIterator[bytes]:
+    """Run the exporter on its own read session."""
+    async with get_read_db_context([user_id]) as db:
+        exporter = MemoryExporter(db, user_id, **exporter_args)
+        chunks = exporter.arrow() if output_format == "arrow" else exporter.ndjson()
+        async for chunk in chunks:
+            yield chunk
+
+
 @router.get("/{memory_id}", response_model=MemoryResponse)
 async def get_memory(
     memory_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    user_id: Optional[str] = Query(None, description="Owner user ID - lets a partitioned table prune to one partition"),
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get specific memory by ID."""
-    result = await db.execute(
-        select(Memory).where(Memory.id == memory_id)
-    )
+    query = select(Memory).where(Memory.id == memory_id)
+    if user_id:
+        query = query.where(Memory.user_id == user_id)
+
+    result = await db.execute(query)
     memory = result.scalar_one_or_none()
 
-    if not memory:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Memory not found: {memory_id}"
-        )
+    async with primary_session(db) as writer:
+        # Not in hot tier: promote from archive if it was archived
+        if not memory and await TieringService(writer).promote([memory_id], user_id=user_id, record_access=False):
+            result = await writer.execute(query)
+            memory = result.scalar_one_or_none()
 
-    # Record access
-    memory.record_access()
-    await db.commit()
+        if not memory:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Memory not found: {memory_id}"
+            )
+
+        # Record access: in place when the row was loaded by the writer, else by
+        # an explicit UPDATE on the primary (never both, or it counts twice)
+        if memory in writer:
+            memory.record_access()
+            accessed_at, access_count = memory.accessed_at, memory.access_count
+        else:
+            result = await writer.execute(
+                update(Memory)
+                .where(Memory.id == memory.id, Memory.user_id == memory.user_id)
+                .values(accessed_at=datetime.now(timezone.utc), access_count=Memory.access_count + 1)
+                .returning(Memory.accessed_at, Memory.access_count)
+            )
+            accessed_at, access_count = result.one()
+        await writer.commit()
 
     return MemoryResponse(
         id=str(memory.id),
@@ -156,8 +248,8 @@ async def get_memory(
         importance=memory.importance,
         metadata=memory.extra_data or {},
         created_at=memory.created_at,
-        accessed_at=memory.accessed_at,
-        access_count=memory.access_count
+        accessed_at=accessed_at,
+        access_count=access_count
     )
 
 
@@ -167,22 +259,43 @@ async def list_memories(
     agent_id: str = None,
     memory_type: str = None,
     include_shared: bool = True,
-    limit: int = 20,
-    offset: int = 0,
-    db: AsyncSession = Depends(get_db)
+    limit: int = Query(20, ge=1, description="Page size"),
+    offset: int = Query(0, ge=0, description="Deprecated: use cursor (deep offsets scan and discard rows)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page")
 ):
     """
-    List memories for a user with optional agent isolation.
+    List memories for a user with optional agent isolation, newest first.
 
     - agent_id: filter to specific agent (+ shared if include_shared=True)
     - include_shared: include shared memories when filtering by agent_id
+    - cursor: keyset pagination on (created_at, id); the next page's cursor
+      is returned in the X-Next-Cursor header (absent on the last page)
+
+    Identical concurrent listings share one query (single-flight).
     """
-    query = select(Memory).where(Memory.user_id == user_id)
+    key = (user_id, agent_id, memory_type, include_shared, limit, offset, cursor)
+    body, headers = await get_single_flight("memory-list").do(
+        key, lambda: _list_memories(user_id, agent_id, memory_type, include_shared, limit, offset, cursor)
+    )
+    return FastJSONResponse(body, headers=headers)
+
+
+async def _list_memories(
+    user_id: str,
+    agent_id: Optional[str],
+    memory_type: Optional[str],
+    include_shared: bool,
+    limit: int,
+    offset: int,
+    cursor: Optional[str]
+) -> Tuple[bytes, dict]:
+    """One page of memories as JSON bytes, plus the next-cursor header."""
+    # Only the response columns, as plain rows (no ORM identity map)
+    query = select(*MEMORY_COLUMNS).where(Memory.user_id == user_id)
 
     # Agent isolation
     if agent_id:
         if include_shared:
-            from sqlalchemy import or_
             query = query.where(
                 or_(Memory.agent_id == agent_id, Memory.access_mode == "shared")
             )
@@ -192,66 +305,101 @@ async def list_memories(
     if memory_type:
         query = query.where(Memory.memory_type == memory_type)
 
-    query = query.order_by(Memory.created_at.desc()).offset(offset).limit(limit)
-
-    result = await db.execute(query)
-    memories = result.scalars().all()
-
-    return [
-        MemoryResponse(
-            id=str(memory.id),
-            user_id=memory.user_id,
-            agent_id=memory.agent_id,
-            access_mode=memory.access_mode,
-            content=memory.content,
-            memory_type=memory.memory_type,
-            importance=memory.importance,
-            metadata=memory.extra_data or {},
-            created_at=memory.created_at,
-            accessed_at=memory.accessed_at,
-            access_count=memory.access_count
+    # Keyset: start strictly after the previous page's last (created_at, id)
+    if cursor:
+        created_at, last_id = decode_cursor(cursor, MEMORY_CURSOR_KEY)
+        query = query.where(
+            tuple_(Memory.created_at, Memory.id)
+            < tuple_(literal(created_at, Memory.created_at.type), literal(last_id, Memory.id.type))
         )
-        for memory in memories
-    ]
+    elif offset:
+        query = query.offset(offset)
+
+    query = query.order_by(Memory.created_at.desc(), Memory.id.desc()).limit(limit + 1)
+
+    async with get_read_db_context([user_id]) as db:
+        result = await db.execute(query)
+        rows = result.all()
+    headers = next_cursor_headers(rows, limit, key=lambda row: (row.created_at, row.id))
+
+    # Fast path: rows straight to JSON (schema stays List[MemoryResponse])
+    return dumps([memory_dict(row) for row in rows]), headers
 
 
 @router.delete("/{memory_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_memory(
     memory_id: UUID,
+    user_id: Optional[str] = Query(None, description="Owner user ID - lets a partitioned table prune to one partition"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete memory."""
-    result = await db.execute(
-        select(Memory).where(Memory.id == memory_id)
-    )
-    memory = result.scalar_one_or_none()
-
-    if not memory:
+    """Delete memory (one DELETE ... RETURNING round trip; cold tier as fallback)."""
+    query = delete(Memory).where(Memory.id == memory_id)
+    if user_id:
+        query = query.where(Memory.user_id == user_id)
+
+    result = await db.execute(query.returning(Memory.user_id))
+    owner = result.scalar_one_or_none()
+    if owner is None:
+        owner = await TieringService(db).delete_archived(memory_id, user_id=user_id)
+    if owner is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Memory not found: {memory_id}"
         )
 
-    await db.delete(memory)
     await db.commit()
+    await publish_change(db, "memories", owner, "deleted", {"ids": [str(memory_id)]})
 
     logger.info(f"Deleted memory: {memory_id}")
 
 
+@router.post("/bulk-delete", response_model=MemoryBulkDeleteResponse)
+async def bulk_delete_memories(
+    request: MemoryBulkDelete,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete a user's memories by filter (agent, type, created before).
+
+    Runs as chunked DELETE ... RETURNING batches, each committed on its
+    own, so large deletes hold short locks. `dry_run` only counts.
+    """
+    bulk = BulkDeleteService(db)
+    filters = {
+        "user_id": request.user_id,
+        "agent_id": request.agent_id,
+        "memory_type": request.memory_type,
+        "created_before": request.created_before,
+        "include_archived": request.include_archived
+    }
+    if request.dry_run:
+        deleted = await bulk.count_memories(**filters)
+    else:
+        deleted = await bulk.delete_memories(**filters)
+
+    return MemoryBulkDeleteResponse(
+        user_id=request.user_id,
+        dry_run=request.dry_run,
+        batches=bulk.batches,
+        **deleted
+    )
+
+
 @router.post("/batch", response_model=dict)
 async def add_memories_batch(
     user_id: str,
     memories: List[MemoryAdd],
     db: AsyncSession = Depends(get_db)
 ):
-    """Add multiple memories in batch with agent isolation."""
+    """Add multiple memories in batch with agent isolation ("ingest" admission class)."""
     search_service = SearchService(db)
 
     # Use optimized batch service method
-    added_memories = await search_service.add_memories_batch(
-        user_id=user_id,
-        memories_data=memories
-    )
+    async with get_admission_controller(INGEST).slot(user_id):
+        added_memories = await search_service.add_memories_batch(
+            user_id=user_id,
+            memories_data=memories
+        )
 
     added_ids = [str(m.id) for m in added_memories]
 
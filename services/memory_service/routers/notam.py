@@ -1,18 +1,23 @@
 """
-NOTAM Router - Manage critical notices
+NOTAM Router - Manage critical notices (per user and broadcast)
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select, text
 from typing import List, Optional
 from uuid import UUID
 import logging
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Notam
-from ..schemas.requests import NotamCreate, NotamUpdate
-from ..schemas.responses import NotamResponse
+from ..services.cache import get_context_cache
+from ..services.change_bus import publish_change
+from ..services.broadcast import BroadcastService, USER_NOTAM_COLUMNS, visible_broadcasts_sql
+from ..services.serialization import FastJSONResponse, notam_dict
+from ..services.pagination import NOTAM_CURSOR_KEY, decode_cursor, next_cursor_headers
+from ..schemas.requests import NotamCreate, NotamUpdate, BroadcastNotamCreate, NotamGroupMembers
+from ..schemas.responses import NotamResponse, BroadcastNotamResponse
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/notam", tags=["NOTAM"])
@@ -21,44 +26,247 @@ router = APIRouter(prefix="/notam", tags=["NOTAM"])
 @router.get("", response_model=List[NotamResponse])
 async def list_notams(
     user_id: str = Query(..., description="User ID"),
-    active_only: bool = Query(True, description="Only return active NOTAMs"),
+    active_only: bool = Query(True, description="Only return active, unexpired NOTAMs"),
     category: Optional[str] = Query(None, description="Filter by category"),
+    include_broadcasts: bool = Query(True, description="Include global/group broadcasts (not dismissed)"),
+    limit: Optional[int] = Query(None, ge=1, le=500, description="Page size (default: all)"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    List NOTAMs for a user, merged with the broadcasts they can see.
+
+    Ordered by priority, then newest first. With `limit`, pages are keyset
+    paginated on (priority_rank, created_at, id): the next page's cursor is
+    returned in the X-Next-Cursor header (absent on the last page).
+    """
+    params = {"user_id": user_id, "category": category}
+    filters = ["user_id = :user_id"]
+    broadcast_filters = []
+    if active_only:
+        filters.append("active = true AND (expires_at IS NULL OR expires_at > NOW())")
+    if category:
+        filters.append("category = :category")
+        broadcast_filters.append("category = :category")
+
+    # Keyset in each branch, so both walk their index from the cursor on
+    if cursor:
+        params["after_rank"], params["after_created_at"], params["after_id"] = decode_cursor(cursor, NOTAM_CURSOR_KEY)
+        keyset = """(priority_rank, created_at, id) < (
+            CAST(:after_rank AS SMALLINT), CAST(:after_created_at AS TIMESTAMPTZ), CAST(:after_id AS UUID)
+        )"""
+        filters.append(keyset)
+        broadcast_filters.append(keyset)
+
+    union = ""
+    if include_broadcasts:
+        broadcast_where = f"WHERE {' AND '.join(broadcast_filters)}" if broadcast_filters else ""
+        union = f"""
+            UNION ALL
+            SELECT * FROM ({visible_broadcasts_sql("CAST(:user_id AS VARCHAR)")}) broadcast {broadcast_where}
+        """
+
+    limit_sql = ""
+    if limit:
+        limit_sql = "LIMIT :limit"
+        params["limit"] = limit + 1
+
+    result = await db.execute(
+        text(f"""
+            SELECT * FROM (
+                SELECT {USER_NOTAM_COLUMNS}
+                FROM notams
+                WHERE {" AND ".join(filters)}
+                {union}
+            ) n
+            ORDER BY n.priority_rank DESC, n.created_at DESC, n.id DESC
+            {limit_sql}
+        """),
+        params
+    )
+    rows = result.mappings().all()
+    headers = {}
+    if limit:
+        headers = next_cursor_headers(rows, limit, key=lambda row: (row["priority_rank"], row["created_at"], row["id"]))
+
+    # Fast path: rows straight to JSON (schema stays List[NotamResponse])
+    return FastJSONResponse([notam_dict(row) for row in rows], headers=headers)
+
+
+# =====================================================
+# Broadcast NOTAMs (declared before /{notam_id})
+# =====================================================
+
+@router.get("/broadcast", response_model=List[BroadcastNotamResponse])
+async def list_broadcasts(
+    active_only: bool = Query(True, description="Only return active, unexpired broadcasts"),
+    group_id: Optional[str] = Query(None, description="Only broadcasts for this group"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List global and group broadcast NOTAMs."""
+    rows = await BroadcastService(db).list_broadcasts(active_only=active_only, group_id=group_id)
+    return [_broadcast_response(row) for row in rows]
+
+
+@router.post("/broadcast", response_model=BroadcastNotamResponse, status_code=status.HTTP_201_CREATED)
+async def create_broadcast(
+    request: BroadcastNotamCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """List NOTAMs for a user."""
-    query = select(Notam).where(Notam.user_id == user_id)
+    """
+    Publish a NOTAM to every user, or to the members of `group_id`.
 
-    if active_only:
-        query = query.where(Notam.active == True)
+    Stored once (one row, whatever the number of users) and merged into
+    each user's NOTAMs at read time.
+    """
+    row = await BroadcastService(db).create(
+        title=request.title,
+        content=request.content,
+        priority=request.priority,
+        category=request.category,
+        expires_at=request.expires_at,
+        group_id=request.group_id
+    )
 
-    if category:
-        query = query.where(Notam.category == category)
-
-    query = query.order_by(Notam.priority.desc(), Notam.created_at.desc())
-
-    result = await db.execute(query)
-    notams = result.scalars().all()
-
-    return [
-        NotamResponse(
-            id=str(notam.id),
-            user_id=notam.user_id,
-            title=notam.title,
-            content=notam.content,
-            priority=notam.priority,
-            category=notam.category,
-            active=notam.active,
-            expires_at=notam.expires_at,
-            created_at=notam.created_at
+    response = _broadcast_response(row)
+    get_context_cache().invalidate_all_notams()
+    await publish_change(db, "notams", None, "broadcast", _broadcast_event_data(response))
+    return response
+
+
+@router.post("/broadcast/{notam_id}/deactivate", response_model=BroadcastNotamResponse)
+async def deactivate_broadcast(
+    notam_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Deactivate a broadcast NOTAM for everyone."""
+    row = await BroadcastService(db).set_active(notam_id, False)
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Broadcast NOTAM not found: {notam_id}"
+        )
+
+    response = _broadcast_response(row)
+    get_context_cache().invalidate_all_notams()
+    logger.info(f"Deactivated broadcast NOTAM: {notam_id}")
+    await publish_change(db, "notams", None, "deactivated", {"id": str(notam_id)})
+    return response
+
+
+@router.delete("/broadcast/{notam_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_broadcast(
+    notam_id: UUID,
+    db: AsyncSession = Depends(get_db)
+):
+    """Delete a broadcast NOTAM (and its acknowledgements)."""
+    if not await BroadcastService(db).delete(notam_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Broadcast NOTAM not found: {notam_id}"
+        )
+
+    get_context_cache().invalidate_all_notams()
+    logger.info(f"Deleted broadcast NOTAM: {notam_id}")
+    await publish_change(db, "notams", None, "deleted", {"id": str(notam_id)})
+
+
+@router.post("/broadcast/{notam_id}/ack", status_code=status.HTTP_204_NO_CONTENT)
+async def acknowledge_broadcast(
+    notam_id: UUID,
+    user_id: str = Query(..., description="User acknowledging the NOTAM"),
+    dismiss: bool = Query(False, description="Hide the NOTAM from this user's context"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Acknowledge (still shown) or dismiss (hidden) a broadcast NOTAM for one user."""
+    if not await BroadcastService(db).acknowledge(notam_id, user_id, dismiss=dismiss):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Broadcast NOTAM not found: {notam_id}"
+        )
+
+    get_context_cache().invalidate_notams(user_id)
+    await publish_change(
+        db, "notams", user_id, "dismissed" if dismiss else "acknowledged", {"id": str(notam_id)}
+    )
+
+
+@router.get("/groups/{group_id}/members", response_model=List[str])
+async def list_group_members(
+    group_id: str,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """List users in a NOTAM group."""
+    return await BroadcastService(db).members(group_id)
+
+
+@router.post("/groups/{group_id}/members", response_model=List[str])
+async def add_group_members(
+    group_id: str,
+    request: NotamGroupMembers,
+    db: AsyncSession = Depends(get_db)
+):
+    """Add users to a NOTAM group (they start seeing its broadcasts)."""
+    broadcast_service = BroadcastService(db)
+    await broadcast_service.add_members(group_id, request.user_ids)
+
+    cache = get_context_cache()
+    for user_id in request.user_ids:
+        cache.invalidate_notams(user_id)
+        await publish_change(db, "notams", user_id, "group_joined", {"group_id": group_id})
+
+    return await broadcast_service.members(group_id)
+
+
+@router.delete("/groups/{group_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def remove_group_member(
+    group_id: str,
+    user_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Remove a user from a NOTAM group."""
+    if not await BroadcastService(db).remove_member(group_id, user_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"User {user_id} is not a member of group: {group_id}"
         )
-        for notam in notams
-    ]
 
+    get_context_cache().invalidate_notams(user_id)
+    await publish_change(db, "notams", user_id, "group_left", {"group_id": group_id})
+
+
+def _broadcast_response(row) -> BroadcastNotamResponse:
+    """Build response from a broadcast_notams row."""
+    return BroadcastNotamResponse(
+        id=str(row.id),
+        scope=row.scope,
+        group_id=row.group_id,
+        title=row.title,
+        content=row.content,
+        priority=row.priority or "normal",
+        category=row.category,
+        active=row.active,
+        expires_at=row.expires_at,
+        created_at=row.created_at
+    )
+
+
+def _broadcast_event_data(response: BroadcastNotamResponse) -> dict:
+    """Change event data; group broadcasts go to every stream, so only their id and group."""
+    if response.group_id:
+        return {"id": response.id, "scope": response.scope, "group_id": response.group_id}
+    return response.model_dump(mode="json")
+
+
+# =====================================================
+# NOTAMs by id
+# =====================================================
 
 @router.get("/{notam_id}", response_model=NotamResponse)
 async def get_notam(
     notam_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get specific NOTAM by ID."""
     result = await db.execute(
@@ -104,9 +312,10 @@ async def create_notam(
     await db.commit()
     await db.refresh(notam)
 
+    get_context_cache().invalidate_notams(request.user_id)
     logger.info(f"Created NOTAM '{request.title}' for user: {request.user_id}")
 
-    return NotamResponse(
+    response = NotamResponse(
         id=str(notam.id),
         user_id=notam.user_id,
         title=notam.title,
@@ -117,6 +326,8 @@ async def create_notam(
         expires_at=notam.expires_at,
         created_at=notam.created_at
     )
+    await publish_change(db, "notams", request.user_id, "created", response.model_dump(mode="json"))
+    return response
 
 
 @router.put("/{notam_id}", response_model=NotamResponse)
@@ -154,9 +365,10 @@ async def update_notam(
     await db.commit()
     await db.refresh(notam)
 
+    get_context_cache().invalidate_notams(notam.user_id)
     logger.info(f"Updated NOTAM: {notam_id}")
 
-    return NotamResponse(
+    response = NotamResponse(
         id=str(notam.id),
         user_id=notam.user_id,
         title=notam.title,
@@ -167,6 +379,8 @@ async def update_notam(
         expires_at=notam.expires_at,
         created_at=notam.created_at
     )
+    await publish_change(db, "notams", notam.user_id, "updated", response.model_dump(mode="json"))
+    return response
 
 
 @router.delete("/{notam_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -174,22 +388,23 @@ async def delete_notam(
     notam_id: UUID,
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete NOTAM."""
+    """Delete NOTAM (one DELETE ... RETURNING round trip)."""
     result = await db.execute(
-        select(Notam).where(Notam.id == notam_id)
+        delete(Notam).where(Notam.id == notam_id).returning(Notam.user_id)
     )
-    notam = result.scalar_one_or_none()
+    user_id = result.scalar_one_or_none()
 
-    if not notam:
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"NOTAM not found: {notam_id}"
         )
 
-    await db.delete(notam)
     await db.commit()
 
+    get_context_cache().invalidate_notams(user_id)
     logger.info(f"Deleted NOTAM: {notam_id}")
+    await publish_change(db, "notams", user_id, "deleted", {"id": str(notam_id)})
 
 
 @router.post("/{notam_id}/deactivate", response_model=NotamResponse)
@@ -213,9 +428,10 @@ async def deactivate_notam(
     await db.commit()
     await db.refresh(notam)
 
+    get_context_cache().invalidate_notams(notam.user_id)
     logger.info(f"Deactivated NOTAM: {notam_id}")
 
-    return NotamResponse(
+    response = NotamResponse(
         id=str(notam.id),
         user_id=notam.user_id,
         title=notam.title,
@@ -226,3 +442,5 @@ async def deactivate_notam(
         expires_at=notam.expires_at,
         created_at=notam.created_at
     )
+    await publish_change(db, "notams", notam.user_id, "deactivated", response.model_dump(mode="json"))
+    return response
@@ -2,13 +2,16 @@
 Persona Router - Manage user personas
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, select
 import logging
 
-from ..database import get_db
+from ..database import get_db, get_read_db
 from ..models import Persona
+from ..services.cache import get_context_cache
+from ..services.change_bus import publish_change
+from ..services.persona import PersonaService
 from ..schemas.requests import PersonaCreate, PersonaUpdate
 from ..schemas.responses import PersonaResponse
 
@@ -19,7 +22,7 @@ router = APIRouter(prefix="/persona", tags=["Persona"])
 @router.get("/{user_id}", response_model=PersonaResponse)
 async def get_persona(
     user_id: str,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """Get user persona by user_id."""
     result = await db.execute(
@@ -51,85 +54,65 @@ async def create_persona(
     db: AsyncSession = Depends(get_db)
 ):
     """Create new user persona."""
-    # Check if persona already exists
-    existing = await db.execute(
-        select(Persona).where(Persona.user_id == request.user_id)
+    response = await PersonaService(db).create(
+        request.user_id,
+        name=request.name,
+        patches={"traits": request.traits, "preferences": request.preferences, "style": request.style}
     )
-    if existing.scalar_one_or_none():
+
+    if response is None:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=f"Persona already exists for user: {request.user_id}"
         )
 
-    persona = Persona(
-        user_id=request.user_id,
-        name=request.name,
-        traits=request.traits,
-        preferences=request.preferences,
-        style=request.style
-    )
-
-    db.add(persona)
-    await db.commit()
-    await db.refresh(persona)
-
+    get_context_cache().invalidate_persona(request.user_id)
     logger.info(f"Created persona for user: {request.user_id}")
 
-    return PersonaResponse(
-        id=str(persona.id),
-        user_id=persona.user_id,
-        name=persona.name,
-        traits=persona.traits or {},
-        preferences=persona.preferences or {},
-        style=persona.style or {},
-        created_at=persona.created_at,
-        updated_at=persona.updated_at
-    )
+    await publish_change(db, "personas", request.user_id, "created", response.model_dump(mode="json"))
+    return response
 
 
 @router.put("/{user_id}", response_model=PersonaResponse)
 async def update_persona(
     user_id: str,
     request: PersonaUpdate,
+    http_response: Response,
+    upsert: bool = Query(False, description="Create the persona if it does not exist"),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update existing persona."""
-    result = await db.execute(
-        select(Persona).where(Persona.user_id == user_id)
+    """
+    Update existing persona.
+
+    traits / preferences / style are merged into the stored values in one
+    atomic statement (shallow by default, recursive with deep_merge), and
+    keys listed in `unset` are deleted, so concurrent updates do not
+    overwrite each other.
+    """
+    response, created = await PersonaService(db).update(
+        user_id,
+        name=request.name,
+        patches={"traits": request.traits, "preferences": request.preferences, "style": request.style},
+        unset=request.unset,
+        deep=request.deep_merge,
+        upsert=upsert
     )
-    persona = result.scalar_one_or_none()
 
-    if not persona:
+    if response is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Persona not found for user: {user_id}"
         )
 
-    # Update fields if provided
-    if request.name is not None:
-        persona.name = request.name
-    if request.traits is not None:
-        persona.traits = {**persona.traits, **request.traits} if persona.traits else request.traits
-    if request.preferences is not None:
-        persona.preferences = {**persona.preferences, **request.preferences} if persona.preferences else request.preferences
-    if request.style is not None:
-        persona.style = {**persona.style, **request.style} if persona.style else request.style
-
-    await db.commit()
-    await db.refresh(persona)
-
-    logger.info(f"Updated persona for user: {user_id}")
+    get_context_cache().invalidate_persona(user_id)
+    logger.info(f"{'Created' if created else 'Updated'} persona for user: {user_id}")
 
-    return PersonaResponse(
-        id=str(persona.id),
-        user_id=persona.user_id,
-        name=persona.name,
-        traits=persona.traits or {},
-        preferences=persona.preferences or {},
-        style=persona.style or {},
-        created_at=persona.created_at,
-        updated_at=persona.updated_at
+    if created:
+        http_response.status_code = status.HTTP_201_CREATED
+    await publish_change(
+        db, "personas", user_id, "created" if created else "updated", response.model_dump(mode="json")
     )
+    return response
 
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -137,19 +120,20 @@ async def delete_persona(
     user_id: str,
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete user persona."""
+    """Delete user persona (one DELETE ... RETURNING round trip)."""
     result = await db.execute(
-        select(Persona).where(Persona.user_id == user_id)
+        delete(Persona).where(Persona.user_id == user_id).returning(Persona.id)
     )
-    persona = result.scalar_one_or_none()
+    persona_id = result.scalar_one_or_none()
 
-    if not persona:
+    if persona_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Persona not found for user: {user_id}"
         )
 
-    await db.delete(persona)
     await db.commit()
 
+    get_context_cache().invalidate_persona(user_id)
     logger.info(f"Deleted persona for user: {user_id}")
+    await publish_change(db, "personas", user_id, "deleted", {"id": str(persona_id)})
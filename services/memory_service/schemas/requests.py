@@ -3,7 +3,7 @@ Request Schemas
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 
 
@@ -20,6 +20,27 @@ class ContextRequest(BaseModel):
     include_session: bool = Field(True, description="Include last session activity")
 
 
+class PromptAssembleRequest(BaseModel):
+    """Request for a combined Layer 1 + Layer 2 prompt section."""
+    user_id: str = Field(..., description="User identifier")
+    agent_type: Optional[str] = Field(None, description="Type of agent making request")
+    agent_name: Optional[str] = Field(None, description="Name of agent")
+    include_notams: bool = Field(True, description="Include active NOTAMs")
+    include_session: bool = Field(True, description="Include last session activity")
+    query: Optional[str] = Field(None, min_length=1, description="Search query - omit to skip memories")
+    agent_id: Optional[str] = Field(None, description="Agent ID - only see own + shared memories")
+    memory_types: Optional[List[str]] = Field(None, description="Filter by memory types")
+    memory_limit: int = Field(5, ge=1, le=20, description="Number of memories to search for")
+    threshold: float = Field(0.3, ge=0, le=1, description="Minimum similarity score")
+    include_shared: bool = Field(True, description="Include shared memories in results")
+    token_budget: int = Field(1500, ge=32, le=32000, description="Max tokens for the whole prompt section")
+
+
+class BatchContextRequest(BaseModel):
+    """Request for Layer 1 context of many users at once."""
+    requests: List[ContextRequest] = Field(..., min_length=1, description="One request per user")
+
+
 # =====================================================
 # Persona Requests
 # =====================================================
@@ -34,11 +55,16 @@ class PersonaCreate(BaseModel):
 
 
 class PersonaUpdate(BaseModel):
-    """Update existing persona."""
+    """Update existing persona (dicts are merged into the stored ones)."""
     name: Optional[str] = None
     traits: Optional[Dict[str, Any]] = None
     preferences: Optional[Dict[str, Any]] = None
     style: Optional[Dict[str, Any]] = None
+    deep_merge: bool = Field(False, description="Merge nested objects recursively instead of replacing them")
+    unset: Dict[Literal["traits", "preferences", "style"], List[str]] = Field(
+        default_factory=dict,
+        description="Keys to delete per field; nested keys use dots, e.g. {\"style\": [\"editor.theme\"]}"
+    )
 
 
 # =====================================================
@@ -65,6 +91,21 @@ class NotamUpdate(BaseModel):
     expires_at: Optional[datetime] = None
 
 
+class BroadcastNotamCreate(BaseModel):
+    """Create a NOTAM for every user (global) or for one group."""
+    title: str
+    content: str
+    priority: str = Field("normal", pattern="^(critical|high|normal|low|info)$")
+    category: Optional[str] = None
+    expires_at: Optional[datetime] = None
+    group_id: Optional[str] = Field(None, description="Group audience - omit for a global broadcast")
+
+
+class NotamGroupMembers(BaseModel):
+    """Users to add to a NOTAM group."""
+    user_ids: List[str] = Field(..., min_length=1)
+
+
 # =====================================================
 # Session Requests
 # =====================================================
@@ -98,5 +139,21 @@ class MemoryAdd(BaseModel):
     source_conversation_id: Optional[str] = None
 
 
+class MemoryBulkDelete(BaseModel):
+    """Delete a user's memories by filter (chunked server-side)."""
+    user_id: str
+    agent_id: Optional[str] = Field(None, description="Only this agent's memories")
+    memory_type: Optional[str] = Field(None, pattern="^(fact|preference|decision|event|procedure)$")
+    created_before: Optional[datetime] = Field(None, description="Only memories created before this time")
+    include_archived: bool = Field(True, description="Also delete matching cold-tier memories")
+    dry_run: bool = Field(False, description="Count matching memories without deleting")
+
 
+# =====================================================
+# Admin Requests
+# =====================================================
 
+class QuotaSet(BaseModel):
+    """Set memory quota override for a user or one of their agents."""
+    agent_id: Optional[str] = Field(None, description="Agent ID - omit for a user-wide quota")
+    max_memories: int = Field(..., ge=0, description="Maximum hot-tier memories (0 = unlimited)")
@@ -40,6 +40,22 @@ class NotamResponse(BaseModel):
     active: bool
     expires_at: Optional[datetime]
     created_at: Optional[datetime]
+    scope: str = "user"  # user, global, group
+    acknowledged: bool = False
+
+
+class BroadcastNotamResponse(BaseModel):
+    """Broadcast NOTAM data."""
+    id: str
+    scope: str
+    group_id: Optional[str]
+    title: str
+    content: str
+    priority: str
+    category: Optional[str]
+    active: bool
+    expires_at: Optional[datetime]
+    created_at: Optional[datetime]
 
 
 # =====================================================
@@ -97,6 +113,28 @@ class ContextResponse(BaseModel):
         return "\n".join(parts)
 
 
+class BatchContextResponse(BaseModel):
+    """Layer 1 context for many users, keyed by user_id."""
+    contexts: Dict[str, ContextResponse]
+    retrieved_at: datetime
+
+
+class AssembledPromptResponse(BaseModel):
+    """Layer 1 context and top memories packed into one prompt section."""
+    user_id: str
+    prompt_section: str
+    token_estimate: int
+    token_budget: int
+    persona_included: bool
+    notams_included: int
+    notams_dropped: int
+    session_included: bool
+    memory_ids: List[str]
+    memories_dropped: int
+    search_time_ms: float
+    retrieved_at: datetime
+
+
 # =====================================================
 # Memory Responses (Layer 2)
 # =====================================================
@@ -138,3 +176,68 @@ class MemoryAddResponse(BaseModel):
     message: str
 
 
+class MemoryBulkDeleteResponse(BaseModel):
+    """Result of a filtered bulk delete."""
+    user_id: str
+    dry_run: bool
+    hot: int = Field(..., description="Hot-tier memories deleted (or matching, on dry run)")
+    cold: int = Field(..., description="Cold-tier memories deleted (or matching, on dry run)")
+    batches: int = Field(0, description="DELETE chunks committed")
+
+
+# =====================================================
+# Admin Responses
+# =====================================================
+
+class AgentQuotaUsage(BaseModel):
+    """Memory quota usage for a single agent."""
+    agent_id: str
+    used: int
+    quota: int
+    headroom: Optional[int] = Field(None, description="Remaining capacity (null = unlimited)")
+
+
+class QuotaUsageResponse(BaseModel):
+    """Memory quota usage for a user."""
+    user_id: str
+    used: int
+    quota: int
+    headroom: Optional[int] = Field(None, description="Remaining capacity (null = unlimited)")
+    agents: List[AgentQuotaUsage] = Field(default_factory=list)
+
+
+class VectorIndexStatus(BaseModel):
+    """Health of a single ivfflat index (one per partition if partitioned)."""
+    index_name: str
+    table_name: str
+    lists: int
+    recommended_lists: int
+    lists_drift: float
+    needs_reindex: bool
+    rows: int
+    dead_rows: int
+    index_bytes: int
+    last_vacuum: Optional[datetime]
+    last_analyze: Optional[datetime]
+
+
+class IndexMaintenanceResponse(BaseModel):
+    """Vector index status and last maintenance run."""
+    indexes: List[VectorIndexStatus]
+    recall: Optional[Dict[str, Any]] = Field(None, description="Last sampled recall estimate")
+    maintenance_window: str
+    in_window: bool
+    running: bool = Field(False, description="A maintenance run is in progress on this worker")
+    last_run_at: Optional[datetime]
+    last_actions: List[Dict[str, Any]] = Field(
+        default_factory=list, description="Finished statements (live while running)"
+    )
+    last_error: Optional[str] = None
+
+
+class UserPurgeResponse(BaseModel):
+    """Rows deleted by a user purge, per table."""
+    user_id: str
+    deleted: Dict[str, int]
+    total: int
+    batches: int
@@ -4,9 +4,48 @@ Sentra Memory Service - Services
 
 from .embedder import EmbeddingService, get_embedding_service
 from .search import SearchService
+from .scheduler import PeriodicTask, get_scheduler
+from .tiering import TieringService
+from .quota import QuotaService
+from .index_maintenance import IndexMaintenanceService
+from .cache import TTLCache, get_context_cache
+from .session_tracker import SessionTracker, get_session_tracker
+from .notam_sweeper import NotamSweeper
+from .prompt_assembly import PromptPacker, assemble_prompt
+from .change_bus import ChangeBus, get_change_bus, publish_change
+from .persona import PersonaService
+from .broadcast import BroadcastService
+from .health import HealthProber, get_health_prober
+from .purge import BulkDeleteService
+from .single_flight import SingleFlight, get_single_flight
+from .admission import AdmissionController, get_admission_controller
 
 __all__ = [
     "EmbeddingService",
     "get_embedding_service",
-    "SearchService"
+    "SearchService",
+    "PeriodicTask",
+    "get_scheduler",
+    "TieringService",
+    "QuotaService",
+    "IndexMaintenanceService",
+    "TTLCache",
+    "get_context_cache",
+    "SessionTracker",
+    "get_session_tracker",
+    "NotamSweeper",
+    "PromptPacker",
+    "assemble_prompt",
+    "ChangeBus",
+    "get_change_bus",
+    "publish_change",
+    "PersonaService",
+    "BroadcastService",
+    "HealthProber",
+    "get_health_prober",
+    "BulkDeleteService",
+    "SingleFlight",
+    "get_single_flight",
+    "AdmissionController",
+    "get_admission_controller"
 ]
@@ -0,0 +1,232 @@
+"""
+Admission Control - Bounded, fair queues in front of the embedding model
+
+Embedding is CPU-bound: under a burst, every /memory/search, /memory/add
+and /memory/batch request competes for the same cores and latency climbs
+for everyone. Each endpoint class ("search", "ingest") gets a fixed number
+of concurrent slots per worker and a bounded queue served round-robin per
+user, so one busy user cannot starve the others. Requests that cannot be
+served within the queue deadline are rejected up front:
+
+- 429 + Retry-After when the user already holds their share of the class
+- 503 + Retry-After when the queue is full, or the estimated wait (queue
+  depth x observed service time) is past the deadline, or the deadline
+  passes while queued
+
+Work inside a slot should run off the event loop (asyncio.to_thread), so
+Layer 1 endpoints that never take a slot keep their latency.
+"""
+
+from typing import Deque, Dict, Optional
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from fastapi import HTTPException, status
+import asyncio
+import math
+import time
+import logging
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Weight of the latest sample in the service time average
+SERVICE_TIME_ALPHA = 0.2
+
+
+class AdmissionController:
+    """Concurrency limit with a bounded, per-user round-robin queue."""
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        max_queue: Optional[int] = None,
+        queue_timeout_seconds: Optional[float] = None,
+        max_per_user: Optional[int] = None
+    ):
+        """Initialize admission controller."""
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_queue = settings.admission_max_queue if max_queue is None else max_queue
+        self.queue_timeout_seconds = (
+            settings.admission_queue_timeout_seconds if queue_timeout_seconds is None else queue_timeout_seconds
+        )
+        self.max_per_user = settings.admission_max_per_user if max_per_user is None else max_per_user
+
+        self.active = 0
+        self.queued = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        self._per_user: Dict[str, int] = {}  # active + queued
+        self.service_time = 0.0  # Moving average of seconds per admitted request
+
+        self.admitted = 0
+        self.rejected_user = 0
+        self.rejected_overload = 0
+        self.timed_out = 0
+
+    def estimated_wait(self) -> float:
+        """Seconds a request arriving now would wait for a slot."""
+        if self.active < self.concurrency and not self.queued:
+            return 0.0
+        return (self.queued // self.concurrency + 1) * self.service_time
+
+    @asynccontextmanager
+    async def slot(self, user_id: str):
+        """
+        Hold one slot of this class for the block.
+
+        Raises:
+            HTTPException 429 (user over their share) or 503 (overloaded),
+            both with Retry-After
+        """
+        if not settings.admission_enabled:
+            yield
+            return
+
+        await self._acquire(user_id)
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - start
+            self.service_time += SERVICE_TIME_ALPHA * (elapsed - self.service_time)
+            self._release(user_id)
+
+    def _reject(self, status_code: int, detail: str, retry_after: float):
+        """Raise a fast rejection with a Retry-After hint."""
+        raise HTTPException(
+            status_code=status_code,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    async def _acquire(self, user_id: str):
+        """Take a slot now, or queue for one until the deadline."""
+        if self.max_per_user and self._per_user.get(user_id, 0) >= self.max_per_user:
+            self.rejected_user += 1
+            self._reject(
+                status.HTTP_429_TOO_MANY_REQUESTS,
+                f"Too many concurrent {self.name} requests for user: {user_id}",
+                self.service_time
+            )
+
+        if self.active < self.concurrency and not self.queued:
+            self.active += 1
+            self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+            self.admitted += 1
+            return
+
+        wait = self.estimated_wait()
+        if self.queued >= self.max_queue or wait > self.queue_timeout_seconds:
+            self.rejected_overload += 1
+            self._reject(
+                status.HTTP_503_SERVICE_UNAVAILABLE,
+                f"{self.name} is overloaded, retry later",
+                wait
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(user_id, deque()).append(future)
+        self.queued += 1
+        self._per_user[user_id] = self._per_user.get(user_id, 0) + 1
+
+        try:
+            await asyncio.wait_for(future, self.queue_timeout_seconds)
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # Granted just as we gave up: hand the slot on
+                self._release(user_id)
+            else:
+                self._dequeue(user_id, future)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                self._reject(
+                    status.HTTP_503_SERVICE_UNAVAILABLE,
+                    f"{self.name} queue deadline exceeded, retry later",
+                    self.estimated_wait()
+                )
+            raise
+        self.admitted += 1
+
+    def _dequeue(self, user_id: str, future: asyncio.Future):
+        """Remove a waiter that gave up before being granted a slot."""
+        waiters = self._waiters.get(user_id)
+        if waiters and future in waiters:
+            waiters.remove(future)
+            self.queued -= 1
+            if not waiters:
+                del self._waiters[user_id]
+        self._drop_user(user_id)
+
+    def _drop_user(self, user_id: str):
+        """Decrement the user's active + queued count."""
+        count = self._per_user.get(user_id, 0) - 1
+        if count > 0:
+            self._per_user[user_id] = count
+        else:
+            self._per_user.pop(user_id, None)
+
+    def _release(self, user_id: str):
+        """Free a slot, handing it to the next user in round-robin order."""
+        self._drop_user(user_id)
+        while self._waiters:
+            next_user, waiters = next(iter(self._waiters.items()))
+            future = waiters.popleft()
+            self.queued -= 1
+            if waiters:
+                self._waiters.move_to_end(next_user)
+            else:
+                del self._waiters[next_user]
+            if not future.done():
+                future.set_result(None)  # Slot passes over; active is unchanged
+                return
+        self.active -= 1
+
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "name": self.name,
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "queued": self.queued,
+            "queued_users": len(self._waiters),
+            "max_queue": self.max_queue,
+            "queue_timeout_seconds": self.queue_timeout_seconds,
+            "max_per_user": self.max_per_user,
+            "service_time_ms": round(self.service_time * 1000, 2),
+            "estimated_wait_ms": round(self.estimated_wait() * 1000, 2),
+            "admitted": self.admitted,
+            "rejected_user": self.rejected_user,
+            "rejected_overload": self.rejected_overload,
+            "timed_out": self.timed_out
+        }
+
+
+# Endpoint classes: query embedding (search) and content embedding (add/batch)
+SEARCH = "search"
+INGEST = "ingest"
+
+# Singleton instances
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def get_admission_controller(name: str) -> AdmissionController:
+    """Get or create the admission controller for an endpoint class."""
+    controller = _controllers.get(name)
+    if controller is None:
+        concurrency = {
+            SEARCH: settings.admission_search_concurrency,
+            INGEST: settings.admission_ingest_concurrency
+        }[name]
+        controller = _controllers[name] = AdmissionController(name, concurrency)
+    return controller
+
+
+def admission_stats() -> dict:
+    """Counters for every endpoint class."""
+    return {
+        "enabled": settings.admission_enabled,
+        "classes": [get_admission_controller(name).stats() for name in (SEARCH, INGEST)]
+    }
@@ -0,0 +1,183 @@
+"""
+Broadcast Service - Global / group NOTAMs stored once, fanned out at read time
+
+A broadcast is one broadcast_notams row whatever the number of recipients.
+Readers merge visible broadcasts into a user's own NOTAMs with
+visible_broadcasts_sql(), which yields rows shaped like user NOTAMs and
+skips the ones the user dismissed.
+"""
+
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime
+from uuid import UUID
+import logging
+
+from ..models.broadcast_notam import SCOPE_GLOBAL, SCOPE_GROUP
+
+logger = logging.getLogger(__name__)
+
+# Columns of a user's own NOTAMs, in the shape shared with broadcasts
+USER_NOTAM_COLUMNS = """
+    id, user_id, title, content, COALESCE(priority, 'normal') AS priority,
+    priority_rank, category, active, expires_at, created_at,
+    'user' AS scope, false AS acknowledged
+"""
+
+
+def visible_broadcasts_sql(user_expr: str) -> str:
+    """
+    Active, unexpired broadcasts visible to the user in `user_expr`.
+
+    `user_expr` is a typed bind ("CAST(:user_id AS VARCHAR)") or a column of an outer query
+    ("u.user_id", for use in a LATERAL join).
+    """
+    return f"""
+        SELECT b.id, {user_expr} AS user_id, b.title, b.content,
+               COALESCE(b.priority, 'normal') AS priority, b.priority_rank, b.category,
+               b.active, b.expires_at, b.created_at,
+               b.scope, (a.notam_id IS NOT NULL) AS acknowledged
+        FROM broadcast_notams b
+        LEFT JOIN notam_acks a ON a.notam_id = b.id AND a.user_id = {user_expr}
+        WHERE b.active = true
+          AND (b.expires_at IS NULL OR b.expires_at > NOW())
+          AND (
+              b.group_id IS NULL
+              OR b.group_id IN (SELECT g.group_id FROM notam_group_members g WHERE g.user_id = {user_expr})
+          )
+          AND a.dismissed IS NOT TRUE
+    """
+
+
+class BroadcastService:
+    """Broadcast NOTAMs, group membership and per-user acknowledgements."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize broadcast service."""
+        self.session = session
+
+    async def create(
+        self,
+        title: str,
+        content: str,
+        priority: str = "normal",
+        category: Optional[str] = None,
+        expires_at: Optional[datetime] = None,
+        group_id: Optional[str] = None
+    ):
+        """Insert one broadcast (global, or for a group); O(1) in the number of users."""
+        result = await self.session.execute(
+            text("""
+                INSERT INTO broadcast_notams (scope, group_id, title, content, priority, category, expires_at)
+                VALUES (:scope, :group_id, :title, :content, :priority, :category, :expires_at)
+                RETURNING id, scope, group_id, title, content, priority, category, active, expires_at, created_at
+            """),
+            {
+                "scope": SCOPE_GROUP if group_id else SCOPE_GLOBAL,
+                "group_id": group_id,
+                "title": title,
+                "content": content,
+                "priority": priority,
+                "category": category,
+                "expires_at": expires_at
+            }
+        )
+        row = result.one()
+        await self.session.commit()
+        logger.info(f"Created {row.scope} broadcast NOTAM {row.id}" + (f" for group {group_id}" if group_id else ""))
+        return row
+
+    async def list_broadcasts(self, active_only: bool = True, group_id: Optional[str] = None):
+        """List broadcasts, newest and most important first."""
+        filters = []
+        if active_only:
+            filters.append("active = true AND (expires_at IS NULL OR expires_at > NOW())")
+        if group_id:
+            filters.append("group_id = :group_id")
+        where = f"WHERE {' AND '.join(filters)}" if filters else ""
+
+        result = await self.session.execute(
+            text(f"""
+                SELECT id, scope, group_id, title, content, priority, category, active, expires_at, created_at
+                FROM broadcast_notams
+                {where}
+                ORDER BY priority_rank DESC, created_at DESC
+            """),
+            {"group_id": group_id}
+        )
+        return result.all()
+
+    async def set_active(self, notam_id: UUID, active: bool):
+        """Activate / deactivate a broadcast. Returns the row or None."""
+        result = await self.session.execute(
+            text("""
+                UPDATE broadcast_notams SET active = :active WHERE id = :id
+                RETURNING id, scope, group_id, title, content, priority, category, active, expires_at, created_at
+            """),
+            {"id": notam_id, "active": active}
+        )
+        row = result.one_or_none()
+        await self.session.commit()
+        return row
+
+    async def delete(self, notam_id: UUID) -> bool:
+        """Delete a broadcast (acknowledgements cascade)."""
+        result = await self.session.execute(
+            text("DELETE FROM broadcast_notams WHERE id = :id"),
+            {"id": notam_id}
+        )
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def acknowledge(self, notam_id: UUID, user_id: str, dismiss: bool = False) -> bool:
+        """
+        Record that a user saw (or dismissed) a broadcast.
+
+        Dismissal is sticky: a later plain acknowledgement does not undo it.
+
+        Returns:
+            False if the broadcast does not exist
+        """
+        result = await self.session.execute(
+            text("""
+                INSERT INTO notam_acks (user_id, notam_id, dismissed, acked_at)
+                SELECT :user_id, id, :dismissed, NOW() FROM broadcast_notams WHERE id = :notam_id
+                ON CONFLICT (user_id, notam_id) DO UPDATE SET
+                    dismissed = notam_acks.dismissed OR EXCLUDED.dismissed,
+                    acked_at = EXCLUDED.acked_at
+            """),
+            {"user_id": user_id, "notam_id": notam_id, "dismissed": dismiss}
+        )
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def add_members(self, group_id: str, user_ids: List[str]) -> int:
+        """Add users to a group. Returns the number of new memberships."""
+        result = await self.session.execute(
+            text("""
+                INSERT INTO notam_group_members (group_id, user_id)
+                SELECT :group_id, user_id FROM unnest(CAST(:user_ids AS VARCHAR[])) AS user_id
+                ON CONFLICT DO NOTHING
+            """),
+            {"group_id": group_id, "user_ids": list(user_ids)}
+        )
+        await self.session.commit()
+        return result.rowcount
+
+    async def remove_member(self, group_id: str, user_id: str) -> bool:
+        """Remove a user from a group."""
+        result = await self.session.execute(
+            text("DELETE FROM notam_group_members WHERE group_id = :group_id AND user_id = :user_id"),
+            {"group_id": group_id, "user_id": user_id}
+        )
+        await self.session.commit()
+        return result.rowcount > 0
+
+    async def members(self, group_id: str) -> List[str]:
+        """User ids in a group."""
+        result = await self.session.execute(
+            text("SELECT user_id FROM notam_group_members WHERE group_id = :group_id ORDER BY user_id"),
+            {"group_id": group_id}
+        )
+        return list(result.scalars().all())
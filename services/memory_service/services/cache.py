@@ -0,0 +1,190 @@
+"""
+Cache Service - In-process Layer 1 TTL cache
+
+Persona, active NOTAMs and last session are read on every agent turn but
+change rarely. Entries expire after the per-kind TTL from Settings and are
+invalidated explicitly by the persona/NOTAM write paths - locally, and on
+other workers through the change bus (evict_on_change).
+"""
+
+from typing import Any, Hashable, Optional, Tuple
+from collections import OrderedDict
+import threading
+import time
+import logging
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+
+class TTLCache:
+    """Bounded LRU cache with per-cache TTL and hit/miss counters."""
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int):
+        """Initialize TTL cache."""
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Look up a key.
+
+        Returns:
+            Tuple of (hit, value). A cached None is a hit, so negative
+            lookups (e.g. user without persona) are cached too.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.ttl_seconds <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop a single key."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def invalidate_where(self, predicate) -> int:
+        """Drop every key matching predicate(key)."""
+        with self._lock:
+            keys = [key for key in self._entries if predicate(key)]
+            for key in keys:
+                del self._entries[key]
+            return len(keys)
+
+    def clear(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None
+        }
+
+
+class ContextCache:
+    """Layer 1 caches: persona and NOTAMs keyed by user, session by (user, agent_type), rendered prompts."""
+
+    def __init__(self):
+        """Initialize Layer 1 caches from settings."""
+        max_entries = settings.layer1_cache_max_entries if settings.layer1_cache_enabled else 0
+        self.persona = TTLCache("persona", settings.persona_cache_ttl, max_entries)
+        self.notams = TTLCache("notams", settings.notam_cache_ttl, max_entries)
+        self.session = TTLCache("session", settings.session_cache_ttl, max_entries)
+        # Rendered prompt sections keyed by (user_id, agent_type, include_notams, include_session)
+        self.prompt = TTLCache(
+            "prompt",
+            min(settings.persona_cache_ttl, settings.notam_cache_ttl, settings.session_cache_ttl),
+            max_entries
+        )
+
+    def _invalidate_prompts(self, user_id: str):
+        """Drop rendered prompts for a user."""
+        self.prompt.invalidate_where(lambda key: key[0] == user_id)
+
+    def invalidate_persona(self, user_id: str):
+        """Call after any persona write."""
+        self.persona.invalidate(user_id)
+        self._invalidate_prompts(user_id)
+
+    def invalidate_notams(self, user_id: str):
+        """Call after any NOTAM write."""
+        self.notams.invalidate(user_id)
+        self._invalidate_prompts(user_id)
+
+    def invalidate_all_notams(self):
+        """Call after a broadcast NOTAM write (visible to many users)."""
+        self.notams.clear()
+        self.prompt.clear()
+
+    def invalidate_sessions(self, user_id: str):
+        """Call after a session write that must be visible immediately."""
+        self.session.invalidate_where(lambda key: key[0] == user_id)
+        self._invalidate_prompts(user_id)
+
+    def invalidate_user(self, user_id: str):
+        """Drop everything cached for a user."""
+        self.invalidate_persona(user_id)
+        self.invalidate_notams(user_id)
+        self.invalidate_sessions(user_id)
+
+    def clear(self):
+        """Drop all entries."""
+        for cache in (self.persona, self.notams, self.session, self.prompt):
+            cache.clear()
+
+    def stats(self) -> dict:
+        """Counters for all Layer 1 caches."""
+        return {
+            "enabled": settings.layer1_cache_enabled,
+            "caches": [cache.stats() for cache in (self.persona, self.notams, self.session, self.prompt)]
+        }
+
+
+def evict_on_change(event: dict):
+    """Change bus handler: evict entries written by any worker."""
+    cache = get_context_cache()
+    if event.get("op") == "resync":
+        cache.clear()
+        return
+
+    user_id = event.get("user_id")
+    table = event.get("table")
+    if not user_id:
+        # Broadcast NOTAM changes are not tied to one user
+        if table == "notams":
+            cache.invalidate_all_notams()
+        return
+    if table == "personas":
+        cache.invalidate_persona(user_id)
+    elif table == "notams":
+        cache.invalidate_notams(user_id)
+    elif table == "sessions":
+        cache.invalidate_sessions(user_id)
+
+
+# Singleton instance
+_context_cache: Optional[ContextCache] = None
+
+
+def get_context_cache() -> ContextCache:
+    """Get or create Layer 1 cache singleton."""
+    global _context_cache
+    if _context_cache is None:
+        _context_cache = ContextCache()
+    return _context_cache
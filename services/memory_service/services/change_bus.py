@@ -0,0 +1,239 @@
+"""
+Change Bus - Change events and cache invalidation over PostgreSQL LISTEN/NOTIFY
+
+Write paths publish (table, user_id, op, data) with pg_notify once their
+change is committed. Every worker holds one dedicated asyncpg connection that
+LISTENs on the channel, runs registered handlers (cross-worker cache
+eviction) and fans events out to in-process subscribers (the /events SSE
+streams). Events are best-effort: after a reconnect, handlers and
+subscribers receive a "resync" event and must drop or refetch their state.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime, timezone
+import asyncio
+import json
+import logging
+
+import asyncpg
+
+from ..config import get_settings
+from ..database import get_asyncpg_dsn, mark_user_write
+from .single_flight import forget_on_change
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# pg_notify payloads must stay below 8000 bytes
+PAYLOAD_LIMIT = 7900
+
+# Handler registered for ALL_TABLES sees every event, including "resync"
+ALL_TABLES = "*"
+ChangeHandler = Callable[[dict], None]
+
+
+def _make_event(table: str, user_id: Optional[str], op: str, data: Any = None) -> dict:
+    """Event envelope shared by published and synthetic events."""
+    return {
+        "table": table,
+        "user_id": user_id,
+        "op": op,
+        "data": data,
+        "at": datetime.now(timezone.utc).isoformat()
+    }
+
+
+async def publish_change(
+    db: AsyncSession,
+    table: str,
+    user_id: Optional[str],
+    op: str,
+    data: Any = None
+):
+    """
+    Publish a committed change to every worker. Never raises.
+
+    Call after the write is committed; the notify is sent in its own
+    transaction. user_id None marks a change visible to every user. Data
+    larger than the payload limit is dropped and the event is flagged
+    `truncated` so consumers refetch instead. Also pins the user's reads to
+    the primary (read-your-writes) and stops later reads joining this
+    worker's in-flight ones.
+    """
+    mark_user_write(user_id)
+    forget_on_change({"user_id": user_id, "op": op})
+    if not settings.change_events_enabled:
+        return
+
+    event = _make_event(table, user_id, op, data)
+    payload = json.dumps(event, default=str)
+    if len(payload.encode("utf-8")) > PAYLOAD_LIMIT:
+        event["data"] = None
+        event["truncated"] = True
+        payload = json.dumps(event, default=str)
+
+    try:
+        await db.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": settings.change_events_channel, "payload": payload}
+        )
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        logger.warning(f"Failed to publish {table} change for user {user_id}: {e}")
+
+
+class ChangeBus:
+    """Per-worker LISTEN connection feeding change handlers and subscribers."""
+
+    def __init__(self, channel: Optional[str] = None):
+        """Initialize change bus."""
+        self.channel = channel or settings.change_events_channel
+        self.connected = False
+        self.received = 0
+        self.overflows = 0
+        self.reconnects = 0
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._handlers: Dict[str, List[ChangeHandler]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def add_handler(self, table: str, handler: ChangeHandler):
+        """Run handler(event) for every event on table (or ALL_TABLES)."""
+        self._handlers.setdefault(table, []).append(handler)
+
+    def subscribe(self, user_id: str) -> asyncio.Queue:
+        """Register a queue receiving events for one user."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=settings.change_events_queue_size)
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, user_id: str, queue: asyncio.Queue):
+        """Remove a subscriber queue."""
+        queues = self._subscribers.get(user_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[user_id]
+
+    def start(self):
+        """Start the listener loop on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="change-bus")
+
+    async def stop(self):
+        """Stop the listener loop and close its connection."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self):
+        """Keep a LISTEN connection open, reconnecting on failure."""
+        was_connected = False
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(get_asyncpg_dsn())
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _: lost.set())
+                await conn.add_listener(self.channel, self._on_notify)
+                self.connected = True
+                logger.info(f"Listening for change events on '{self.channel}'")
+
+                # Events may have been missed while disconnected
+                if was_connected:
+                    self.reconnects += 1
+                    resync = _make_event(ALL_TABLES, None, "resync")
+                    self._run_handlers(resync)
+                    self._dispatch_all(resync)
+                was_connected = True
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), timeout=settings.change_events_heartbeat_seconds)
+                    except asyncio.TimeoutError:
+                        await conn.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Change bus connection failed: {e}")
+            finally:
+                self.connected = False
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(settings.change_events_reconnect_seconds)
+
+    def _on_notify(self, connection, pid, channel, payload: str):
+        """asyncpg listener callback."""
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed change event: {payload[:200]}")
+            return
+        self.received += 1
+        self._run_handlers(event)
+        self._dispatch(event)
+
+    def _run_handlers(self, event: dict):
+        """Run handlers for the event's table and for ALL_TABLES."""
+        handlers = self._handlers.get(ALL_TABLES, [])
+        if event.get("table") != ALL_TABLES:
+            handlers = self._handlers.get(event.get("table"), []) + handlers
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.warning(f"Change handler failed for {event.get('table')} event: {e}")
+
+    def _dispatch(self, event: dict):
+        """Deliver an event to the subscribers of its user (or all, for broadcasts)."""
+        if event.get("user_id") is None:
+            self._dispatch_all(event)
+            return
+        for queue in list(self._subscribers.get(event.get("user_id"), ())):
+            self._offer(queue, event)
+
+    def _dispatch_all(self, event: dict):
+        """Deliver an event to every subscriber."""
+        for queues in list(self._subscribers.values()):
+            for queue in list(queues):
+                self._offer(queue, event)
+
+    def _offer(self, queue: asyncio.Queue, event: dict):
+        """Enqueue without blocking; a full queue is replaced by a resync."""
+        try:
+            queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflows += 1
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(_make_event(ALL_TABLES, event.get("user_id"), "resync"))
+
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "channel": self.channel,
+            "connected": self.connected,
+            "subscribers": sum(len(queues) for queues in self._subscribers.values()),
+            "received": self.received,
+            "overflows": self.overflows,
+            "reconnects": self.reconnects
+        }
+
+
+# Singleton instance
+_change_bus: Optional[ChangeBus] = None
+
+
+def get_change_bus() -> ChangeBus:
+    """Get or create change bus singleton."""
+    global _change_bus
+    if _change_bus is None:
+        _change_bus = ChangeBus()
+    return _change_bus
@@ -51,6 +51,11 @@ class EmbeddingService:
         self._model = None
         self.dimension = settings.embedding_dimension
 
+    @property
+    def is_loaded(self) -> bool:
+        """True when the transformer model is loaded (False: hash fallback)."""
+        return self._model is not None
+
     def embed(self, text: str) -> List[float]:
         """Generate embedding for single text."""
         if self._model is not None:
@@ -0,0 +1,168 @@
+"""
+Export Service - Streaming bulk export of a user's memories
+
+Rows are read through a server-side cursor (stream_results / yield_per), so
+the service holds one batch at a time whatever the export size. Output is
+NDJSON (one memory per line) or an Arrow IPC stream (one record batch per
+fetch batch); pyarrow is optional and only needed for Arrow.
+"""
+
+from typing import AsyncIterator, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from datetime import datetime
+import io
+import json
+import logging
+
+from ..config import get_settings
+from ..models import ArchivedMemory, Memory
+from .serialization import dumps
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Optional Arrow output
+try:
+    import pyarrow as pa
+    ARROW_AVAILABLE = True
+except ImportError:
+    pa = None
+    ARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("ndjson", "arrow")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "arrow": "application/vnd.apache.arrow.stream"
+}
+
+# Exported columns (embedding is added on request)
+EXPORT_COLUMNS = [
+    "id", "user_id", "agent_id", "access_mode", "content", "memory_type", "importance",
+    "extra_data", "source_conversation_id", "created_at", "accessed_at", "access_count"
+]
+
+
+def _embedding_list(value) -> Optional[List[float]]:
+    """pgvector value (list, numpy array or Vector) as a list of floats."""
+    if value is None:
+        return None
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    if hasattr(value, "to_list"):
+        return value.to_list()
+    return list(value)
+
+
+class MemoryExporter:
+    """Streams one user's memories, hot tier then (optionally) cold tier."""
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        user_id: str,
+        agent_id: Optional[str] = None,
+        memory_type: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        include_embeddings: bool = False,
+        include_archived: bool = False,
+        batch_size: Optional[int] = None
+    ):
+        """Initialize memory exporter."""
+        self.session = session
+        self.user_id = user_id
+        self.agent_id = agent_id
+        self.memory_type = memory_type
+        self.created_after = created_after
+        self.created_before = created_before
+        self.include_embeddings = include_embeddings
+        self.include_archived = include_archived
+        self.batch_size = batch_size or settings.export_batch_size
+        self.exported = 0
+
+    def _query(self, model):
+        """Filtered select on one tier, in (created_at, id) order."""
+        columns = [getattr(model, name) for name in EXPORT_COLUMNS]
+        if self.include_embeddings:
+            columns.append(model.embedding)
+        query = select(*columns).where(model.user_id == self.user_id)
+        if self.agent_id:
+            query = query.where(model.agent_id == self.agent_id)
+        if self.memory_type:
+            query = query.where(model.memory_type == self.memory_type)
+        if self.created_after:
+            query = query.where(model.created_at >= self.created_after)
+        if self.created_before:
+            query = query.where(model.created_at < self.created_before)
+        return query.order_by(model.created_at, model.id).execution_options(yield_per=self.batch_size)
+
+    async def batches(self) -> AsyncIterator[List[dict]]:
+        """Yield lists of row dicts, one fetch batch at a time."""
+        tiers = [("hot", Memory)]
+        if self.include_archived:
+            tiers.append(("cold", ArchivedMemory))
+
+        for tier, model in tiers:
+            result = await self.session.stream(self._query(model))
+            async for partition in result.partitions():
+                batch = []
+                for row in partition:
+                    record = {name: getattr(row, name) for name in EXPORT_COLUMNS}
+                    record["id"] = str(record["id"])
+                    record["metadata"] = record.pop("extra_data") or {}
+                    record["tier"] = tier
+                    if self.include_embeddings:
+                        record["embedding"] = _embedding_list(row.embedding)
+                    batch.append(record)
+                self.exported += len(batch)
+                yield batch
+
+        logger.info(f"Exported {self.exported} memories for user {self.user_id}")
+
+    async def ndjson(self) -> AsyncIterator[bytes]:
+        """NDJSON: one memory per line, flushed per batch."""
+        async for batch in self.batches():
+            yield b"".join(dumps(record) + b"\n" for record in batch)
+
+    def arrow_schema(self):
+        """Arrow schema of the export (embedding as fixed-size float32 list)."""
+        fields = [
+            pa.field("id", pa.string()),
+            pa.field("user_id", pa.string()),
+            pa.field("agent_id", pa.string()),
+            pa.field("access_mode", pa.string()),
+            pa.field("content", pa.string()),
+            pa.field("memory_type", pa.string()),
+            pa.field("importance", pa.float64()),
+            pa.field("metadata", pa.string()),  # JSON text
+            pa.field("source_conversation_id", pa.string()),
+            pa.field("created_at", pa.timestamp("us", tz="UTC")),
+            pa.field("accessed_at", pa.timestamp("us", tz="UTC")),
+            pa.field("access_count", pa.int64()),
+            pa.field("tier", pa.string())
+        ]
+        if self.include_embeddings:
+            fields.append(pa.field("embedding", pa.list_(pa.float32(), settings.embedding_dimension)))
+        return pa.schema(fields)
+
+    async def arrow(self) -> AsyncIterator[bytes]:
+        """Arrow IPC stream: schema, then one record batch per fetch batch."""
+        schema = self.arrow_schema()
+        sink = io.BytesIO()
+        writer = pa.ipc.new_stream(sink, schema)
+
+        def drain() -> bytes:
+            data = sink.getvalue()
+            sink.seek(0)
+            sink.truncate(0)
+            return data
+
+        async for batch in self.batches():
+            for record in batch:
+                record["metadata"] = json.dumps(record["metadata"], default=str)
+            writer.write_batch(pa.RecordBatch.from_pylist(batch, schema=schema))
+            yield drain()
+
+        writer.close()
+        yield drain()
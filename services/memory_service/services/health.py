@@ -0,0 +1,171 @@
+"""
+Health Prober - Component status refreshed in the background
+
+Orchestrator probes can hit every pod many times per second. Instead of a
+database round trip per probe, a background task checks the database,
+connection pool, read replicas and embedder on an interval; /health,
+/health/live and /health/ready only read the cached result.
+"""
+
+from typing import Dict, Optional
+from sqlalchemy import text
+from datetime import datetime, timezone
+import asyncio
+import time
+import logging
+
+from ..config import get_settings
+from ..database import engine, get_replica_router, pool_stats
+from .embedder import EmbeddingService, get_embedding_service
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Components that must be healthy for the service to take traffic
+REQUIRED_COMPONENTS = ("database", "embedder")
+
+
+def _elapsed_ms(start: float) -> float:
+    """Milliseconds since a perf_counter() start."""
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+class HealthProber:
+    """Runs component checks and keeps the last result."""
+
+    def __init__(self):
+        """Initialize health prober."""
+        self.components: Dict[str, dict] = {}
+        self.checked_at: Optional[datetime] = None
+        self._checked_monotonic: Optional[float] = None
+        self._pool_timeouts = 0
+        self._embedder: Optional[EmbeddingService] = None  # Set once a startup embed succeeded
+
+    async def probe(self):
+        """Check every component and store the result. Never raises."""
+        components = {
+            "database": await self._check_database(),
+            "pool": self._check_pool(),
+            "embedder": await self._check_embedder()
+        }
+        replicas = get_replica_router()
+        if replicas.engines:
+            healthy = sum(replicas.healthy)
+            components["replicas"] = {
+                "healthy": healthy > 0,
+                "in_rotation": healthy,
+                "total": len(replicas.engines)
+            }
+
+        previous = {name for name, component in self.components.items() if not component["healthy"]}
+        failed = {name for name, component in components.items() if not component["healthy"]}
+        if failed != previous:
+            if failed:
+                logger.warning(f"Health probe: unhealthy components {sorted(failed)}")
+            else:
+                logger.info("Health probe: all components healthy")
+
+        self.components = components
+        self.checked_at = datetime.now(timezone.utc)
+        self._checked_monotonic = time.monotonic()
+
+    async def _check_database(self) -> dict:
+        """SELECT 1 on the primary, bounded by the probe timeout."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._ping(), timeout=settings.health_probe_timeout_seconds)
+            return {"healthy": True, "latency_ms": _elapsed_ms(start)}
+        except Exception as e:
+            error = "timeout" if isinstance(e, asyncio.TimeoutError) else f"{type(e).__name__}: {e}"
+            return {"healthy": False, "latency_ms": _elapsed_ms(start), "error": error}
+
+    async def _ping(self):
+        """One round trip on a pooled connection."""
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    def _check_pool(self) -> dict:
+        """Pool counters; unhealthy when checkouts timed out since the last probe."""
+        stats = pool_stats(engine)
+        timeouts = stats.get("timeouts", 0)
+        healthy = timeouts <= self._pool_timeouts
+        self._pool_timeouts = timeouts
+        return {"healthy": healthy, **stats}
+
+    async def _check_embedder(self) -> dict:
+        """
+        Embed a short text once, off the event loop (this loads the model);
+        later probes only report the loaded model instead of embedding again.
+        """
+        start = time.perf_counter()
+        try:
+            embedder = self._embedder
+            if embedder is None:
+                embedder = await asyncio.to_thread(get_embedding_service)
+                vector = await asyncio.to_thread(embedder.embed, "health check")
+                if len(vector) != embedder.dimension:
+                    return {
+                        "healthy": False,
+                        "latency_ms": _elapsed_ms(start),
+                        "error": f"Embedding has {len(vector)} dimensions, expected {embedder.dimension}"
+                    }
+                self._embedder = embedder
+            return {
+                "healthy": True,
+                "latency_ms": _elapsed_ms(start),
+                "model": embedder.model_name if embedder.is_loaded else "fallback",
+                "dimension": embedder.dimension
+            }
+        except Exception as e:
+            return {"healthy": False, "latency_ms": _elapsed_ms(start), "error": f"{type(e).__name__}: {e}"}
+
+    @property
+    def stale(self) -> bool:
+        """No probe result, or the prober stopped refreshing it."""
+        if self._checked_monotonic is None:
+            return True
+        max_age = max(3 * settings.health_probe_interval_seconds, settings.health_probe_timeout_seconds * 2)
+        return time.monotonic() - self._checked_monotonic > max_age
+
+    @property
+    def ready(self) -> bool:
+        """Required components healthy in a fresh probe."""
+        return not self.stale and all(
+            self.components.get(name, {}).get("healthy") for name in REQUIRED_COMPONENTS
+        )
+
+    def status(self) -> dict:
+        """Cached status: healthy, degraded (optional component down), unhealthy or starting."""
+        if self.checked_at is None:
+            overall = "starting"
+        elif not self.ready:
+            overall = "unhealthy"
+        elif all(component["healthy"] for component in self.components.values()):
+            overall = "healthy"
+        else:
+            overall = "degraded"
+
+        return {
+            "status": overall,
+            "ready": self.ready,
+            "stale": self.stale,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+            "components": self.components
+        }
+
+
+# Singleton instance
+_health_prober: Optional[HealthProber] = None
+
+
+def get_health_prober() -> HealthProber:
+    """Get or create health prober singleton."""
+    global _health_prober
+    if _health_prober is None:
+        _health_prober = HealthProber()
+    return _health_prober
+
+
+async def run_health_probe_job():
+    """Background job: refresh cached health status."""
+    await get_health_prober().probe()
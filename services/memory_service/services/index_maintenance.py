@@ -0,0 +1,358 @@
+"""
+Index Maintenance Service - Health tracking and retraining of vector indexes
+
+ivfflat clusters are trained once, at CREATE INDEX time. As `memories` grows
+the initial `lists` value drifts away from what the data needs and recall
+drops. This service measures that drift (row counts vs lists, sampled recall)
+and, inside a configured low-traffic window, re-sizes and rebuilds the indexes
+with REINDEX CONCURRENTLY, runs VACUUM ANALYZE and optionally CLUSTERs by user.
+
+Every worker runs the scheduler, so a run holds a PostgreSQL advisory lock and
+the manual VACUUM it ends with (pg_stat_user_tables.last_vacuum) marks the
+window as done for all workers.
+"""
+
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime, time as dt_time, timedelta, timezone
+import asyncio
+import math
+import re
+import time
+import logging
+
+from ..config import get_settings
+from ..database import engine, get_db_context
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# pg_try_advisory_lock key: one maintenance run at a time across all workers
+MAINTENANCE_LOCK_KEY = 7_342_001
+
+# Results of the most recent maintenance run (shown by /admin/indexes)
+_state = {
+    "running": False,
+    "last_run_at": None,
+    "last_window_date": None,
+    "last_recall": None,
+    "last_actions": [],
+    "last_error": None
+}
+
+# Background run started by POST /admin/indexes/maintenance
+_task: Optional[asyncio.Task] = None
+
+
+def recommended_lists(rows: int) -> int:
+    """pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond."""
+    if rows <= 1_000_000:
+        return max(10, rows // 1000)
+    return int(math.sqrt(rows))
+
+
+def parse_window(window: str):
+    """Parse 'HH:MM-HH:MM' into (start, end) times."""
+    match = re.fullmatch(r"\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*", window or "")
+    if not match:
+        raise ValueError(f"Invalid maintenance window: {window!r} (expected HH:MM-HH:MM)")
+    h1, m1, h2, m2 = (int(g) for g in match.groups())
+    return dt_time(h1, m1), dt_time(h2, m2)
+
+
+def window_started_at(now: datetime, window: Optional[str] = None) -> datetime:
+    """Start (UTC) of the most recent window opening at or before `now`."""
+    start, _ = parse_window(window or settings.maintenance_window)
+    opened = now.replace(hour=start.hour, minute=start.minute, second=0, microsecond=0)
+    if opened > now:
+        opened -= timedelta(days=1)
+    return opened
+
+
+def in_maintenance_window(now: Optional[datetime] = None, window: Optional[str] = None) -> bool:
+    """Check whether `now` (UTC) falls inside the window; windows may wrap midnight."""
+    now = now or datetime.now(timezone.utc)
+    start, end = parse_window(window or settings.maintenance_window)
+    current = now.time().replace(tzinfo=None)
+    if start <= end:
+        return start <= current < end
+    return current >= start or current < end
+
+
+class IndexMaintenanceService:
+    """Inspects and maintains the ivfflat indexes on memories."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize index maintenance service."""
+        self.session = session
+
+    async def index_status(self) -> List[dict]:
+        """
+        Status of every ivfflat leaf index on memories (one per partition
+        when the table is partitioned).
+        """
+        result = await self.session.execute(text("""
+            SELECT
+                i.relname AS index_name,
+                t.relname AS table_name,
+                COALESCE(
+                    (SELECT split_part(opt, '=', 2)::int
+                     FROM unnest(i.reloptions) AS opt
+                     WHERE opt LIKE 'lists=%'),
+                    100
+                ) AS lists,
+                GREATEST(t.reltuples, 0)::bigint AS estimated_rows,
+                COALESCE(s.n_live_tup, 0) AS live_rows,
+                COALESCE(s.n_dead_tup, 0) AS dead_rows,
+                pg_relation_size(i.oid) AS index_bytes,
+                s.last_vacuum, s.last_autovacuum, s.last_analyze, s.last_autoanalyze
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            JOIN pg_am am ON am.oid = i.relam
+            LEFT JOIN pg_stat_user_tables s ON s.relid = t.oid
+            WHERE am.amname = 'ivfflat'
+              AND i.relkind = 'i'
+              AND (
+                  t.relname = 'memories'
+                  OR t.oid IN (
+                      SELECT inhrelid FROM pg_inherits
+                      WHERE inhparent = 'memories'::regclass
+                  )
+              )
+            ORDER BY t.relname
+        """))
+
+        statuses = []
+        for row in result.fetchall():
+            rows = max(row.live_rows, row.estimated_rows)
+            target = recommended_lists(rows)
+            drift = max(row.lists, target) / max(min(row.lists, target), 1)
+            last_vacuum = max(filter(None, [row.last_vacuum, row.last_autovacuum]), default=None)
+            last_analyze = max(filter(None, [row.last_analyze, row.last_autoanalyze]), default=None)
+            statuses.append({
+                "index_name": row.index_name,
+                "table_name": row.table_name,
+                "lists": row.lists,
+                "recommended_lists": target,
+                "lists_drift": round(drift, 2),
+                "needs_reindex": drift > settings.maintenance_lists_drift_ratio,
+                "rows": rows,
+                "dead_rows": row.dead_rows,
+                "index_bytes": row.index_bytes,
+                "last_vacuum": last_vacuum,
+                "last_analyze": last_analyze
+            })
+        return statuses
+
+    async def estimate_recall(
+        self,
+        sample_size: Optional[int] = None,
+        k: Optional[int] = None
+    ) -> Optional[float]:
+        """
+        Estimate recall@k of the vector index.
+
+        Samples stored embeddings as queries and compares the ivfflat top-k
+        against an exact scan with index scans disabled. Queries run over the
+        whole table: with a user_id filter the planner may use the btree
+        index instead, and the "approximate" result would be exact.
+        Returns None when there is nothing to sample.
+        """
+        sample_size = sample_size or settings.maintenance_recall_sample_size
+        k = k or settings.maintenance_recall_k
+
+        # BERNOULLI sampling avoids a full-table ORDER BY random()
+        count_result = await self.session.execute(
+            text("""
+                SELECT SUM(GREATEST(reltuples, 0))::bigint AS rows
+                FROM pg_class
+                WHERE oid = 'memories'::regclass
+                   OR oid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = 'memories'::regclass)
+            """)
+        )
+        rows = count_result.scalar() or 0
+        percent = 100.0 if rows <= 0 else min(100.0, sample_size * 20 * 100.0 / rows)
+
+        sample_result = await self.session.execute(
+            text(f"""
+                SELECT embedding::text AS embedding
+                FROM memories TABLESAMPLE BERNOULLI ({percent:.6f})
+                WHERE embedding IS NOT NULL
+                LIMIT :sample_size
+            """),
+            {"sample_size": sample_size}
+        )
+        samples = sample_result.fetchall()
+        await self.session.rollback()
+        if not samples:
+            return None
+
+        # Embedding passed as text and cast server-side (no asyncpg vector codec needed)
+        knn_sql = text("""
+            SELECT id FROM memories
+            ORDER BY embedding <=> CAST(CAST(:embedding AS TEXT) AS vector)
+            LIMIT :k
+        """)
+
+        hits = 0
+        expected = 0
+        for sample in samples:
+            params = {"embedding": sample.embedding, "k": k}
+            # ivfflat is the only index serving this ORDER BY; no seq scan fallback
+            await self.session.execute(text("SET LOCAL enable_seqscan = off"))
+            approx = {row.id for row in (await self.session.execute(knn_sql, params)).fetchall()}
+            await self.session.rollback()
+
+            await self.session.execute(text("SET LOCAL enable_indexscan = off"))
+            exact = {row.id for row in (await self.session.execute(knn_sql, params)).fetchall()}
+            await self.session.rollback()
+
+            hits += len(approx & exact)
+            expected += len(exact)
+
+        recall = hits / expected if expected else None
+        _state["last_recall"] = {
+            "recall": recall,
+            "k": k,
+            "samples": len(samples),
+            "measured_at": datetime.now(timezone.utc)
+        }
+        return recall
+
+
+async def _run_autocommit(statement: str):
+    """Run a statement that cannot run inside a transaction block."""
+    async with engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        start = time.time()
+        await conn.execute(text(statement))
+        elapsed = time.time() - start
+    logger.info(f"Maintenance: {statement} ({elapsed:.1f}s)")
+    return {"statement": statement, "seconds": round(elapsed, 2)}
+
+
+async def _last_manual_vacuum(conn) -> Optional[datetime]:
+    """Latest manual VACUUM of memories (or any of its partitions)."""
+    result = await conn.execute(text("""
+        SELECT MAX(last_vacuum) FROM pg_stat_user_tables
+        WHERE relid = 'memories'::regclass
+           OR relid IN (SELECT inhrelid FROM pg_inherits WHERE inhparent = 'memories'::regclass)
+    """))
+    return result.scalar()
+
+
+async def run_maintenance(force: bool = False) -> List[dict]:
+    """
+    Re-size/rebuild drifted or low-recall indexes, then VACUUM ANALYZE
+    (and optionally CLUSTER by user). Runs at most once per window per day
+    across all workers unless `force` is set; skipped while another worker
+    holds the maintenance lock.
+    """
+    now = datetime.now(timezone.utc)
+    if not force:
+        if not in_maintenance_window(now):
+            return []
+        if _state["last_window_date"] == now.date():
+            return []
+
+    # Session-level advisory lock on a dedicated connection, held for the whole run
+    async with engine.connect() as lock_conn:
+        lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+        locked = (await lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+        )).scalar()
+        if not locked:
+            logger.info("Maintenance: another worker holds the maintenance lock - skipping")
+            if force:
+                _state["last_error"] = "Another worker is running maintenance"
+            return []
+
+        try:
+            if not force:
+                last_vacuum = await _last_manual_vacuum(lock_conn)
+                if last_vacuum and last_vacuum >= window_started_at(now):
+                    # Another worker already finished this window
+                    _state["last_window_date"] = now.date()
+                    return []
+            return await _maintain(now)
+        finally:
+            await lock_conn.execute(
+                text("SELECT pg_advisory_unlock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+            )
+
+
+async def _maintain(now: datetime) -> List[dict]:
+    """The maintenance run itself; actions are published to _state as they finish."""
+    _state["running"] = True
+    _state["last_error"] = None
+    _state["last_actions"] = actions = []
+    try:
+        return await _maintain_indexes(actions)
+    except Exception as e:
+        _state["last_error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _state["running"] = False
+        _state["last_run_at"] = now
+        _state["last_window_date"] = now.date()
+
+
+async def _maintain_indexes(actions: List[dict]) -> List[dict]:
+    """Rebuild drifted/low-recall indexes, VACUUM ANALYZE, optional CLUSTER."""
+    async with get_db_context() as session:
+        service = IndexMaintenanceService(session)
+        statuses = await service.index_status()
+        recall = await service.estimate_recall()
+
+    low_recall = recall is not None and recall < settings.maintenance_min_recall
+
+    for status in statuses:
+        if not (status["needs_reindex"] or low_recall):
+            continue
+        index = status["index_name"]
+        lists = status["recommended_lists"]
+        actions.append(await _run_autocommit(f'ALTER INDEX "{index}" SET (lists = {lists})'))
+        actions.append(await _run_autocommit(f'REINDEX INDEX CONCURRENTLY "{index}"'))
+
+    actions.append(await _run_autocommit("VACUUM (ANALYZE) memories"))
+
+    if settings.maintenance_cluster_enabled:
+        # Takes an ACCESS EXCLUSIVE lock; only enabled for windows with no traffic
+        actions.append(await _run_autocommit("CLUSTER memories USING idx_memories_agent"))
+
+    return actions
+
+
+def start_maintenance() -> bool:
+    """
+    Start a forced maintenance run in the background.
+
+    Returns False if this worker already has one running. Progress shows
+    up in get_maintenance_state() (running, last_actions, last_error).
+    """
+    global _task
+    if _task is not None and not _task.done():
+        return False
+
+    async def run():
+        try:
+            await run_maintenance(force=True)
+        except Exception as e:
+            logger.error(f"Index maintenance failed: {e}")
+
+    _task = asyncio.create_task(run())
+    return True
+
+
+def get_maintenance_state() -> dict:
+    """Last (or current) maintenance run, for reporting."""
+    state = dict(_state)
+    state["last_actions"] = list(state["last_actions"])
+    return state
+
+
+async def run_index_maintenance_job():
+    """Background job: index maintenance during the low-traffic window."""
+    await run_maintenance()
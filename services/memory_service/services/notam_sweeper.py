@@ -0,0 +1,99 @@
+"""
+NOTAM Sweeper - Bulk-deactivates expired NOTAMs
+
+Reads already filter on expires_at, but expired rows would otherwise stay in
+the active partial index forever. The sweeper flips them to inactive in
+batches so the active set (and idx_notams_active_rank) stays small. Expired
+broadcast NOTAMs are deactivated the same way.
+"""
+
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+import logging
+
+from ..config import get_settings
+from ..database import get_db_context
+from .cache import get_context_cache
+from .change_bus import publish_change
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+DEACTIVATE_EXPIRED_SQL = text("""
+    UPDATE notams SET active = false
+    WHERE id IN (
+        SELECT id FROM notams
+        WHERE active = true
+          AND expires_at IS NOT NULL
+          AND expires_at <= NOW()
+        LIMIT :batch_size
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, user_id
+""")
+
+DEACTIVATE_EXPIRED_BROADCASTS_SQL = text("""
+    UPDATE broadcast_notams SET active = false
+    WHERE active = true
+      AND expires_at IS NOT NULL
+      AND expires_at <= NOW()
+    RETURNING id
+""")
+
+
+class NotamSweeper:
+    """Deactivates expired NOTAMs."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize NOTAM sweeper."""
+        self.session = session
+
+    async def sweep(self, batch_size: Optional[int] = None) -> int:
+        """
+        Deactivate every expired NOTAM, one committed batch at a time.
+
+        Returns:
+            Number of NOTAMs deactivated
+        """
+        batch_size = batch_size or settings.notam_sweep_batch_size
+        total = 0
+        expired: Dict[str, List[str]] = {}
+
+        while True:
+            result = await self.session.execute(DEACTIVATE_EXPIRED_SQL, {"batch_size": batch_size})
+            rows = result.all()
+            await self.session.commit()
+
+            total += len(rows)
+            for row in rows:
+                expired.setdefault(row.user_id, []).append(str(row.id))
+            if len(rows) < batch_size:
+                break
+
+        cache = get_context_cache()
+        for user_id, notam_ids in expired.items():
+            cache.invalidate_notams(user_id)
+            await publish_change(self.session, "notams", user_id, "expired", {"ids": notam_ids})
+
+        # Broadcasts are few (stored once), one statement is enough
+        result = await self.session.execute(DEACTIVATE_EXPIRED_BROADCASTS_SQL)
+        broadcast_ids = [str(notam_id) for notam_id in result.scalars().all()]
+        await self.session.commit()
+        if broadcast_ids:
+            cache.invalidate_all_notams()
+            await publish_change(self.session, "notams", None, "expired", {"ids": broadcast_ids})
+
+        total += len(broadcast_ids)
+        if total:
+            logger.info(
+                f"Deactivated {total} expired NOTAMs for {len(expired)} users "
+                f"({len(broadcast_ids)} broadcasts)"
+            )
+        return total
+
+
+async def run_notam_sweep_job():
+    """Background job: deactivate expired NOTAMs."""
+    async with get_db_context() as session:
+        await NotamSweeper(session).sweep()
@@ -0,0 +1,63 @@
+"""
+Pagination - Opaque keyset cursors
+
+A cursor encodes the sort key of the last row of a page. The next page
+starts strictly after that key (a row comparison served by a composite
+index), so page 1000 costs the same as page 1 and rows inserted meanwhile
+do not shift later pages. Cursors travel in the X-Next-Cursor header so
+list bodies keep their schema.
+"""
+
+from typing import Any, Callable, Sequence, Tuple
+from fastapi import HTTPException, status
+from datetime import datetime
+from uuid import UUID
+import base64
+import binascii
+import json
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Key parsers per listing: values are decoded in sort-key order
+MEMORY_CURSOR_KEY = (datetime.fromisoformat, UUID)  # created_at, id
+NOTAM_CURSOR_KEY = (int, datetime.fromisoformat, UUID)  # priority_rank, created_at, id
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque, URL-safe cursor for a sort key."""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[str], Any]]) -> Tuple:
+    """
+    Sort key from a cursor.
+
+    Raises:
+        HTTPException 400 if the cursor is malformed or for another listing
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("wrong key length")
+        if not all(isinstance(value, str) for value in values):
+            raise ValueError("key values must be strings")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def next_cursor_headers(rows: list, limit: int, key: Callable[[Any], Tuple]) -> dict:
+    """
+    Trim a limit + 1 fetch to the page and build the next-cursor header.
+
+    Removes the extra row from `rows` in place; no header on the last page.
+    """
+    if len(rows) <= limit:
+        return {}
+    del rows[limit:]
+    return {NEXT_CURSOR_HEADER: encode_cursor(*key(rows[-1]))}
@@ -0,0 +1,159 @@
+"""
+Persona Service - Single-statement persona writes with JSONB merge
+
+Updates merge traits / preferences / style inside PostgreSQL (`||` for a
+shallow merge, jsonb_deep_merge() for a recursive one) and can delete keys
+with `#-`, so concurrent updates from different agents compose instead of
+overwriting each other. Every write is one statement with RETURNING.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+import json
+import logging
+
+from ..config import get_settings
+from ..schemas.responses import PersonaResponse
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+JSONB_FIELDS = ("traits", "preferences", "style")
+
+RETURNING_SQL = """
+    RETURNING id, user_id, name,
+              COALESCE(traits, '{}'::jsonb) AS traits,
+              COALESCE(preferences, '{}'::jsonb) AS preferences,
+              COALESCE(style, '{}'::jsonb) AS style,
+              created_at, updated_at
+"""
+
+
+def _persona_response(row) -> PersonaResponse:
+    """Build response from a RETURNING row."""
+    return PersonaResponse(
+        id=str(row.id),
+        user_id=row.user_id,
+        name=row.name,
+        traits=row.traits,
+        preferences=row.preferences,
+        style=row.style,
+        created_at=row.created_at,
+        updated_at=row.updated_at
+    )
+
+
+class PersonaService:
+    """Persona create / update / upsert in one round trip each."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize persona service."""
+        self.session = session
+
+    async def create(
+        self,
+        user_id: str,
+        name: Optional[str] = None,
+        patches: Optional[Dict[str, dict]] = None
+    ) -> Optional[PersonaResponse]:
+        """
+        Insert a new persona.
+
+        Returns:
+            The persona, or None if one already exists for the user
+        """
+        patches = patches or {}
+        params = {"user_id": user_id, "name": name}
+        params.update({field: json.dumps(patches.get(field) or {}) for field in JSONB_FIELDS})
+
+        result = await self.session.execute(
+            text(f"""
+                INSERT INTO personas (user_id, name, traits, preferences, style, created_at, updated_at)
+                VALUES (
+                    :user_id, :name,
+                    CAST(:traits AS JSONB), CAST(:preferences AS JSONB), CAST(:style AS JSONB),
+                    NOW(), NOW()
+                )
+                ON CONFLICT (user_id) DO NOTHING
+                {RETURNING_SQL}
+            """),
+            params
+        )
+        row = result.one_or_none()
+        await self.session.commit()
+        return _persona_response(row) if row else None
+
+    async def update(
+        self,
+        user_id: str,
+        name: Optional[str] = None,
+        patches: Optional[Dict[str, dict]] = None,
+        unset: Optional[Dict[str, List[str]]] = None,
+        deep: bool = False,
+        upsert: bool = False
+    ) -> Tuple[Optional[PersonaResponse], bool]:
+        """
+        Merge patches into a persona atomically.
+
+        Args:
+            patches: {field: dict} merged into traits / preferences / style
+            unset: {field: [key paths]} to delete; nested paths use dots ("editor.theme")
+            deep: Recursively merge nested objects instead of replacing them
+            upsert: Insert the persona when it does not exist
+
+        Returns:
+            Tuple of (persona or None if not found, created)
+        """
+        patches = {field: patch for field, patch in (patches or {}).items() if patch is not None}
+        unset = unset or {}
+        params = {"user_id": user_id, "name": name}
+
+        assignments = ["name = COALESCE(CAST(:name AS VARCHAR), personas.name)"]
+        for field in JSONB_FIELDS:
+            if field not in patches and not unset.get(field):
+                continue
+
+            expr = f"COALESCE(personas.{field}, '{{}}'::jsonb)"
+            if field in patches:
+                params[field] = json.dumps(patches[field])
+                if deep:
+                    expr = f"jsonb_deep_merge({expr}, CAST(:{field} AS JSONB))"
+                else:
+                    expr = f"{expr} || CAST(:{field} AS JSONB)"
+            for i, path in enumerate(unset.get(field, [])):
+                param = f"{field}_unset_{i}"
+                params[param] = path.split(".")
+                expr = f"({expr} #- CAST(:{param} AS TEXT[]))"
+            assignments.append(f"{field} = {expr}")
+        assignments.append("updated_at = NOW()")
+        set_sql = ",\n                    ".join(assignments)
+
+        if upsert:
+            for field in JSONB_FIELDS:
+                params.setdefault(field, json.dumps(patches.get(field) or {}))
+            sql = f"""
+                INSERT INTO personas AS personas (user_id, name, traits, preferences, style, created_at, updated_at)
+                VALUES (
+                    :user_id, :name,
+                    CAST(:traits AS JSONB), CAST(:preferences AS JSONB), CAST(:style AS JSONB),
+                    NOW(), NOW()
+                )
+                ON CONFLICT (user_id) DO UPDATE SET
+                    {set_sql}
+                {RETURNING_SQL}, (xmax = 0) AS inserted
+            """
+        else:
+            sql = f"""
+                UPDATE personas SET
+                    {set_sql}
+                WHERE user_id = :user_id
+                {RETURNING_SQL}, false AS inserted
+            """
+
+        result = await self.session.execute(text(sql), params)
+        row = result.one_or_none()
+        await self.session.commit()
+        if row is None:
+            return None, False
+        return _persona_response(row), row.inserted
@@ -0,0 +1,108 @@
+"""
+Prompt Assembly - Pack Layer 1 context and Layer 2 memories into a token budget
+
+Sections are added in priority order: persona, NOTAMs (already priority
+ordered), last session, then memories by similarity. A line that does not fit
+the remaining budget is skipped, so one long memory cannot crowd out shorter,
+less similar ones. Tokens are estimated from characters; no tokenizer needed.
+"""
+
+from typing import List, Tuple
+import math
+
+from ..config import get_settings
+from ..models.memory import Memory
+from ..schemas.responses import ContextResponse
+
+settings = get_settings()
+
+OPEN_TAG = "<user_context>"
+CLOSE_TAG = "</user_context>"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (characters / prompt_chars_per_token)."""
+    return math.ceil(len(text) / settings.prompt_chars_per_token)
+
+
+class PromptPacker:
+    """Accumulates prompt lines while they fit in the token budget."""
+
+    def __init__(self, token_budget: int):
+        """Initialize packer; the closing tag is reserved up front."""
+        self.lines = [OPEN_TAG]
+        self.tokens = estimate_tokens(OPEN_TAG) + estimate_tokens(CLOSE_TAG)
+        self.token_budget = token_budget
+
+    def add(self, *lines: str) -> bool:
+        """Add lines together, or not at all when they exceed the budget."""
+        cost = sum(estimate_tokens(line) + 1 for line in lines)  # +1 for the newline
+        if self.tokens + cost > self.token_budget:
+            return False
+        self.lines.extend(lines)
+        self.tokens += cost
+        return True
+
+    def render(self) -> str:
+        """Final prompt section."""
+        return "\n".join(self.lines + [CLOSE_TAG])
+
+
+def assemble_prompt(
+    context: ContextResponse,
+    memories: List[Tuple[Memory, float]],
+    token_budget: int
+) -> dict:
+    """
+    Build a prompt section from Layer 1 context and search results.
+
+    Returns:
+        Dict with prompt_section, token_estimate, the ids of included
+        memories and counts of what was included or dropped.
+    """
+    packer = PromptPacker(token_budget)
+
+    persona_included = False
+    if context.persona:
+        persona = context.persona
+        persona_included = packer.add(f"User: {persona.name or context.user_id}")
+        if persona_included:
+            if persona.traits:
+                packer.add(f"Traits: {persona.traits}")
+            if persona.preferences:
+                packer.add(f"Preferences: {persona.preferences}")
+            if persona.style:
+                packer.add(f"Style: {persona.style}")
+
+    notams_included = 0
+    for notam in context.notams:
+        line = f"- [{notam.priority.upper()}] {notam.title}: {notam.content}"
+        header = ["\nNOTAMs (Important Notices):"] if notams_included == 0 else []
+        if packer.add(*header, line):
+            notams_included += 1
+
+    session_included = False
+    if context.last_session:
+        session_lines = [f"\nLast Activity: {context.last_session.last_query or 'None'}"]
+        if context.last_session.context:
+            session_lines.append(f"Context: {context.last_session.context}")
+        session_included = packer.add(*session_lines)
+
+    memory_ids = []
+    for memory, similarity in memories:
+        line = f"- [{memory.memory_type}] {memory.content}"
+        header = ["\nRelevant Memories:"] if not memory_ids else []
+        if packer.add(*header, line):
+            memory_ids.append(str(memory.id))
+
+    return {
+        "prompt_section": packer.render(),
+        "token_estimate": packer.tokens,
+        "token_budget": token_budget,
+        "persona_included": persona_included,
+        "notams_included": notams_included,
+        "notams_dropped": len(context.notams) - notams_included,
+        "session_included": session_included,
+        "memory_ids": memory_ids,
+        "memories_dropped": len(memories) - len(memory_ids)
+    }
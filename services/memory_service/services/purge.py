@@ -0,0 +1,182 @@
+"""
+Purge Service - Filtered bulk deletes and user (tenant) purge
+
+Deletes run in chunks of `bulk_delete_batch_size` rows, each one a
+`DELETE ... RETURNING id` committed on its own, with a short pause in
+between. Locks stay short and dead tuples arrive at a pace autovacuum and
+replicas can absorb, instead of one huge transaction.
+"""
+
+from typing import Dict, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime
+import asyncio
+import logging
+
+from ..config import get_settings
+from .cache import get_context_cache
+from .change_bus import publish_change
+from .session_tracker import get_session_tracker
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Per-user tables with an `id` key, purged in chunks
+CHUNKED_TABLES = ("memories", "memories_archive", "notams", "sessions")
+
+# Per-user tables that stay small, purged in one statement
+SMALL_TABLES = ("personas", "notam_acks", "notam_group_members", "memory_quotas")
+
+# Layer 1 tables whose caches other workers must evict after a purge
+EVENT_TABLES = ("personas", "notams", "sessions", "memories")
+
+
+class BulkDeleteService:
+    """Chunked deletes by filter."""
+
+    def __init__(self, session: AsyncSession, batch_size: Optional[int] = None):
+        """Initialize bulk delete service."""
+        self.session = session
+        self.batch_size = batch_size or settings.bulk_delete_batch_size
+        self.batches = 0
+
+    @staticmethod
+    def _memory_filter(
+        agent_id: Optional[str],
+        memory_type: Optional[str],
+        created_before: Optional[datetime]
+    ) -> Tuple[str, dict]:
+        """WHERE clause (after user_id) and params for a memory filter."""
+        clauses, params = [], {}
+        if agent_id:
+            clauses.append("agent_id = :agent_id")
+            params["agent_id"] = agent_id
+        if memory_type:
+            clauses.append("memory_type = :memory_type")
+            params["memory_type"] = memory_type
+        if created_before:
+            clauses.append("created_at < :created_before")
+            params["created_before"] = created_before
+        return "".join(f" AND {clause}" for clause in clauses), params
+
+    async def _delete_chunked(self, table: str, where: str, params: dict) -> int:
+        """
+        Delete matching rows in chunks, committing after each one.
+
+        `where` must filter on user_id so a partitioned table prunes to one
+        partition in both the subquery and the DELETE.
+        """
+        sql = text(f"""
+            DELETE FROM {table}
+            WHERE user_id = :user_id
+              AND id IN (
+                  SELECT id FROM {table}
+                  WHERE {where}
+                  LIMIT :batch_size
+              )
+            RETURNING id
+        """)
+        params = {**params, "batch_size": self.batch_size}
+
+        total = 0
+        while True:
+            result = await self.session.execute(sql, params)
+            deleted = len(result.fetchall())
+            await self.session.commit()
+            total += deleted
+            if deleted:
+                self.batches += 1
+            if deleted < self.batch_size:
+                break
+            if settings.bulk_delete_pause_seconds > 0:
+                await asyncio.sleep(settings.bulk_delete_pause_seconds)
+        return total
+
+    async def count_memories(
+        self,
+        user_id: str,
+        agent_id: Optional[str] = None,
+        memory_type: Optional[str] = None,
+        created_before: Optional[datetime] = None,
+        include_archived: bool = True
+    ) -> Dict[str, int]:
+        """Rows a delete_memories call with the same filter would remove, per tier."""
+        extra, params = self._memory_filter(agent_id, memory_type, created_before)
+        params["user_id"] = user_id
+        cold = f"(SELECT COUNT(*) FROM memories_archive WHERE user_id = :user_id{extra})" if include_archived else "0"
+        result = await self.session.execute(
+            text(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM memories WHERE user_id = :user_id{extra}) AS hot,
+                    {cold} AS cold
+            """),
+            params
+        )
+        row = result.one()
+        return {"hot": row.hot, "cold": row.cold}
+
+    async def delete_memories(
+        self,
+        user_id: str,
+        agent_id: Optional[str] = None,
+        memory_type: Optional[str] = None,
+        created_before: Optional[datetime] = None,
+        include_archived: bool = True
+    ) -> Dict[str, int]:
+        """
+        Delete a user's memories matching the filter, hot tier then cold tier.
+
+        Commits after every chunk; a failure part-way leaves earlier chunks deleted.
+
+        Returns:
+            Rows deleted per tier
+        """
+        extra, params = self._memory_filter(agent_id, memory_type, created_before)
+        params["user_id"] = user_id
+        where = f"user_id = :user_id{extra}"
+
+        deleted = {"hot": await self._delete_chunked("memories", where, params), "cold": 0}
+        if include_archived:
+            deleted["cold"] = await self._delete_chunked("memories_archive", where, params)
+
+        if deleted["hot"] or deleted["cold"]:
+            logger.info(f"Bulk deleted {deleted['hot']} hot / {deleted['cold']} cold memories for user {user_id}")
+            await publish_change(
+                self.session, "memories", user_id, "deleted", {"count": deleted["hot"] + deleted["cold"]}
+            )
+        return deleted
+
+    async def purge_user(self, user_id: str) -> Dict[str, int]:
+        """
+        Delete everything stored for a user (right to erasure).
+
+        Broadcast NOTAMs are shared and stay; the user's acks and group
+        memberships go. Evicts the user's Layer 1 entries on every worker.
+
+        Returns:
+            Rows deleted per table
+        """
+        # Buffered session touches would re-create the user's sessions on flush
+        get_session_tracker().discard(user_id)
+
+        params = {"user_id": user_id}
+        deleted: Dict[str, int] = {}
+        for table in CHUNKED_TABLES:
+            deleted[table] = await self._delete_chunked(table, "user_id = :user_id", params)
+
+        for table in SMALL_TABLES:
+            result = await self.session.execute(
+                text(f"DELETE FROM {table} WHERE user_id = :user_id RETURNING user_id"),
+                params
+            )
+            deleted[table] = len(result.fetchall())
+        await self.session.commit()
+
+        get_context_cache().invalidate_user(user_id)
+        for table in EVENT_TABLES:
+            await publish_change(self.session, table, user_id, "purged")
+
+        logger.info(f"Purged user {user_id}: {sum(deleted.values())} rows in {self.batches} batches")
+        return deleted
+
@@ -0,0 +1,373 @@
+"""
+Quota Service - Per-user / per-agent memory quotas with score-based eviction
+"""
+
+from typing import Collection, Dict, List, Optional, Set
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+import logging
+
+from ..config import get_settings
+from ..database import engine, get_db_context
+from ..models.quota import ALL_AGENTS
+from .tiering import TieringService
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Retention score in [0, 1]: blend of importance, recency (exponential decay
+# on last access) and saturating access count. Lowest scores are evicted first.
+RETENTION_SCORE_SQL = """
+    (
+        CAST(:w_importance AS DOUBLE PRECISION) * COALESCE(importance, 0.5)
+        + CAST(:w_recency AS DOUBLE PRECISION) * EXP(
+            -CAST(EXTRACT(EPOCH FROM (NOW() - COALESCE(accessed_at, created_at))) AS DOUBLE PRECISION)
+            / 86400.0 / CAST(:half_life_days AS DOUBLE PRECISION)
+        )
+        + CAST(:w_access AS DOUBLE PRECISION) * LEAST(
+            1.0,
+            LN(1 + COALESCE(access_count, 0)) / LN(1 + CAST(:access_norm AS DOUBLE PRECISION))
+        )
+    )
+"""
+
+
+def _score_params() -> dict:
+    """Bind parameters for RETENTION_SCORE_SQL."""
+    return {
+        "w_importance": settings.quota_weight_importance,
+        "w_recency": settings.quota_weight_recency,
+        "w_access": settings.quota_weight_access,
+        "half_life_days": settings.quota_recency_half_life_days,
+        "access_norm": max(settings.quota_access_count_norm, 1)
+    }
+
+
+# pg_try_advisory_lock key: every worker runs the job, one enforces at a time
+QUOTA_LOCK_KEY = 7_342_002
+
+# Users who added memories since the last eviction run (fed by the change bus).
+# Only they can have gone over quota, so the job skips the full-table count.
+_dirty_users: Set[str] = set()
+_full_scan_pending = True  # First run, and after missed events (resync)
+
+
+def mark_quota_dirty(user_id: Optional[str] = None):
+    """Queue a user (or, with None, everyone) for the next eviction run."""
+    global _full_scan_pending
+    if user_id is None:
+        _full_scan_pending = True
+    else:
+        _dirty_users.add(user_id)
+
+
+def track_writes_on_change(event: dict):
+    """Change bus handler: remember users whose hot-tier count may have grown."""
+    if event.get("op") == "resync":
+        mark_quota_dirty()
+    elif event.get("table") == "memories" and event.get("op") == "created" and event.get("user_id"):
+        mark_quota_dirty(event["user_id"])
+
+
+def take_dirty_users() -> Optional[Set[str]]:
+    """Users to check on this run; None means a full scan."""
+    global _dirty_users, _full_scan_pending
+    if _full_scan_pending or not settings.change_events_enabled:
+        _full_scan_pending = False
+        _dirty_users = set()
+        return None
+    users, _dirty_users = _dirty_users, set()
+    return users
+
+
+def _headroom(used: int, quota: int) -> Optional[int]:
+    """Remaining capacity (None when unlimited)."""
+    if not quota:
+        return None
+    return quota - used
+
+
+class QuotaService:
+    """Quota usage reporting and enforcement for the hot memories table."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize quota service."""
+        self.session = session
+
+    async def get_overrides(self, user_id: str) -> Dict[str, int]:
+        """Quota overrides for a user, keyed by agent_id ('*' = whole user)."""
+        result = await self.session.execute(
+            text("SELECT agent_id, max_memories FROM memory_quotas WHERE user_id = :user_id"),
+            {"user_id": user_id}
+        )
+        return {row.agent_id: row.max_memories for row in result.fetchall()}
+
+    async def set_quota(self, user_id: str, max_memories: int, agent_id: Optional[str] = None) -> dict:
+        """Create or replace a quota override."""
+        agent_id = agent_id or ALL_AGENTS
+        await self.session.execute(
+            text("""
+                INSERT INTO memory_quotas (user_id, agent_id, max_memories, updated_at)
+                VALUES (:user_id, :agent_id, :max_memories, NOW())
+                ON CONFLICT (user_id, agent_id)
+                DO UPDATE SET max_memories = EXCLUDED.max_memories, updated_at = NOW()
+            """),
+            {"user_id": user_id, "agent_id": agent_id, "max_memories": max_memories}
+        )
+        await self.session.commit()
+        mark_quota_dirty(user_id)  # A lower quota is enforced on the next run
+        logger.info(f"Set memory quota for user {user_id}, agent {agent_id}: {max_memories}")
+        return {"user_id": user_id, "agent_id": agent_id, "max_memories": max_memories}
+
+    async def delete_quota(self, user_id: str, agent_id: Optional[str] = None) -> bool:
+        """Remove a quota override (falls back to the configured default)."""
+        result = await self.session.execute(
+            text("""
+                DELETE FROM memory_quotas
+                WHERE user_id = :user_id AND agent_id = :agent_id
+                RETURNING user_id
+            """),
+            {"user_id": user_id, "agent_id": agent_id or ALL_AGENTS}
+        )
+        deleted = result.first() is not None
+        await self.session.commit()
+        return deleted
+
+    async def usage(self, user_id: str) -> dict:
+        """Current usage and headroom for one user and each of their agents."""
+        overrides = await self.get_overrides(user_id)
+        result = await self.session.execute(
+            text("""
+                SELECT agent_id, COUNT(*) AS used
+                FROM memories
+                WHERE user_id = :user_id
+                GROUP BY agent_id
+                ORDER BY used DESC
+            """),
+            {"user_id": user_id}
+        )
+        rows = result.fetchall()
+
+        user_quota = overrides.get(ALL_AGENTS, settings.quota_max_memories_per_user)
+        user_used = sum(row.used for row in rows)
+
+        agents = []
+        for row in rows:
+            agent_quota = overrides.get(row.agent_id, settings.quota_max_memories_per_agent)
+            agents.append({
+                "agent_id": row.agent_id,
+                "used": row.used,
+                "quota": agent_quota,
+                "headroom": _headroom(row.used, agent_quota)
+            })
+
+        return {
+            "user_id": user_id,
+            "used": user_used,
+            "quota": user_quota,
+            "headroom": _headroom(user_used, user_quota),
+            "agents": agents
+        }
+
+    async def usage_overview(self, limit: int = 50) -> List[dict]:
+        """Top users by hot-tier memory count with their quota and headroom."""
+        result = await self.session.execute(
+            text("""
+                SELECT m.user_id, COUNT(*) AS used,
+                       COALESCE(q.max_memories, :default_quota) AS quota
+                FROM memories m
+                LEFT JOIN memory_quotas q
+                  ON q.user_id = m.user_id AND q.agent_id = :all_agents
+                GROUP BY m.user_id, q.max_memories
+                ORDER BY used DESC
+                LIMIT :limit
+            """),
+            {
+                "default_quota": settings.quota_max_memories_per_user,
+                "all_agents": ALL_AGENTS,
+                "limit": limit
+            }
+        )
+        return [
+            {
+                "user_id": row.user_id,
+                "used": row.used,
+                "quota": row.quota,
+                "headroom": _headroom(row.used, row.quota)
+            }
+            for row in result.fetchall()
+        ]
+
+    async def enforce(self, user_ids: Optional[Collection[str]] = None) -> dict:
+        """
+        Evict lowest-scoring memories from every over-quota agent, then user.
+
+        Agent quotas are enforced first since that also lowers user totals.
+        Each batch is committed separately to keep locks short. With
+        `user_ids`, only those users are counted (no full-table GROUP BY).
+        A scope whose rows are all locked elsewhere is retried next run.
+
+        Returns:
+            Counts of evicted memories per scope
+        """
+        evicted_agents = 0
+        for row in await self._over_quota(per_agent=True, user_ids=user_ids):
+            evicted_agents += await self._evict(row.user_id, agent_id=row.agent_id)
+
+        evicted_users = 0
+        for row in await self._over_quota(per_agent=False, user_ids=user_ids):
+            evicted_users += await self._evict(row.user_id)
+
+        total = evicted_agents + evicted_users
+        if total:
+            logger.info(
+                f"Quota eviction ({settings.quota_eviction_mode}): "
+                f"{evicted_agents} by agent quota, {evicted_users} by user quota"
+            )
+        return {"agent": evicted_agents, "user": evicted_users, "mode": settings.quota_eviction_mode}
+
+    async def _over_quota(self, per_agent: bool, user_ids: Optional[Collection[str]] = None) -> list:
+        """Scopes whose hot-tier count exceeds their quota (0 = unlimited), optionally for some users only."""
+        if per_agent:
+            group_cols = "m.user_id, m.agent_id"
+            join = "q.user_id = m.user_id AND q.agent_id = m.agent_id"
+            default_quota = settings.quota_max_memories_per_agent
+        else:
+            group_cols = "m.user_id"
+            join = "q.user_id = m.user_id AND q.agent_id = :all_agents"
+            default_quota = settings.quota_max_memories_per_user
+
+        params = {"default_quota": default_quota, "all_agents": ALL_AGENTS}
+        where = ""
+        if user_ids is not None:
+            where = "WHERE m.user_id = ANY(CAST(:user_ids AS VARCHAR[]))"
+            params["user_ids"] = list(user_ids)
+
+        result = await self.session.execute(
+            text(f"""
+                SELECT {group_cols}, COUNT(*) AS used,
+                       COALESCE(q.max_memories, :default_quota) AS quota
+                FROM memories m
+                LEFT JOIN memory_quotas q ON {join}
+                {where}
+                GROUP BY {group_cols}, q.max_memories
+                HAVING COUNT(*) > NULLIF(COALESCE(q.max_memories, :default_quota), 0)
+            """),
+            params
+        )
+        return result.fetchall()
+
+    async def _excess(self, user_id: str, agent_id: Optional[str] = None) -> int:
+        """Rows a scope is over its quota right now (0 when within quota or unlimited)."""
+        if agent_id:
+            default_quota = settings.quota_max_memories_per_agent
+        else:
+            default_quota = settings.quota_max_memories_per_user
+        result = await self.session.execute(
+            text(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM memories
+                     WHERE user_id = :user_id {"AND agent_id = :agent_id" if agent_id else ""}) AS used,
+                    COALESCE(
+                        (SELECT max_memories FROM memory_quotas
+                         WHERE user_id = :user_id AND agent_id = :quota_agent),
+                        :default_quota
+                    ) AS quota
+            """),
+            {
+                "user_id": user_id,
+                "agent_id": agent_id,
+                "quota_agent": agent_id or ALL_AGENTS,
+                "default_quota": default_quota
+            }
+        )
+        row = result.one()
+        return max(0, row.used - row.quota) if row.quota else 0
+
+    async def _evict(self, user_id: str, agent_id: Optional[str] = None) -> int:
+        """
+        Evict lowest-scoring memories in a scope, batch by batch, until it is
+        within quota. The excess is recounted before every batch, so rows
+        removed meanwhile (deletes, another pass) are not evicted twice over.
+        """
+        batch_size = settings.quota_eviction_batch_size
+        tiering = TieringService(self.session)
+        evicted = 0
+
+        sql = f"""
+            SELECT id FROM memories
+            WHERE user_id = :user_id
+            {"AND agent_id = :agent_id" if agent_id else ""}
+            ORDER BY {RETENTION_SCORE_SQL} ASC, created_at ASC
+            LIMIT :batch
+            FOR UPDATE SKIP LOCKED
+        """
+
+        while True:
+            excess = await self._excess(user_id, agent_id)
+            if excess <= 0:
+                break
+            params = {"user_id": user_id, "agent_id": agent_id, "batch": min(batch_size, excess)}
+            params.update(_score_params())
+            result = await self.session.execute(text(sql), params)
+            ids = [row.id for row in result.fetchall()]
+            if not ids:
+                # Every remaining row is locked by another transaction
+                await self.session.rollback()
+                mark_quota_dirty(user_id)
+                break
+
+            if settings.quota_eviction_mode == "delete":
+                await self.session.execute(
+                    text("DELETE FROM memories WHERE user_id = :user_id AND id = ANY(:ids)"),
+                    {"user_id": user_id, "ids": ids}
+                )
+            else:
+                await tiering.archive_by_ids(ids, user_id)
+
+            await self.session.commit()
+            evicted += len(ids)
+
+        return evicted
+
+
+def _requeue(user_ids: Optional[Set[str]]):
+    """Check the same users (or everyone) again on the next run."""
+    if user_ids is None:
+        mark_quota_dirty()
+    else:
+        for user_id in user_ids:
+            mark_quota_dirty(user_id)
+
+
+async def run_quota_eviction_job():
+    """
+    Background job: enforce memory quotas for users who wrote since the last run.
+
+    Skipped (users kept for the next run) while another worker holds the
+    quota lock.
+    """
+    user_ids = take_dirty_users()
+    if user_ids is not None and not user_ids:
+        return
+    try:
+        # Session-level advisory lock on a dedicated connection, held for the whole pass
+        async with engine.connect() as lock_conn:
+            lock_conn = await lock_conn.execution_options(isolation_level="AUTOCOMMIT")
+            locked = (await lock_conn.execute(
+                text("SELECT pg_try_advisory_lock(:key)"), {"key": QUOTA_LOCK_KEY}
+            )).scalar()
+            if not locked:
+                logger.info("Quota eviction: another worker holds the quota lock - skipping")
+                _requeue(user_ids)
+                return
+            try:
+                async with get_db_context() as session:
+                    await QuotaService(session).enforce(user_ids)
+            finally:
+                await lock_conn.execute(
+                    text("SELECT pg_advisory_unlock(:key)"), {"key": QUOTA_LOCK_KEY}
+                )
+    except Exception:
+        _requeue(user_ids)
+        raise
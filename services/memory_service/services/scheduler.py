@@ -0,0 +1,126 @@
+"""
+Scheduler - Periodic background maintenance jobs
+"""
+
+from typing import Awaitable, Callable, Dict, Optional
+from datetime import datetime, timezone
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Async job that runs on a fixed interval until stopped."""
+
+    def __init__(
+        self,
+        name: str,
+        interval_seconds: float,
+        job: Callable[[], Awaitable[None]],
+        initial_delay: Optional[float] = None
+    ):
+        """Initialize periodic task."""
+        self.name = name
+        self.interval_seconds = interval_seconds
+        self.job = job
+        self.initial_delay = interval_seconds if initial_delay is None else initial_delay
+        self.last_run_at: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Check if the task loop is alive."""
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the task loop on the running event loop."""
+        if not self.running:
+            self._task = asyncio.create_task(self._loop(), name=self.name)
+            logger.info(f"Started background task '{self.name}' (every {self.interval_seconds}s)")
+
+    async def stop(self):
+        """Cancel the task loop and wait for it to exit."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        logger.info(f"Stopped background task '{self.name}'")
+
+    async def run_once(self):
+        """Run the job immediately, recording outcome."""
+        try:
+            await self.job()
+            self.last_error = None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.error(f"Background task '{self.name}' failed: {self.last_error}")
+        finally:
+            self.last_run_at = datetime.now(timezone.utc)
+
+    async def _loop(self):
+        """Sleep/run loop."""
+        await asyncio.sleep(self.initial_delay)
+        while True:
+            await self.run_once()
+            await asyncio.sleep(self.interval_seconds)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary."""
+        return {
+            "name": self.name,
+            "interval_seconds": self.interval_seconds,
+            "running": self.running,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_error": self.last_error
+        }
+
+
+class Scheduler:
+    """Registry of periodic tasks started/stopped with the application."""
+
+    def __init__(self):
+        """Initialize scheduler."""
+        self._tasks: Dict[str, PeriodicTask] = {}
+
+    def add(self, task: PeriodicTask) -> PeriodicTask:
+        """Register a task (replaces any task with the same name)."""
+        self._tasks[task.name] = task
+        return task
+
+    def get(self, name: str) -> Optional[PeriodicTask]:
+        """Get registered task by name."""
+        return self._tasks.get(name)
+
+    def start_all(self):
+        """Start every registered task."""
+        for task in self._tasks.values():
+            task.start()
+
+    async def stop_all(self):
+        """Stop every registered task."""
+        for task in self._tasks.values():
+            await task.stop()
+
+    def status(self) -> list:
+        """Status of all registered tasks."""
+        return [task.to_dict() for task in self._tasks.values()]
+
+
+# Singleton instance
+_scheduler: Optional[Scheduler] = None
+
+
+def get_scheduler() -> Scheduler:
+    """Get or create scheduler singleton."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = Scheduler()
+    return _scheduler
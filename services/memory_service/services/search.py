@@ -6,12 +6,16 @@ from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, text
 from datetime import datetime, timezone
+import asyncio
 import time
 import logging
 
 from ..models.memory import Memory
 from ..config import get_settings
+from ..database import primary_session
 from .embedder import get_embedding_service
+from .tiering import TieringService
+from .change_bus import publish_change
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
@@ -33,7 +37,8 @@ class SearchService:
         memory_types: Optional[List[str]] = None,
         limit: int = 5,
         threshold: float = 0.3,
-        include_shared: bool = True
+        include_shared: bool = True,
+        query_embedding: Optional[List[float]] = None
     ) -> Tuple[List[Tuple[Memory, float]], float]:
         """
         Search memories by semantic similarity.
@@ -42,6 +47,9 @@ class SearchService:
         - If agent_id provided: returns only agent's own memories + shared memories
         - If no agent_id: returns all memories (admin mode)
 
+        Pass `query_embedding` when the query was already embedded (e.g. inside
+        an admission slot) to skip embedding here.
+
         Returns:
             Tuple of (results, search_time_ms)
             where results is list of (Memory, similarity_score)
@@ -49,12 +57,80 @@ class SearchService:
         start_time = time.time()
 
         # Generate query embedding
-        query_embedding = self.embedder.embed(query)
+        if query_embedding is None:
+            query_embedding = await asyncio.to_thread(self.embedder.embed, query)
 
         # Format embedding as PostgreSQL vector string
         # Note: We embed the vector directly in SQL to avoid asyncpg parameter conflicts with ::
         embedding_str = "'[" + ",".join(str(x) for x in query_embedding) + "]'"
 
+        filters = dict(
+            user_id=user_id,
+            agent_id=agent_id,
+            memory_types=memory_types,
+            threshold=threshold,
+            include_shared=include_shared
+        )
+
+        # Hot tier first (ivfflat index)
+        rows = await self._search_table("memories", embedding_str, limit=limit, **filters)
+        hot_ids = [row.id for row in rows]
+
+        # Fall back to the cold tier only when the hot tier comes up short
+        cold_rows = []
+        if settings.tiering_enabled and len(rows) < limit:
+            cold_rows = await self._search_table(
+                "memories_archive", embedding_str, limit=limit - len(rows), **filters
+            )
+            rows = sorted(rows + cold_rows, key=lambda r: r.similarity, reverse=True)
+
+        # Convert to Memory objects with similarity scores
+        results = []
+        for row in rows:
+            memory = Memory(
+                id=row.id,
+                user_id=row.user_id,
+                agent_id=row.agent_id,
+                access_mode=row.access_mode,
+                content=row.content,
+                memory_type=row.memory_type,
+                importance=row.importance,
+                extra_data=row.metadata,
+                source_conversation_id=row.source_conversation_id,
+                created_at=row.created_at,
+                accessed_at=row.accessed_at,
+                access_count=row.access_count
+            )
+            results.append((memory, row.similarity))
+
+        # Update access tracking (on the primary); accessed cold memories are promoted back to hot
+        if hot_ids or cold_rows:
+            async with primary_session(self.session) as writer:
+                await self._record_access(writer, user_id, hot_ids)
+                if cold_rows:
+                    await TieringService(writer).promote([row.id for row in cold_rows], user_id=user_id)
+                await writer.commit()
+
+        search_time_ms = (time.time() - start_time) * 1000
+        logger.debug(
+            f"Search completed in {search_time_ms:.2f}ms, found {len(results)} results "
+            f"({len(cold_rows)} from cold tier)"
+        )
+
+        return results, search_time_ms
+
+    async def _search_table(
+        self,
+        table: str,
+        embedding_str: str,
+        user_id: str,
+        agent_id: Optional[str],
+        memory_types: Optional[List[str]],
+        limit: int,
+        threshold: float,
+        include_shared: bool
+    ) -> list:
+        """Run the similarity query against one memory tier table."""
         # Build query with vector similarity
         # Using pgvector's <=> operator for cosine distance
         # Cosine distance = 1 - cosine_similarity, so we need to convert
@@ -73,7 +149,7 @@ class SearchService:
                 accessed_at,
                 access_count,
                 1 - (embedding <=> {embedding_str}::vector) as similarity
-            FROM memories
+            FROM {table}
             WHERE user_id = :user_id
         """
 
@@ -107,46 +183,27 @@ class SearchService:
 
         # Execute query
         result = await self.session.execute(text(sql), params)
-        rows = result.fetchall()
+        return result.fetchall()
 
-        # Convert to Memory objects with similarity scores
-        results = []
-        for row in rows:
-            memory = Memory(
-                id=row.id,
-                user_id=row.user_id,
-                agent_id=row.agent_id,
-                access_mode=row.access_mode,
-                content=row.content,
-                memory_type=row.memory_type,
-                importance=row.importance,
-                extra_data=row.metadata,
-                source_conversation_id=row.source_conversation_id,
-                created_at=row.created_at,
-                accessed_at=row.accessed_at,
-                access_count=row.access_count
-            )
-            results.append((memory, row.similarity))
-
-            # Update access tracking
-            await self._record_access(row.id)
-
-        search_time_ms = (time.time() - start_time) * 1000
-        logger.debug(f"Search completed in {search_time_ms:.2f}ms, found {len(results)} results")
-
-        return results, search_time_ms
+    async def _record_access(self, db: AsyncSession, user_id: str, memory_ids: List):
+        """
+        Record memory access for analytics (user_id prunes to one partition).
 
-    async def _record_access(self, memory_id):
-        """Record memory access for analytics."""
+        Runs in a savepoint: a failed update is rolled back and skipped
+        without aborting the caller's transaction (cold-tier promotion).
+        """
+        if not memory_ids:
+            return
         try:
-            await self.session.execute(
-                text("""
-                    UPDATE memories
-                    SET accessed_at = :now, access_count = access_count + 1
-                    WHERE id = :id
-                """),
-                {"id": memory_id, "now": datetime.now(timezone.utc)}
-            )
+            async with db.begin_nested():
+                await db.execute(
+                    text("""
+                        UPDATE memories
+                        SET accessed_at = :now, access_count = COALESCE(access_count, 0) + 1
+                        WHERE user_id = :user_id AND id = ANY(:ids)
+                    """),
+                    {"user_id": user_id, "ids": list(memory_ids), "now": datetime.now(timezone.utc)}
+                )
         except Exception as e:
             logger.warning(f"Failed to record access: {e}")
 
@@ -162,8 +219,8 @@ class SearchService:
         source_conversation_id: str = None
     ) -> Memory:
         """Add new memory with embedding and agent isolation."""
-        # Generate embedding
-        embedding = self.embedder.embed(content)
+        # Generate embedding (off the event loop)
+        embedding = await asyncio.to_thread(self.embedder.embed, content)
 
         # Create memory
         memory = Memory(
@@ -183,6 +240,7 @@ class SearchService:
         await self.session.refresh(memory)
 
         logger.info(f"Added memory {memory.id} for user {user_id}, agent {agent_id}, mode {access_mode}")
+        await publish_change(self.session, "memories", user_id, "created", {"ids": [str(memory.id)]})
         return memory
 
     async def add_memories_batch(
@@ -207,7 +265,7 @@ class SearchService:
 
         # Extract contents for batch embedding
         contents = [m.content for m in memories_data]
-        embeddings = self.embedder.embed_batch(contents)
+        embeddings = await asyncio.to_thread(self.embedder.embed_batch, contents)
 
         memories = []
         for i, data in enumerate(memories_data):
@@ -233,5 +291,8 @@ class SearchService:
 
         elapsed = (time.time() - start_time) * 1000
         logger.info(f"Batch added {len(memories)} memories for user {user_id} in {elapsed:.2f}ms")
+        await publish_change(
+            self.session, "memories", user_id, "created", {"ids": [str(memory.id) for memory in memories]}
+        )
 
         return memories
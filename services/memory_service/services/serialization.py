@@ -0,0 +1,90 @@
+"""
+Serialization - Fast JSON path for large list responses
+
+Routes that return many rows (memory lists, search, NOTAM lists) map SQL
+rows straight to dicts and return FastJSONResponse. FastAPI skips
+response_model validation for Response objects, so the row is serialized
+once instead of ORM -> Pydantic -> validate -> JSON. The decorators keep
+their response_model, so the OpenAPI schemas are unchanged.
+
+Uses orjson when installed, the stdlib json module otherwise.
+"""
+
+from typing import Any, Mapping
+from fastapi.responses import Response
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+import json
+
+# Optional fast path
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def _default(value: Any):
+    """Types outside the JSON core, encoded like Pydantic does."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat().replace("+00:00", "Z")
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to compact JSON bytes (UTC datetimes as ...Z, like Pydantic)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response serialized with dumps(); content is already response-shaped."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Encode content (bytes pass through)."""
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def memory_dict(row: Any) -> dict:
+    """MemoryResponse-shaped dict from a Memory object or a row with its columns."""
+    return {
+        "id": str(row.id),
+        "user_id": row.user_id,
+        "agent_id": row.agent_id,
+        "access_mode": row.access_mode,
+        "content": row.content,
+        "memory_type": row.memory_type,
+        "importance": row.importance,
+        "metadata": row.extra_data or {},
+        "created_at": row.created_at,
+        "accessed_at": row.accessed_at,
+        "access_count": row.access_count
+    }
+
+
+def notam_dict(row: Mapping) -> dict:
+    """NotamResponse-shaped dict from a USER_NOTAM_COLUMNS row mapping."""
+    return {
+        "id": str(row["id"]),
+        "user_id": row["user_id"],
+        "title": row["title"],
+        "content": row["content"],
+        "priority": row["priority"],
+        "category": row["category"],
+        "active": row["active"],
+        "expires_at": row["expires_at"],
+        "created_at": row["created_at"],
+        "scope": row["scope"],
+        "acknowledged": row["acknowledged"]
+    }
@@ -0,0 +1,158 @@
+"""
+Session Tracker - Atomic session upserts with optional write-behind
+
+Every /context call records that (user_id, agent_type) is active. Writes
+are a single INSERT ... ON CONFLICT DO UPDATE against the unique
+(user_id, agent_type) index, so concurrent agents can no longer race into
+duplicate rows. In write-behind mode touches are buffered in memory and
+coalesced into one multi-row upsert per flush window.
+"""
+
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime, timezone
+import logging
+
+from ..config import get_settings
+from ..database import get_db_context, primary_session
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Matches the uq_sessions_user_agent expression index (NULL agent_type == '')
+UPSERT_SESSIONS_SQL = text("""
+    INSERT INTO sessions (user_id, agent_type, agent_name, updated_at)
+    SELECT * FROM unnest(
+        CAST(:user_ids AS VARCHAR[]),
+        CAST(:agent_types AS VARCHAR[]),
+        CAST(:agent_names AS VARCHAR[]),
+        CAST(:touched_at AS TIMESTAMPTZ[])
+    )
+    ON CONFLICT (user_id, (COALESCE(agent_type, '')))
+    DO UPDATE SET
+        updated_at = GREATEST(sessions.updated_at, EXCLUDED.updated_at),
+        agent_name = COALESCE(EXCLUDED.agent_name, sessions.agent_name)
+""")
+
+SessionKey = Tuple[str, Optional[str]]
+
+
+async def upsert_sessions(db: AsyncSession, touches: Dict[SessionKey, Tuple[Optional[str], datetime]]):
+    """Upsert many (user_id, agent_type) touches in one statement. Does not commit."""
+    if not touches:
+        return
+    keys = list(touches)
+    await db.execute(
+        UPSERT_SESSIONS_SQL,
+        {
+            "user_ids": [key[0] for key in keys],
+            "agent_types": [key[1] for key in keys],
+            "agent_names": [touches[key][0] for key in keys],
+            "touched_at": [touches[key][1] for key in keys]
+        }
+    )
+
+
+class SessionTracker:
+    """Records session activity, directly or through a write-behind buffer."""
+
+    def __init__(self, write_behind: Optional[bool] = None):
+        """Initialize session tracker."""
+        self.write_behind = settings.session_write_behind if write_behind is None else write_behind
+        self._pending: Dict[SessionKey, Tuple[Optional[str], datetime]] = {}
+        self.coalesced = 0
+        self.flushed = 0
+
+    async def touch(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        agent_type: Optional[str] = None,
+        agent_name: Optional[str] = None
+    ):
+        """Record activity for (user_id, agent_type)."""
+        await self.touch_many(db, [(user_id, agent_type, agent_name)])
+
+    async def touch_many(
+        self,
+        db: AsyncSession,
+        touches: List[Tuple[str, Optional[str], Optional[str]]]
+    ):
+        """Record activity for many (user_id, agent_type, agent_name) at once."""
+        now = datetime.now(timezone.utc)
+
+        if self.write_behind:
+            for user_id, agent_type, agent_name in touches:
+                key = (user_id, agent_type or None)
+                previous = self._pending.get(key)
+                if previous is not None:
+                    self.coalesced += 1
+                    agent_name = agent_name or previous[0]
+                self._pending[key] = (agent_name, now)
+            return
+
+        batch: Dict[SessionKey, Tuple[Optional[str], datetime]] = {}
+        for user_id, agent_type, agent_name in touches:
+            key = (user_id, agent_type or None)
+            previous = batch.get(key)
+            batch[key] = (agent_name or (previous[0] if previous else None), now)
+
+        # db may be a replica session (read routes); the upsert goes to the primary
+        async with primary_session(db) as writer:
+            try:
+                await upsert_sessions(writer, batch)
+                await writer.commit()
+            except Exception as e:
+                await writer.rollback()
+                logger.warning(f"Failed to update session: {e}")
+
+    async def flush(self):
+        """Write all buffered touches as one upsert."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            async with get_db_context() as db:
+                await upsert_sessions(db, pending)
+                await db.commit()
+            self.flushed += len(pending)
+        except Exception as e:
+            # Put touches back unless newer ones arrived meanwhile
+            for key, value in pending.items():
+                self._pending.setdefault(key, value)
+            logger.warning(f"Failed to flush {len(pending)} session touches: {e}")
+            raise
+
+    def discard(self, user_id: str) -> int:
+        """Drop buffered touches for a user (e.g. before a purge). Returns the number dropped."""
+        keys = [key for key in self._pending if key[0] == user_id]
+        for key in keys:
+            del self._pending[key]
+        return len(keys)
+
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "write_behind": self.write_behind,
+            "pending": len(self._pending),
+            "coalesced": self.coalesced,
+            "flushed": self.flushed
+        }
+
+
+# Singleton instance
+_session_tracker: Optional[SessionTracker] = None
+
+
+def get_session_tracker() -> SessionTracker:
+    """Get or create session tracker singleton."""
+    global _session_tracker
+    if _session_tracker is None:
+        _session_tracker = SessionTracker()
+    return _session_tracker
+
+
+async def run_session_flush_job():
+    """Background job: flush write-behind session touches."""
+    await get_session_tracker().flush()
@@ -0,0 +1,130 @@
+"""
+Single Flight - Coalesce identical concurrent read requests
+
+When many agents of one user ask the same thing at the same instant (a
+NOTAM fires, a shared conversation starts), only the first request runs
+the embedding and database work; duplicates that arrive while it is in
+flight await the same task and share its result. Nothing is kept once the
+task finishes - this is not a cache.
+
+The shared computation must open its own session (get_read_db_context):
+it outlives whichever request started it. Results are shared between
+callers and must not be mutated.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+from pydantic import BaseModel
+import asyncio
+import json
+import logging
+
+from ..config import get_settings
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+def request_key(user_id: str, request: BaseModel, **normalized: Any) -> Tuple[str, str]:
+    """
+    Flight key for a request model: (user_id, canonical JSON of its fields).
+
+    `normalized` overrides fields whose spelling should not split flights
+    (e.g. stripped query text, sorted filter lists).
+    """
+    fields = request.model_dump(mode="json")
+    fields.update(normalized)
+    return user_id, json.dumps(fields, sort_keys=True, default=str)
+
+
+class SingleFlight:
+    """In-flight tasks of one endpoint, keyed by normalized request."""
+
+    def __init__(self, name: str):
+        """Initialize single-flight group."""
+        self.name = name
+        self._flights: Dict[Hashable, asyncio.Task] = {}
+        self.leaders = 0
+        self.joined = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run fn() once per key among concurrent callers and return its result.
+
+        Exceptions are shared too. A caller that is cancelled (client gone)
+        stops waiting, but the task keeps running for the others.
+        """
+        if not settings.single_flight_enabled:
+            return await fn()
+
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.leaders += 1
+        else:
+            self.joined += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        """Drop the finished flight (unless forget() already replaced it)."""
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            task.exception()  # Retrieved here so waiter-less failures are not logged as unhandled
+
+    def forget(self, user_id: Optional[str] = None) -> int:
+        """
+        Stop new callers joining in-flight tasks (one user's, or all).
+
+        Called after a write so later reads start a fresh computation
+        instead of sharing one that began before the write.
+        """
+        keys = [
+            key for key in self._flights
+            if user_id is None or (isinstance(key, tuple) and key[0] == user_id)
+        ]
+        for key in keys:
+            del self._flights[key]
+        return len(keys)
+
+    def stats(self) -> dict:
+        """Counters for monitoring."""
+        return {
+            "name": self.name,
+            "in_flight": len(self._flights),
+            "leaders": self.leaders,
+            "joined": self.joined
+        }
+
+
+# Singleton groups, one per endpoint
+_groups: Dict[str, SingleFlight] = {}
+
+
+def get_single_flight(name: str) -> SingleFlight:
+    """Get or create the single-flight group for an endpoint."""
+    group = _groups.get(name)
+    if group is None:
+        group = _groups[name] = SingleFlight(name)
+    return group
+
+
+def single_flight_stats() -> dict:
+    """Counters for every group."""
+    return {
+        "enabled": settings.single_flight_enabled,
+        "groups": [group.stats() for group in _groups.values()]
+    }
+
+
+def forget_on_change(event: dict):
+    """Change bus handler: writes on any worker end joining of that user's flights."""
+    if event.get("op") == "resync":
+        return
+    user_id = event.get("user_id")
+    for group in _groups.values():
+        # Broadcast changes (no user) can affect everyone's Layer 1 reads
+        group.forget(user_id)
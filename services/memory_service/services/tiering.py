@@ -0,0 +1,193 @@
+"""
+Tiering Service - Hot/cold storage tiers for memories
+
+Hot tier:  `memories` (ivfflat vector index, searched first)
+Cold tier: `memories_archive` (no vector index, searched only as fallback)
+"""
+
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from datetime import datetime, timedelta, timezone
+import logging
+
+from ..config import get_settings
+from ..database import get_db_context
+
+logger = logging.getLogger(__name__)
+settings = get_settings()
+
+# Columns shared by `memories` and `memories_archive`
+MEMORY_COLUMNS = (
+    "id, user_id, agent_id, access_mode, content, memory_type, embedding, "
+    "importance, metadata, source_conversation_id, created_at, accessed_at, access_count"
+)
+
+
+class TieringService:
+    """Moves memories between the hot and cold tiers."""
+
+    def __init__(self, session: AsyncSession):
+        """Initialize tiering service."""
+        self.session = session
+
+    async def archive_cold_memories(
+        self,
+        cold_after_days: Optional[int] = None,
+        batch_size: Optional[int] = None
+    ) -> int:
+        """
+        Move cold memories from the hot table into the archive.
+
+        A memory is cold when it has not been accessed (or created, if never
+        accessed) within `cold_after_days`, has been accessed at most
+        `tiering_max_access_count` times and is below `tiering_max_importance`.
+        Runs in batches, committing after each one to keep locks short.
+
+        Returns:
+            Number of memories archived
+        """
+        cold_after_days = cold_after_days or settings.tiering_cold_after_days
+        batch_size = batch_size or settings.tiering_batch_size
+        cutoff = datetime.now(timezone.utc) - timedelta(days=cold_after_days)
+
+        sql = text(f"""
+            WITH cold AS (
+                SELECT id FROM memories
+                WHERE COALESCE(accessed_at, created_at) < :cutoff
+                  AND COALESCE(access_count, 0) <= :max_access_count
+                  AND COALESCE(importance, 0.5) < :max_importance
+                ORDER BY COALESCE(accessed_at, created_at)
+                LIMIT :batch_size
+                FOR UPDATE SKIP LOCKED
+            ), moved AS (
+                DELETE FROM memories m
+                USING cold
+                WHERE m.id = cold.id
+                RETURNING m.*
+            )
+            INSERT INTO memories_archive ({MEMORY_COLUMNS}, archived_at)
+            SELECT {MEMORY_COLUMNS}, NOW() FROM moved
+            RETURNING id
+        """)
+        params = {
+            "cutoff": cutoff,
+            "max_access_count": settings.tiering_max_access_count,
+            "max_importance": settings.tiering_max_importance,
+            "batch_size": batch_size
+        }
+
+        total = 0
+        while True:
+            result = await self.session.execute(sql, params)
+            moved = len(result.fetchall())
+            await self.session.commit()
+            total += moved
+            if moved < batch_size:
+                break
+
+        if total:
+            logger.info(f"Archived {total} cold memories (cutoff {cutoff.isoformat()})")
+        return total
+
+    async def archive_by_ids(self, memory_ids: List, user_id: str) -> List:
+        """
+        Move specific memories of one user from the hot table into the archive.
+
+        user_id prunes the DELETE to one partition of a partitioned table.
+        Does not commit; the caller owns the transaction.
+
+        Returns:
+            IDs of archived memories
+        """
+        if not memory_ids:
+            return []
+
+        result = await self.session.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM memories
+                    WHERE user_id = :user_id AND id = ANY(:ids)
+                    RETURNING *
+                )
+                INSERT INTO memories_archive ({MEMORY_COLUMNS}, archived_at)
+                SELECT {MEMORY_COLUMNS}, NOW() FROM moved
+                RETURNING id
+            """),
+            {"user_id": user_id, "ids": list(memory_ids)}
+        )
+        return [row.id for row in result.fetchall()]
+
+    async def promote(
+        self,
+        memory_ids: List,
+        user_id: Optional[str] = None,
+        record_access: bool = True
+    ) -> List:
+        """
+        Move archived memories back into the hot table.
+
+        Called when a cold memory is accessed again. Pass the owner's
+        user_id whenever it is known to narrow the archive lookup. Does not
+        commit; the caller owns the transaction.
+
+        Returns:
+            IDs of promoted memories
+        """
+        if not memory_ids:
+            return []
+
+        accessed_at = "NOW()" if record_access else "accessed_at"
+        access_count = "COALESCE(access_count, 0) + 1" if record_access else "access_count"
+
+        result = await self.session.execute(
+            text(f"""
+                WITH moved AS (
+                    DELETE FROM memories_archive
+                    WHERE id = ANY(:ids) {"AND user_id = :user_id" if user_id else ""}
+                    RETURNING {MEMORY_COLUMNS}
+                )
+                INSERT INTO memories ({MEMORY_COLUMNS})
+                SELECT
+                    id, user_id, agent_id, access_mode, content, memory_type, embedding,
+                    importance, metadata, source_conversation_id, created_at,
+                    {accessed_at}, {access_count}
+                FROM moved
+                RETURNING id
+            """),
+            {"ids": list(memory_ids), "user_id": user_id}
+        )
+        promoted = [row.id for row in result.fetchall()]
+
+        if promoted:
+            logger.info(f"Promoted {len(promoted)} memories back to hot tier")
+        return promoted
+
+    async def delete_archived(self, memory_id, user_id: Optional[str] = None) -> Optional[str]:
+        """Delete a memory from the archive. Returns its owner (None if not found). Does not commit."""
+        owner_filter = " AND user_id = :user_id" if user_id else ""
+        result = await self.session.execute(
+            text(f"DELETE FROM memories_archive WHERE id = :id{owner_filter} RETURNING user_id"),
+            {"id": memory_id, "user_id": user_id} if user_id else {"id": memory_id}
+        )
+        return result.scalar_one_or_none()
+
+    async def stats(self, user_id: Optional[str] = None) -> dict:
+        """Row counts per tier, optionally for a single user."""
+        where = "WHERE user_id = :user_id" if user_id else ""
+        result = await self.session.execute(
+            text(f"""
+                SELECT
+                    (SELECT COUNT(*) FROM memories {where}) AS hot,
+                    (SELECT COUNT(*) FROM memories_archive {where}) AS cold
+            """),
+            {"user_id": user_id} if user_id else {}
+        )
+        row = result.one()
+        return {"hot": row.hot, "cold": row.cold}
+
+
+async def run_tiering_job():
+    """Background job: archive cold memories."""
+    async with get_db_context() as session:
+        await TieringService(session).archive_cold_memories()
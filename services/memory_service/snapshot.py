@@ -0,0 +1,296 @@
+"""
+Snapshot / restore of memory data using binary COPY
+
+Streams personas, NOTAMs (per-user and broadcast, with acks and group
+members), sessions, memories (hot and cold tier) and quota overrides into a
+single gzip-compressed archive. Rows travel in PostgreSQL's binary COPY
+format, so embeddings are stored as raw float32 and restore never calls the
+embedding model.
+
+Usage:
+    python -m memory_service.snapshot export out.snap [--user-id chief ...]
+    python -m memory_service.snapshot restore out.snap [--user-id chief ...] [--replace]
+"""
+
+from typing import AsyncIterator, List, Optional
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import struct
+import sys
+import time
+
+import asyncpg
+
+from .config import get_settings
+from .database import get_asyncpg_dsn
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    handlers=[logging.StreamHandler(sys.stdout)]
+)
+logger = logging.getLogger("memory_service.snapshot")
+settings = get_settings()
+
+FORMAT_VERSION = 1
+MAGIC = b"SENTRA-MEMORY-SNAPSHOT\n"
+
+# Tables in restore order, with the columns carried in the snapshot
+TABLES = {
+    "personas": [
+        "id", "user_id", "name", "traits", "preferences", "style", "created_at", "updated_at"
+    ],
+    "notams": [
+        "id", "user_id", "title", "content", "priority", "category", "active", "expires_at", "created_at"
+    ],
+    "broadcast_notams": [
+        "id", "scope", "group_id", "title", "content", "priority", "category", "active", "expires_at",
+        "created_at"
+    ],
+    "notam_group_members": [
+        "group_id", "user_id", "created_at"
+    ],
+    "notam_acks": [
+        "user_id", "notam_id", "dismissed", "acked_at"
+    ],
+    "sessions": [
+        "id", "user_id", "agent_type", "agent_name", "last_query", "last_response_summary",
+        "context", "created_at", "updated_at"
+    ],
+    "memories": [
+        "id", "user_id", "agent_id", "access_mode", "content", "memory_type", "embedding",
+        "importance", "metadata", "source_conversation_id", "created_at", "accessed_at", "access_count"
+    ],
+    "memories_archive": [
+        "id", "user_id", "agent_id", "access_mode", "content", "memory_type", "embedding",
+        "importance", "metadata", "source_conversation_id", "created_at", "accessed_at", "access_count",
+        "archived_at"
+    ],
+    "memory_quotas": [
+        "user_id", "agent_id", "max_memories", "updated_at"
+    ],
+}
+
+# Shared tables without user_id: always carried in full (acks reference them),
+# never deleted by --replace
+SHARED_TABLES = {"broadcast_notams"}
+
+# Record framing: 1-byte kind + 4-byte big-endian length + payload
+RECORD_HEADER = struct.Struct(">cI")
+KIND_MANIFEST = b"M"
+KIND_TABLE = b"T"
+KIND_DATA = b"D"
+KIND_TABLE_END = b"E"
+KIND_END = b"Z"
+
+
+class SnapshotWriter:
+    """Writes framed records to a gzip stream."""
+
+    def __init__(self, path: str):
+        """Open the archive and write the magic header."""
+        self._file = gzip.open(path, "wb", compresslevel=6)
+        self._file.write(MAGIC)
+        self.bytes_written = 0
+
+    def record(self, kind: bytes, payload: bytes = b""):
+        """Write one framed record."""
+        self._file.write(RECORD_HEADER.pack(kind, len(payload)))
+        self._file.write(payload)
+        self.bytes_written += RECORD_HEADER.size + len(payload)
+
+    async def data(self, chunk: bytes):
+        """COPY output callback."""
+        self.record(KIND_DATA, bytes(chunk))
+
+    def close(self):
+        """Flush and close the archive."""
+        self._file.close()
+
+
+class SnapshotReader:
+    """Reads framed records from a gzip stream."""
+
+    def __init__(self, path: str):
+        """Open the archive and check the magic header."""
+        self._file = gzip.open(path, "rb")
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a memory service snapshot")
+        self.table_trailer = {}
+
+    def record(self):
+        """Read one framed record as (kind, payload)."""
+        header = self._file.read(RECORD_HEADER.size)
+        if len(header) < RECORD_HEADER.size:
+            raise ValueError("Truncated snapshot")
+        kind, length = RECORD_HEADER.unpack(header)
+        payload = self._file.read(length)
+        if len(payload) < length:
+            raise ValueError("Truncated snapshot")
+        return kind, payload
+
+    async def table_data(self) -> AsyncIterator[bytes]:
+        """Yield COPY data chunks until the end of the current table."""
+        while True:
+            kind, payload = self.record()
+            if kind == KIND_DATA:
+                yield payload
+            elif kind == KIND_TABLE_END:
+                self.table_trailer = json.loads(payload)
+                return
+            else:
+                raise ValueError(f"Unexpected record {kind!r} inside table data")
+
+    def close(self):
+        """Close the archive."""
+        self._file.close()
+
+
+async def _existing_tables(conn: asyncpg.Connection) -> set:
+    """Snapshot tables present in the current schema."""
+    rows = await conn.fetch(
+        "SELECT tablename FROM pg_tables WHERE schemaname = current_schema() AND tablename = ANY($1)",
+        list(TABLES)
+    )
+    return {row["tablename"] for row in rows}
+
+
+async def export_snapshot(path: str, user_ids: Optional[List[str]] = None):
+    """Stream selected tables into a snapshot archive."""
+    start = time.time()
+    conn = await asyncpg.connect(get_asyncpg_dsn())
+    writer = SnapshotWriter(path)
+    try:
+        # One REPEATABLE READ snapshot so all tables are mutually consistent
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            tables = [t for t in TABLES if t in await _existing_tables(conn)]
+            writer.record(KIND_MANIFEST, json.dumps({
+                "format_version": FORMAT_VERSION,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "embedding_dimension": settings.embedding_dimension,
+                "user_ids": user_ids,
+                "tables": {t: TABLES[t] for t in tables}
+            }).encode())
+
+            for table in tables:
+                columns = ", ".join(TABLES[table])
+                query = f"SELECT {columns} FROM {table}"
+                args = []
+                if user_ids and table not in SHARED_TABLES:
+                    query += " WHERE user_id = ANY($1::varchar[])"
+                    args.append(user_ids)
+
+                writer.record(KIND_TABLE, table.encode())
+                status = await conn.copy_from_query(query, *args, output=writer.data, format="binary")
+                rows = int(status.split()[-1])
+                writer.record(KIND_TABLE_END, json.dumps({"rows": rows}).encode())
+                logger.info(f"Exported {rows} rows from {table}")
+
+        writer.record(KIND_END)
+    finally:
+        writer.close()
+        await conn.close()
+
+    logger.info(f"Snapshot written to {path} ({writer.bytes_written} bytes raw) in {time.time() - start:.1f}s")
+
+
+async def restore_snapshot(path: str, user_ids: Optional[List[str]] = None, replace: bool = False):
+    """
+    Stream a snapshot archive back into the database.
+
+    Each table is COPYed into a temporary staging table and merged with
+    INSERT ... ON CONFLICT DO NOTHING, so restore is idempotent and can be
+    filtered by user. With `replace`, existing rows for the restored users
+    are deleted first. Runs in a single transaction.
+    """
+    start = time.time()
+    reader = SnapshotReader(path)
+    conn = await asyncpg.connect(get_asyncpg_dsn())
+    try:
+        kind, payload = reader.record()
+        if kind != KIND_MANIFEST:
+            raise ValueError("Snapshot is missing its manifest")
+        manifest = json.loads(payload)
+        if manifest["format_version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported snapshot format: {manifest['format_version']}")
+        if manifest["embedding_dimension"] != settings.embedding_dimension:
+            raise ValueError(
+                f"Snapshot embeddings are {manifest['embedding_dimension']}D, "
+                f"service is configured for {settings.embedding_dimension}D"
+            )
+
+        async with conn.transaction():
+            existing = await _existing_tables(conn)
+            while True:
+                kind, payload = reader.record()
+                if kind == KIND_END:
+                    break
+                if kind != KIND_TABLE:
+                    raise ValueError(f"Unexpected record {kind!r}")
+
+                table = payload.decode()
+                columns = manifest["tables"][table]
+                if table not in existing:
+                    logger.warning(f"Skipping {table}: table does not exist in target database")
+                    async for _ in reader.table_data():
+                        pass
+                    continue
+
+                staging = f"_restore_{table}"
+                await conn.execute(
+                    f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+                )
+                await conn.copy_to_table(staging, source=reader.table_data(), columns=columns, format="binary")
+
+                filtered = bool(user_ids) and table not in SHARED_TABLES
+                user_filter = "WHERE user_id = ANY($1::varchar[])" if filtered else ""
+                args = [user_ids] if filtered else []
+                column_list = ", ".join(columns)
+
+                if replace and table not in SHARED_TABLES:
+                    await conn.execute(
+                        f"DELETE FROM {table} WHERE user_id IN (SELECT DISTINCT user_id FROM {staging} {user_filter})",
+                        *args
+                    )
+
+                status = await conn.execute(
+                    f"""
+                    INSERT INTO {table} ({column_list})
+                    SELECT {column_list} FROM {staging} {user_filter}
+                    ON CONFLICT DO NOTHING
+                    """,
+                    *args
+                )
+                restored = int(status.split()[-1])
+                logger.info(
+                    f"Restored {restored}/{reader.table_trailer['rows']} rows into {table}"
+                )
+    finally:
+        reader.close()
+        await conn.close()
+
+    logger.info(f"Restore from {path} completed in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot and restore memory service data (binary COPY)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write a snapshot archive")
+    export_parser.add_argument("path", help="Output file (gzip-compressed)")
+    export_parser.add_argument("--user-id", action="append", dest="user_ids", help="Only these users (repeatable)")
+
+    restore_parser = subparsers.add_parser("restore", help="Load a snapshot archive")
+    restore_parser.add_argument("path", help="Snapshot file")
+    restore_parser.add_argument("--user-id", action="append", dest="user_ids", help="Only these users (repeatable)")
+    restore_parser.add_argument("--replace", action="store_true", help="Delete existing rows of restored users first")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        asyncio.run(export_snapshot(args.path, args.user_ids))
+    else:
+        asyncio.run(restore_snapshot(args.path, args.user_ids, replace=args.replace))
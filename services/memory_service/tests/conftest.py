@@ -0,0 +1,11 @@
+"""
+Test configuration - unit tests for pure logic (no database, no model)
+
+Run from services/: python -m pytest memory_service/tests
+"""
+
+from pathlib import Path
+import sys
+
+# Make `memory_service` importable when pytest runs from inside the package
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
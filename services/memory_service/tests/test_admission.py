@@ -0,0 +1,162 @@
+"""
+Admission control tests - fair queueing, shedding and cancellation
+"""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from memory_service.services import admission
+from memory_service.services.admission import AdmissionController
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(admission.settings, "admission_enabled", True)
+
+
+def controller(**overrides) -> AdmissionController:
+    options = {"concurrency": 1, "max_queue": 10, "queue_timeout_seconds": 5.0, "max_per_user": 10}
+    options.update(overrides)
+    return AdmissionController("test", **options)
+
+
+async def hold(ctrl: AdmissionController, user_id: str, release: asyncio.Event, order: list):
+    """Take a slot, record the order of admission and hold until released."""
+    async with ctrl.slot(user_id):
+        order.append(user_id)
+        await release.wait()
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_round_robin_between_users():
+    ctrl = controller()
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.create_task(hold(ctrl, "alice", release, order))]
+    await settle()
+    for user_id in ("alice", "alice", "alice", "bob"):
+        tasks.append(asyncio.create_task(hold(ctrl, user_id, release, order)))
+        await settle()
+    assert ctrl.queued == 4
+
+    release.set()
+    await asyncio.gather(*tasks)
+    # bob is served right after alice's first queued request, not behind all of them
+    assert order == ["alice", "alice", "bob", "alice", "alice"]
+    assert (ctrl.active, ctrl.queued) == (0, 0)
+    assert ctrl.admitted == 5
+
+
+@pytest.mark.asyncio
+async def test_user_over_share_gets_429():
+    ctrl = controller(concurrency=4, max_per_user=1)
+    release = asyncio.Event()
+    task = asyncio.create_task(hold(ctrl, "alice", release, []))
+    await settle()
+
+    with pytest.raises(HTTPException) as error:
+        async with ctrl.slot("alice"):
+            pass
+    assert error.value.status_code == 429
+    assert int(error.value.headers["Retry-After"]) >= 1
+    assert ctrl.rejected_user == 1
+
+    async with ctrl.slot("bob"):
+        pass
+    release.set()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_full_queue_gets_503():
+    ctrl = controller(max_queue=1)
+    release = asyncio.Event()
+    tasks = [asyncio.create_task(hold(ctrl, user_id, release, [])) for user_id in ("alice", "bob")]
+    await settle()
+
+    with pytest.raises(HTTPException) as error:
+        async with ctrl.slot("carol"):
+            pass
+    assert error.value.status_code == 503
+    assert "Retry-After" in error.value.headers
+    assert ctrl.rejected_overload == 1
+    release.set()
+    await asyncio.gather(*tasks)
+
+
+@pytest.mark.asyncio
+async def test_long_estimated_wait_sheds_up_front():
+    ctrl = controller(queue_timeout_seconds=1.0)
+    ctrl.service_time = 3.0
+    release = asyncio.Event()
+    task = asyncio.create_task(hold(ctrl, "alice", release, []))
+    await settle()
+
+    with pytest.raises(HTTPException) as error:
+        async with ctrl.slot("bob"):
+            pass
+    assert error.value.status_code == 503
+    assert error.value.headers["Retry-After"] == "3"
+    assert ctrl.queued == 0
+    release.set()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_queue_deadline_gets_503():
+    ctrl = controller(queue_timeout_seconds=0.05)
+    release = asyncio.Event()
+    task = asyncio.create_task(hold(ctrl, "alice", release, []))
+    await settle()
+
+    with pytest.raises(HTTPException) as error:
+        async with ctrl.slot("bob"):
+            pass
+    assert error.value.status_code == 503
+    assert ctrl.timed_out == 1
+    assert ctrl.queued == 0
+    assert "bob" not in ctrl._per_user
+    release.set()
+    await task
+    assert ctrl.active == 0
+
+
+@pytest.mark.asyncio
+async def test_cancel_while_queued_frees_queue_entry():
+    ctrl = controller()
+    release = asyncio.Event()
+    order = []
+    holder = asyncio.create_task(hold(ctrl, "alice", release, order))
+    await settle()
+    cancelled = asyncio.create_task(hold(ctrl, "bob", release, order))
+    waiting = asyncio.create_task(hold(ctrl, "carol", release, order))
+    await settle()
+    assert ctrl.queued == 2
+
+    cancelled.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+    assert ctrl.queued == 1
+    assert "bob" not in ctrl._per_user
+
+    release.set()
+    await asyncio.gather(holder, waiting)
+    assert order == ["alice", "carol"]
+    assert (ctrl.active, ctrl.queued, ctrl._per_user) == (0, 0, {})
+
+
+@pytest.mark.asyncio
+async def test_disabled_admits_everything(monkeypatch):
+    monkeypatch.setattr(admission.settings, "admission_enabled", False)
+    ctrl = controller(max_per_user=1)
+    async with ctrl.slot("alice"):
+        async with ctrl.slot("alice"):
+            pass
+    assert ctrl.admitted == 0
@@ -0,0 +1,125 @@
+"""
+Layer 1 cache tests - TTL expiry, LRU eviction and change bus eviction
+"""
+
+import pytest
+
+from memory_service.services import cache as cache_module
+from memory_service.services.cache import ContextCache, TTLCache, evict_on_change
+
+
+class Clock:
+    """Stand-in for time.monotonic()."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_get_miss_then_hit(clock):
+    cache = TTLCache("t", ttl_seconds=10, max_entries=10)
+    assert cache.get("a") == (False, None)
+    cache.set("a", 1)
+    assert cache.get("a") == (True, 1)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cached_none_is_a_hit(clock):
+    cache = TTLCache("t", ttl_seconds=10, max_entries=10)
+    cache.set("a", None)
+    assert cache.get("a") == (True, None)
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = TTLCache("t", ttl_seconds=10, max_entries=10)
+    cache.set("a", 1)
+    clock.now += 10
+    assert cache.get("a") == (True, 1)
+    clock.now += 0.1
+    assert cache.get("a") == (False, None)
+    assert cache.stats()["entries"] == 0
+
+
+def test_per_entry_ttl_override(clock):
+    cache = TTLCache("t", ttl_seconds=10, max_entries=10)
+    cache.set("a", 1, ttl_seconds=1)
+    clock.now += 2
+    assert cache.get("a") == (False, None)
+
+
+def test_lru_eviction(clock):
+    cache = TTLCache("t", ttl_seconds=10, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # b is now least recently used
+    cache.set("c", 3)
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, 1)
+    assert cache.get("c") == (True, 3)
+    assert cache.evictions == 1
+
+
+def test_disabled_cache_stores_nothing(clock):
+    for cache in (TTLCache("t", ttl_seconds=0, max_entries=10), TTLCache("t", ttl_seconds=10, max_entries=0)):
+        cache.set("a", 1)
+        assert cache.get("a") == (False, None)
+
+
+@pytest.fixture
+def context_cache(monkeypatch, clock):
+    monkeypatch.setattr(cache_module.settings, "layer1_cache_enabled", True)
+    context_cache = ContextCache()
+    monkeypatch.setattr(cache_module, "_context_cache", context_cache)
+    for user_id in ("alice", "bob"):
+        context_cache.persona.set(user_id, {"name": user_id})
+        context_cache.notams.set(user_id, [])
+        context_cache.session.set((user_id, "chat"), {})
+        context_cache.prompt.set((user_id, "chat", True, True), "prompt")
+    return context_cache
+
+
+def cached(cache: TTLCache, key) -> bool:
+    return cache.get(key)[0]
+
+
+def test_evict_persona_change(context_cache):
+    evict_on_change({"table": "personas", "user_id": "alice", "op": "updated"})
+    assert not cached(context_cache.persona, "alice")
+    assert not cached(context_cache.prompt, ("alice", "chat", True, True))
+    assert cached(context_cache.notams, "alice")
+    assert cached(context_cache.persona, "bob")
+
+
+def test_evict_session_change(context_cache):
+    evict_on_change({"table": "sessions", "user_id": "alice", "op": "updated"})
+    assert not cached(context_cache.session, ("alice", "chat"))
+    assert cached(context_cache.session, ("bob", "chat"))
+
+
+def test_evict_broadcast_notam_change(context_cache):
+    evict_on_change({"table": "notams", "user_id": None, "op": "created"})
+    assert not cached(context_cache.notams, "alice")
+    assert not cached(context_cache.notams, "bob")
+    assert not cached(context_cache.prompt, ("bob", "chat", True, True))
+    assert cached(context_cache.persona, "bob")
+
+
+def test_evict_resync_clears_all(context_cache):
+    evict_on_change({"op": "resync"})
+    assert context_cache.persona.stats()["entries"] == 0
+    assert context_cache.session.stats()["entries"] == 0
+
+
+def test_memory_change_keeps_layer1(context_cache):
+    evict_on_change({"table": "memories", "user_id": "alice", "op": "created"})
+    assert cached(context_cache.persona, "alice")
+    assert cached(context_cache.prompt, ("alice", "chat", True, True))
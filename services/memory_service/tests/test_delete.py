@@ -0,0 +1,65 @@
+"""
+Delete tests - single deletes publish a change event for the owner
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from memory_service.routers import memory as memory_router
+
+
+class ScalarSession:
+    """Stand-in AsyncSession answering each execute() with the next scalar."""
+
+    def __init__(self, *scalars):
+        self.scalars = list(scalars)
+        self.statements = []
+        self.committed = False
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        value = self.scalars.pop(0)
+        return SimpleNamespace(scalar_one_or_none=lambda: value)
+
+    async def commit(self):
+        self.committed = True
+
+
+@pytest.fixture
+def published(monkeypatch):
+    events = []
+
+    async def publish_change(db, table, user_id, op, data=None):
+        events.append((table, user_id, op, data))
+
+    monkeypatch.setattr(memory_router, "publish_change", publish_change)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_delete_hot_memory_publishes(published):
+    memory_id = uuid4()
+    session = ScalarSession("alice")
+    await memory_router.delete_memory(memory_id, user_id=None, db=session)
+    assert session.committed
+    assert published == [("memories", "alice", "deleted", {"ids": [str(memory_id)]})]
+
+
+@pytest.mark.asyncio
+async def test_delete_archived_memory_publishes_owner(published):
+    memory_id = uuid4()
+    session = ScalarSession(None, "bob")
+    await memory_router.delete_memory(memory_id, user_id=None, db=session)
+    assert "memories_archive" in session.statements[-1]
+    assert published == [("memories", "bob", "deleted", {"ids": [str(memory_id)]})]
+
+
+@pytest.mark.asyncio
+async def test_delete_missing_memory_publishes_nothing(published):
+    with pytest.raises(HTTPException) as error:
+        await memory_router.delete_memory(uuid4(), user_id="alice", db=ScalarSession(None, None))
+    assert error.value.status_code == 404
+    assert published == []
@@ -0,0 +1,44 @@
+"""
+Prompt ETag tests - strong ETag and If-None-Match matching
+"""
+
+from memory_service.routers.context import _etag_matches, _make_etag
+
+
+def test_etag_is_quoted_and_stable():
+    etag = _make_etag("alice", "## Persona\nPilot")
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == _make_etag("alice", "## Persona\nPilot")
+
+
+def test_etag_depends_on_user_and_content():
+    etag = _make_etag("alice", "section")
+    assert etag != _make_etag("bob", "section")
+    assert etag != _make_etag("alice", "section changed")
+
+
+def test_no_header_never_matches():
+    etag = _make_etag("alice", "section")
+    assert not _etag_matches(None, etag)
+    assert not _etag_matches("", etag)
+
+
+def test_exact_and_listed_match():
+    etag = _make_etag("alice", "section")
+    assert _etag_matches(etag, etag)
+    assert _etag_matches(f'"other", {etag}', etag)
+    assert not _etag_matches('"other"', etag)
+
+
+def test_weak_comparison():
+    etag = _make_etag("alice", "section")
+    assert _etag_matches(f"W/{etag}", etag)
+
+
+def test_wildcard_matches():
+    assert _etag_matches("*", _make_etag("alice", "section"))
+
+
+def test_unquoted_does_not_match():
+    etag = _make_etag("alice", "section")
+    assert not _etag_matches(etag.strip('"'), etag)
@@ -0,0 +1,64 @@
+"""
+Health prober tests - embedder probe
+"""
+
+import pytest
+
+from memory_service.services import embedder as embedder_module
+from memory_service.services import health
+from memory_service.services.embedder import EmbeddingService
+from memory_service.services.health import HealthProber
+
+
+class CountingEmbedder:
+    """Embedder stand-in that counts embed() calls."""
+
+    def __init__(self, dimension: int = 4, loaded: bool = True):
+        self.model_name = "test-model"
+        self.dimension = dimension
+        self.is_loaded = loaded
+        self.calls = 0
+
+    def embed(self, text):
+        self.calls += 1
+        return [0.0] * 4
+
+
+@pytest.mark.asyncio
+async def test_embedder_probe_embeds_once(monkeypatch):
+    embedder = CountingEmbedder()
+    monkeypatch.setattr(health, "get_embedding_service", lambda: embedder)
+    prober = HealthProber()
+
+    for _ in range(3):
+        result = await prober._check_embedder()
+        assert result["healthy"]
+        assert result["model"] == "test-model"
+    assert embedder.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_embedder_probe_retries_until_healthy(monkeypatch):
+    embedder = CountingEmbedder(dimension=8)
+    monkeypatch.setattr(health, "get_embedding_service", lambda: embedder)
+    prober = HealthProber()
+
+    assert not (await prober._check_embedder())["healthy"]
+    embedder.dimension = 4
+    assert (await prober._check_embedder())["healthy"]
+    assert embedder.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_embedder_probe_reports_fallback(monkeypatch):
+    monkeypatch.setattr(health, "get_embedding_service", lambda: CountingEmbedder(loaded=False))
+    result = await HealthProber()._check_embedder()
+    assert result["healthy"]
+    assert result["model"] == "fallback"
+
+
+def test_fallback_embedder_is_not_loaded(monkeypatch):
+    monkeypatch.setattr(embedder_module, "TRANSFORMER_AVAILABLE", False)
+    service = EmbeddingService()
+    assert not service.is_loaded
+    assert len(service.embed("hello")) == service.dimension
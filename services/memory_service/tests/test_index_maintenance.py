@@ -0,0 +1,59 @@
+"""
+Index maintenance tests - window parsing and ivfflat sizing
+"""
+
+from datetime import datetime, time, timezone
+
+import pytest
+
+from memory_service.services.index_maintenance import (
+    in_maintenance_window,
+    parse_window,
+    recommended_lists,
+    window_started_at
+)
+
+
+def at(hour: int, minute: int = 0, day: int = 15) -> datetime:
+    return datetime(2026, 3, day, hour, minute, tzinfo=timezone.utc)
+
+
+def test_parse_window():
+    assert parse_window("02:00-05:30") == (time(2, 0), time(5, 30))
+    assert parse_window(" 2:00 - 5:30 ") == (time(2, 0), time(5, 30))
+
+
+@pytest.mark.parametrize("window", ["", "02:00", "2-5", "02:00-25:00", "02:60-05:00"])
+def test_parse_window_rejects_invalid(window):
+    with pytest.raises(ValueError):
+        parse_window(window)
+
+
+def test_in_window_same_day():
+    assert in_maintenance_window(at(2), "02:00-05:00")
+    assert in_maintenance_window(at(4, 59), "02:00-05:00")
+    assert not in_maintenance_window(at(5), "02:00-05:00")
+    assert not in_maintenance_window(at(1, 59), "02:00-05:00")
+
+
+def test_in_window_wraps_midnight():
+    assert in_maintenance_window(at(23), "22:00-03:00")
+    assert in_maintenance_window(at(0, 30), "22:00-03:00")
+    assert not in_maintenance_window(at(3), "22:00-03:00")
+    assert not in_maintenance_window(at(12), "22:00-03:00")
+
+
+def test_window_started_at():
+    assert window_started_at(at(3), "02:00-05:00") == at(2)
+    assert window_started_at(at(2), "02:00-05:00") == at(2)
+    # Before today's opening: the latest one was yesterday
+    assert window_started_at(at(1), "02:00-05:00") == at(2, day=14)
+    assert window_started_at(at(0, 30), "22:00-03:00") == at(22, day=14)
+
+
+def test_recommended_lists():
+    assert recommended_lists(0) == 10
+    assert recommended_lists(5_000) == 10
+    assert recommended_lists(500_000) == 500
+    assert recommended_lists(1_000_000) == 1000
+    assert recommended_lists(4_000_000) == 2000
@@ -0,0 +1,73 @@
+"""
+Pagination tests - keyset cursor round trip and rejection of bad cursors
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+from memory_service.services.pagination import (
+    MEMORY_CURSOR_KEY,
+    NEXT_CURSOR_HEADER,
+    NOTAM_CURSOR_KEY,
+    decode_cursor,
+    encode_cursor,
+    next_cursor_headers
+)
+
+CREATED_AT = datetime(2026, 1, 27, 8, 30, 15, 123456, tzinfo=timezone.utc)
+ROW_ID = UUID("12345678-1234-5678-1234-567812345678")
+
+
+def raw_cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_memory_cursor_round_trip():
+    cursor = encode_cursor(CREATED_AT, ROW_ID)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, MEMORY_CURSOR_KEY) == (CREATED_AT, ROW_ID)
+
+
+def test_notam_cursor_round_trip():
+    cursor = encode_cursor(3, CREATED_AT, ROW_ID)
+    assert decode_cursor(cursor, NOTAM_CURSOR_KEY) == (3, CREATED_AT, ROW_ID)
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not a cursor!",
+    "e30",  # {}
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    raw_cursor(["2026-01-27T08:30:15", "not-a-uuid"]),
+    raw_cursor(["yesterday", str(ROW_ID)]),
+    raw_cursor(["2026-01-27T08:30:15", 1]),
+    raw_cursor([["2026-01-27T08:30:15"], str(ROW_ID)]),
+    raw_cursor(["2026-01-27T08:30:15", str(ROW_ID), "extra"])
+])
+def test_tampered_cursor_rejected(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, MEMORY_CURSOR_KEY)
+    assert error.value.status_code == 400
+
+
+def test_cursor_for_other_listing_rejected():
+    with pytest.raises(HTTPException):
+        decode_cursor(encode_cursor(CREATED_AT, ROW_ID), NOTAM_CURSOR_KEY)
+
+
+def test_next_cursor_headers_trims_extra_row():
+    rows = [(CREATED_AT, uuid4()) for _ in range(3)]
+    headers = next_cursor_headers(rows, 2, key=lambda row: row)
+    assert len(rows) == 2
+    assert decode_cursor(headers[NEXT_CURSOR_HEADER], MEMORY_CURSOR_KEY) == rows[-1]
+
+
+def test_last_page_has_no_cursor():
+    rows = [(CREATED_AT, uuid4()) for _ in range(2)]
+    assert next_cursor_headers(rows, 2, key=lambda row: row) == {}
+    assert len(rows) == 2
@@ -0,0 +1,103 @@
+"""
+Partition pruning tests - writes by id also filter on user_id
+"""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+import pytest
+
+from memory_service.services.quota import QuotaService
+from memory_service.services.search import SearchService
+from memory_service.services.tiering import TieringService
+from memory_service import partition_copy
+
+
+class RecordingSession:
+    """Stand-in AsyncSession that records statements and returns no rows."""
+
+    def __init__(self, rows=None):
+        self.statements = []
+        self.rows = rows or []
+        self.savepoints = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((str(statement), params or {}))
+        rows, self.rows = self.rows, []
+        return SimpleNamespace(fetchall=lambda: rows, first=lambda: rows[0] if rows else None)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+    @asynccontextmanager
+    async def begin_nested(self):
+        try:
+            yield
+        except Exception:
+            self.savepoints.append("rolled back")
+            raise
+        self.savepoints.append("released")
+
+
+def _assert_pruned(session: RecordingSession, user_id: str):
+    sql, params = session.statements[-1]
+    assert "user_id = :user_id" in sql
+    assert params["user_id"] == user_id
+
+
+@pytest.mark.asyncio
+async def test_archive_by_ids_filters_user():
+    session = RecordingSession()
+    await TieringService(session).archive_by_ids(["a", "b"], "alice")
+    _assert_pruned(session, "alice")
+
+
+@pytest.mark.asyncio
+async def test_promote_filters_user_when_known():
+    session = RecordingSession()
+    await TieringService(session).promote(["a"], user_id="alice")
+    _assert_pruned(session, "alice")
+
+
+@pytest.mark.asyncio
+async def test_record_access_filters_user(monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr("memory_service.services.search.get_embedding_service", lambda: None)
+    await SearchService(session)._record_access(session, "alice", ["a"])
+    _assert_pruned(session, "alice")
+    assert session.savepoints == ["released"]
+
+
+@pytest.mark.asyncio
+async def test_record_access_failure_only_rolls_back_savepoint(monkeypatch):
+    class FailingSession(RecordingSession):
+        async def execute(self, statement, params=None):
+            raise RuntimeError("update failed")
+
+    session = FailingSession()
+    monkeypatch.setattr("memory_service.services.search.get_embedding_service", lambda: None)
+    await SearchService(session)._record_access(session, "alice", ["a"])
+    assert session.savepoints == ["rolled back"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["delete", "archive"])
+async def test_quota_eviction_filters_user(monkeypatch, mode):
+    monkeypatch.setattr("memory_service.services.quota.settings.quota_eviction_mode", mode)
+    session = RecordingSession(rows=[SimpleNamespace(id="a")])
+    service = QuotaService(session)
+    excess = iter([1, 0])
+
+    async def fake_excess(user_id, agent_id=None):
+        return next(excess)
+
+    monkeypatch.setattr(service, "_excess", fake_excess)
+    await service._evict("alice")
+    _assert_pruned(session, "alice")
+
+
+def test_backfill_batch_locks_source_rows():
+    assert "FOR KEY SHARE" in str(partition_copy.COPY_BATCH_SQL)
+    assert "NOT EXISTS" in str(partition_copy.DELETE_ORPHANS_SQL)
@@ -0,0 +1,117 @@
+"""
+Prompt assembly tests - token budget packing
+"""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from memory_service.services import prompt_assembly
+from memory_service.services.prompt_assembly import (
+    CLOSE_TAG,
+    OPEN_TAG,
+    PromptPacker,
+    assemble_prompt,
+    estimate_tokens
+)
+from memory_service.schemas.responses import ContextResponse, NotamResponse, PersonaResponse
+
+
+@pytest.fixture(autouse=True)
+def chars_per_token(monkeypatch):
+    monkeypatch.setattr(prompt_assembly.settings, "prompt_chars_per_token", 4.0)
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 1
+    assert estimate_tokens("abcde") == 2
+
+
+def test_packer_reserves_tags():
+    packer = PromptPacker(100)
+    assert packer.tokens == estimate_tokens(OPEN_TAG) + estimate_tokens(CLOSE_TAG)
+    assert packer.render() == f"{OPEN_TAG}\n{CLOSE_TAG}"
+
+
+def test_packer_adds_until_budget():
+    packer = PromptPacker(PromptPacker(0).tokens + 3)
+    assert packer.add("abcd")  # 1 token + newline
+    assert not packer.add("abcd")  # would be 4 > 3
+    assert packer.tokens == packer.token_budget - 1
+    assert packer.render() == f"{OPEN_TAG}\nabcd\n{CLOSE_TAG}"
+
+
+def test_packer_adds_lines_all_or_nothing():
+    packer = PromptPacker(PromptPacker(0).tokens + 3)
+    assert not packer.add("abcd", "abcd")
+    assert packer.lines == [OPEN_TAG]
+
+
+def test_packer_skips_long_line_keeps_shorter():
+    packer = PromptPacker(PromptPacker(0).tokens + 4)
+    assert not packer.add("x" * 40)
+    assert packer.add("abcd")
+
+
+def make_context(notams: int = 0) -> ContextResponse:
+    now = datetime.now(timezone.utc)
+    return ContextResponse(
+        user_id="alice",
+        persona=PersonaResponse(
+            id="p1", user_id="alice", name="Alice", traits={}, preferences={}, style={},
+            created_at=now, updated_at=now
+        ),
+        notams=[
+            NotamResponse(
+                id=f"n{i}", user_id="alice", title=f"Notice {i}", content="x" * 40, priority="high",
+                category=None, active=True, expires_at=None, created_at=now
+            )
+            for i in range(notams)
+        ],
+        last_session=None,
+        retrieved_at=now
+    )
+
+
+def memory(memory_id: str, content: str):
+    return SimpleNamespace(id=memory_id, memory_type="fact", content=content)
+
+
+def test_assemble_fits_everything_in_large_budget():
+    memories = [(memory("m1", "short"), 0.9), (memory("m2", "also short"), 0.8)]
+    result = assemble_prompt(make_context(notams=2), memories, token_budget=10_000)
+    assert result["persona_included"]
+    assert result["notams_included"] == 2
+    assert result["memory_ids"] == ["m1", "m2"]
+    assert result["memories_dropped"] == 0
+    assert result["token_estimate"] <= result["token_budget"]
+    assert result["prompt_section"].startswith(OPEN_TAG)
+    assert result["prompt_section"].endswith(CLOSE_TAG)
+
+
+def test_assemble_drops_long_memory_keeps_shorter():
+    memories = [(memory("m1", "x" * 2000), 0.9), (memory("m2", "short"), 0.8)]
+    result = assemble_prompt(make_context(), memories, token_budget=60)
+    assert result["memory_ids"] == ["m2"]
+    assert result["memories_dropped"] == 1
+    assert "Relevant Memories:" in result["prompt_section"]
+    assert result["token_estimate"] <= 60
+
+
+def test_assemble_layer1_before_memories():
+    memories = [(memory("m1", "y" * 40), 0.9)]
+    result = assemble_prompt(make_context(notams=3), memories, token_budget=60)
+    assert result["persona_included"]
+    assert result["notams_included"] >= 1
+    assert result["notams_included"] + result["notams_dropped"] == 3
+    assert result["memory_ids"] == []
+
+
+def test_assemble_tiny_budget_includes_nothing():
+    result = assemble_prompt(make_context(notams=1), [(memory("m1", "short"), 0.9)], token_budget=1)
+    assert not result["persona_included"]
+    assert result["notams_included"] == 0
+    assert result["memory_ids"] == []
+    assert result["prompt_section"] == f"{OPEN_TAG}\n{CLOSE_TAG}"
@@ -0,0 +1,197 @@
+"""
+Quota tests - dirty-user tracking and eviction bounds
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from memory_service.services import quota
+from memory_service.services.quota import (
+    QuotaService,
+    _headroom,
+    mark_quota_dirty,
+    run_quota_eviction_job,
+    take_dirty_users,
+    track_writes_on_change
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_state(monkeypatch):
+    """Start each test after the initial full scan, with nothing queued."""
+    monkeypatch.setattr(quota, "_dirty_users", set())
+    monkeypatch.setattr(quota, "_full_scan_pending", False)
+    monkeypatch.setattr(quota.settings, "change_events_enabled", True)
+
+
+def test_first_run_is_full_scan(monkeypatch):
+    monkeypatch.setattr(quota, "_full_scan_pending", True)
+    assert take_dirty_users() is None
+    assert take_dirty_users() == set()
+
+
+def test_created_memories_mark_user():
+    track_writes_on_change({"table": "memories", "user_id": "alice", "op": "created"})
+    track_writes_on_change({"table": "memories", "user_id": "bob", "op": "created"})
+    assert take_dirty_users() == {"alice", "bob"}
+    assert take_dirty_users() == set()
+
+
+def test_other_events_ignored():
+    track_writes_on_change({"table": "memories", "user_id": "alice", "op": "deleted"})
+    track_writes_on_change({"table": "personas", "user_id": "alice", "op": "created"})
+    track_writes_on_change({"table": "memories", "user_id": None, "op": "created"})
+    assert take_dirty_users() == set()
+
+
+def test_resync_forces_full_scan():
+    track_writes_on_change({"table": "*", "user_id": None, "op": "resync"})
+    assert take_dirty_users() is None
+
+
+def test_without_change_events_always_full_scan(monkeypatch):
+    monkeypatch.setattr(quota.settings, "change_events_enabled", False)
+    mark_quota_dirty("alice")
+    assert take_dirty_users() is None
+
+
+def test_headroom():
+    assert _headroom(3, 10) == 7
+    assert _headroom(12, 10) == -2
+    assert _headroom(5, 0) is None
+
+
+class EvictionSession:
+    """Stand-in AsyncSession: count queries read `used`, SELECT ... FOR UPDATE returns `free` ids."""
+
+    def __init__(self, used: int, quota: int, free: int):
+        self.used = used
+        self.quota = quota
+        self.free = free
+        self.evicted = 0
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        if "AS quota" in sql:
+            row = SimpleNamespace(used=self.used, quota=self.quota)
+            return SimpleNamespace(one=lambda: row)
+        if "FOR UPDATE SKIP LOCKED" in sql:
+            ids = [f"m{i}" for i in range(min(params["batch"], self.free))]
+            return SimpleNamespace(fetchall=lambda: [SimpleNamespace(id=i) for i in ids])
+        if sql.startswith("DELETE"):
+            count = len(params["ids"])
+            self.used -= count
+            self.free -= count
+            self.evicted += count
+        return SimpleNamespace()
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+@pytest.fixture
+def delete_mode(monkeypatch):
+    monkeypatch.setattr(quota.settings, "quota_eviction_mode", "delete")
+    monkeypatch.setattr(quota.settings, "quota_eviction_batch_size", 2)
+    monkeypatch.setattr(quota.settings, "quota_max_memories_per_user", 10)
+
+
+@pytest.mark.asyncio
+async def test_evict_stops_at_quota(delete_mode):
+    session = EvictionSession(used=15, quota=10, free=15)
+    assert await QuotaService(session)._evict("alice") == 5
+    assert session.used == 10
+
+
+@pytest.mark.asyncio
+async def test_evict_recounts_before_each_batch(delete_mode):
+    session = EvictionSession(used=15, quota=10, free=15)
+    service = QuotaService(session)
+    original = service._excess
+
+    async def concurrent_delete(user_id, agent_id=None):
+        # Another writer removes rows between batches
+        session.used -= 1
+        return await original(user_id, agent_id)
+
+    service._excess = concurrent_delete
+    # A precomputed excess would have evicted 5 and left the user at 7
+    assert await service._evict("alice") == 3
+    assert session.used == 9
+
+
+@pytest.mark.asyncio
+async def test_evict_unlimited_quota_evicts_nothing(delete_mode):
+    session = EvictionSession(used=15, quota=0, free=15)
+    assert await QuotaService(session)._evict("alice") == 0
+
+
+@pytest.mark.asyncio
+async def test_evict_locked_rows_requeue_user(delete_mode):
+    session = EvictionSession(used=15, quota=10, free=3)
+    assert await QuotaService(session)._evict("alice") == 3
+    assert take_dirty_users() == {"alice"}
+
+
+class LockConnection:
+    """Stand-in engine connection answering pg_try_advisory_lock."""
+
+    def __init__(self, locked: bool):
+        self.locked = locked
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execution_options(self, **options):
+        return self
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement))
+        return SimpleNamespace(scalar=lambda: self.locked)
+
+
+@pytest.mark.asyncio
+async def test_job_skips_and_requeues_without_lock(monkeypatch):
+    conn = LockConnection(locked=False)
+    monkeypatch.setattr(quota, "engine", SimpleNamespace(connect=lambda: conn))
+
+    def no_session():
+        raise AssertionError("enforce must not run without the lock")
+
+    monkeypatch.setattr(quota, "get_db_context", no_session)
+    mark_quota_dirty("alice")
+    await run_quota_eviction_job()
+    assert take_dirty_users() == {"alice"}
+    assert not any("pg_advisory_unlock" in sql for sql in conn.statements)
+
+
+@pytest.mark.asyncio
+async def test_job_enforces_and_unlocks_with_lock(monkeypatch):
+    conn = LockConnection(locked=True)
+    monkeypatch.setattr(quota, "engine", SimpleNamespace(connect=lambda: conn))
+    enforced = []
+
+    class Context:
+        async def __aenter__(self):
+            return None
+
+        async def __aexit__(self, *exc):
+            return False
+
+    async def enforce(self, user_ids=None):
+        enforced.append(user_ids)
+
+    monkeypatch.setattr(quota, "get_db_context", Context)
+    monkeypatch.setattr(QuotaService, "enforce", enforce)
+    mark_quota_dirty("alice")
+    await run_quota_eviction_job()
+    assert enforced == [{"alice"}]
+    assert "pg_advisory_unlock" in conn.statements[-1]
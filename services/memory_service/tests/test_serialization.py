@@ -0,0 +1,79 @@
+"""
+Serialization tests - orjson and stdlib json produce the same bytes
+"""
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID
+import json
+
+import pytest
+
+from memory_service.services import serialization
+from memory_service.services.serialization import FastJSONResponse, dumps, memory_dict
+from memory_service.schemas.responses import MemoryResponse
+
+MEMORY_ID = UUID("12345678-1234-5678-1234-567812345678")
+
+PAYLOAD = {
+    "id": MEMORY_ID,
+    "text": "Tekanan kabin ✈ naik",
+    "created_at": datetime(2026, 1, 27, 8, 30, 15, 123456, tzinfo=timezone.utc),
+    "accessed_at": datetime(2026, 1, 27, 8, 30, tzinfo=timezone.utc),
+    "local": datetime(2026, 1, 27, 15, 30, tzinfo=timezone(timedelta(hours=7))),
+    "day": date(2026, 1, 27),
+    "importance": 0.75,
+    "score": Decimal("0.5"),
+    "counts": {1: "one"},
+    "tags": ["a", None, True],
+    "nested": {"empty": {}, "list": []}
+}
+
+
+def stdlib_dumps(monkeypatch, content):
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+    return dumps(content)
+
+
+def test_stdlib_output_is_compact_json(monkeypatch):
+    output = stdlib_dumps(monkeypatch, PAYLOAD)
+    assert b": " not in output and b", " not in output
+    decoded = json.loads(output)
+    assert decoded["id"] == str(MEMORY_ID)
+    assert decoded["created_at"] == "2026-01-27T08:30:15.123456Z"
+    assert decoded["local"] == "2026-01-27T15:30:00+07:00"
+    assert decoded["score"] == 0.5
+    assert decoded["counts"] == {"1": "one"}
+    assert decoded["text"] == PAYLOAD["text"]
+
+
+def test_orjson_matches_stdlib(monkeypatch):
+    pytest.importorskip("orjson")
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", True)
+    fast = dumps(PAYLOAD)
+    assert fast == stdlib_dumps(monkeypatch, PAYLOAD)
+
+
+def test_unknown_type_raises(monkeypatch):
+    with pytest.raises(TypeError):
+        stdlib_dumps(monkeypatch, {"value": object()})
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_memory_dict_matches_pydantic(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", use_orjson)
+    row = SimpleNamespace(
+        id=MEMORY_ID, user_id="alice", agent_id="chat", access_mode="private", content="hello",
+        memory_type="fact", importance=0.5, extra_data=None,
+        created_at=PAYLOAD["created_at"], accessed_at=None, access_count=3
+    )
+    fast = json.loads(dumps(memory_dict(row)))
+    expected = json.loads(MemoryResponse(**{**memory_dict(row), "id": str(MEMORY_ID)}).model_dump_json())
+    assert fast == expected
+
+
+def test_response_passes_bytes_through():
+    assert FastJSONResponse(content=b'{"a":1}').body == b'{"a":1}'
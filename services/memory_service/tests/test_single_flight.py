@@ -0,0 +1,140 @@
+"""
+Single-flight tests - sharing, forget and cancellation
+"""
+
+import asyncio
+
+import pytest
+
+from memory_service.services import single_flight
+from memory_service.services.single_flight import SingleFlight, forget_on_change, get_single_flight
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(single_flight.settings, "single_flight_enabled", True)
+
+
+class Computation:
+    """Counts calls and blocks until released."""
+
+    def __init__(self, result="value"):
+        self.calls = 0
+        self.release = asyncio.Event()
+        self.result = result
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    group = SingleFlight("test")
+    compute = Computation()
+    callers = [asyncio.create_task(group.do(("alice", "q"), compute)) for _ in range(3)]
+    await asyncio.sleep(0)
+    compute.release.set()
+    assert await asyncio.gather(*callers) == ["value"] * 3
+    assert compute.calls == 1
+    assert (group.leaders, group.joined) == (1, 2)
+    assert group.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_different_keys_do_not_share():
+    group = SingleFlight("test")
+    compute = Computation()
+    compute.release.set()
+    await asyncio.gather(group.do(("alice", "q"), compute), group.do(("bob", "q"), compute))
+    assert compute.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_finished_flight_is_not_reused():
+    group = SingleFlight("test")
+    compute = Computation()
+    compute.release.set()
+    await group.do(("alice", "q"), compute)
+    await group.do(("alice", "q"), compute)
+    assert compute.calls == 2
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared():
+    group = SingleFlight("test")
+    compute = Computation(result=RuntimeError("boom"))
+    callers = [asyncio.create_task(group.do(("alice", "q"), compute)) for _ in range(2)]
+    await asyncio.sleep(0)
+    compute.release.set()
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_forget_starts_fresh_computation():
+    group = SingleFlight("test")
+    before = Computation("before")
+    after = Computation("after")
+    first = asyncio.create_task(group.do(("alice", "q"), before))
+    other_user = asyncio.create_task(group.do(("bob", "q"), before))
+    await asyncio.sleep(0)
+
+    assert group.forget("alice") == 1
+    second = asyncio.create_task(group.do(("alice", "q"), after))
+    await asyncio.sleep(0)
+    before.release.set()
+    after.release.set()
+    assert await first == "before"
+    assert await second == "after"
+    assert await other_user == "before"
+    # The old flight finishing must not drop the new one's entry early
+    assert group.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_forget_on_change_ignores_resync(monkeypatch):
+    monkeypatch.setattr(single_flight, "_groups", {})
+    group = get_single_flight("test")
+    compute = Computation()
+    task = asyncio.create_task(group.do(("alice", "q"), compute))
+    await asyncio.sleep(0)
+
+    forget_on_change({"op": "resync"})
+    assert group.stats()["in_flight"] == 1
+    forget_on_change({"op": "updated", "user_id": "alice"})
+    assert group.stats()["in_flight"] == 0
+    compute.release.set()
+    await task
+
+
+@pytest.mark.asyncio
+async def test_leader_cancellation_does_not_cancel_followers():
+    group = SingleFlight("test")
+    compute = Computation()
+    leader = asyncio.create_task(group.do(("alice", "q"), compute))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(group.do(("alice", "q"), compute))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    compute.release.set()
+    assert await follower == "value"
+    assert compute.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_runs_every_call(monkeypatch):
+    monkeypatch.setattr(single_flight.settings, "single_flight_enabled", False)
+    group = SingleFlight("test")
+    compute = Computation()
+    compute.release.set()
+    await asyncio.gather(group.do("k", compute), group.do("k", compute))
+    assert compute.calls == 2
+    assert group.leaders == 0